@@ -1,7 +1,20 @@
-from importlib.metadata import version, PackageNotFoundError
+from typing import TYPE_CHECKING
 
-try:
-    __version__ = version("zilliandomizer")
-except PackageNotFoundError:
-    # package is not installed
-    pass
+if TYPE_CHECKING:
+    __version__: str
+else:
+    def __getattr__(name: str) -> str:
+        """ `__version__` is looked up when it's used (`importlib.metadata` is slow to import) """
+        if name == "__version__":
+            from importlib.metadata import version, PackageNotFoundError
+
+            try:
+                tr = version("zilliandomizer")
+            except PackageNotFoundError:
+                # package is not installed
+                pass
+            else:
+                # so `__getattr__` isn't used for it again
+                globals()["__version__"] = tr
+                return tr
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
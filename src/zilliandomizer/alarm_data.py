@@ -1,6 +1,6 @@
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from dataclasses import dataclass
-from random import randint
+from random import randint, randrange
 
 from zilliandomizer.low_resources.terrain_tiles import Tile
 
@@ -36,6 +36,9 @@ ALARM_ROOMS: list[int] = [
 
 fs = frozenset
 
+AlarmBlocks = tuple[tuple[int, ...], tuple[int, ...]]
+""" (erase, line) - see `Alarm.block_iter` """
+
 
 @dataclass
 class Alarm:
@@ -75,8 +78,16 @@ class Alarm:
         if erase, this is where a vanilla line goes and it needs to be erased
         if not erase, this is where vary chose to put the alarm line
         """
+        erase, line = self.blocks_at(randint(0, self.vary))
+        for block_index in erase:
+            yield block_index, True
+        for block_index in line:
+            yield block_index, False
+
+    def blocks_at(self, vary: int) -> AlarmBlocks:
+        """ (erase, line) block indexes of `block_iter` when this `vary` is chosen """
         row, col = self.top_left
-        vary = randint(0, self.vary)
+        erase: list[int] = []
         if self.vanilla and vary != self.vanilla_vary:
             # need to erase vanilla
             vanilla_row = row
@@ -88,26 +99,100 @@ class Alarm:
             block_index = vanilla_row * 16 + vanilla_col
             for _ in range(self.length):
                 assert block_index < 96, f"{self.id} {block_index}"
-                yield block_index, True
+                erase.append(block_index)
                 if self.vertical:
                     block_index += 16
                 else:
                     block_index += 1
             # done erasing vanilla
 
-        # now send the blocks that vary chose
+        # now the blocks that vary chose
         if self.vertical:
             col += vary
         else:
             row += vary
         block_index = row * 16 + col
+        line: list[int] = []
         for _ in range(self.length):
             assert block_index < 96, f"{self.id} {block_index}"
-            yield block_index, False
+            line.append(block_index)
             if self.vertical:
                 block_index += 16
             else:
                 block_index += 1
+        return tuple(erase), tuple(line)
+
+    def all_blocks(self) -> Generator[int, None, None]:
+        """ every block this line can be in, for any `vary` """
+        for vary in range(self.vary + 1):
+            yield from self.blocks_at(vary)[1]
+
+
+class AlarmTable:
+    """ the alarms of one room, indexed - bit `i` of a mask is `alarms[i]` """
+
+    alarms: tuple[Alarm, ...]
+    ids: tuple[str, ...]
+    all_mask: int
+    vertical_mask: int
+    vanilla_count: int
+    eliminates: tuple[int, ...]
+    """ mask of the alarms that can't be chosen after choosing this one (itself and `disables`) """
+    lessens: tuple[int, ...]
+    """ mask of `lessens` """
+    blocks: tuple[tuple[AlarmBlocks, ...], ...]
+    """ [alarm index][vary] (erase, line) block indexes """
+
+    def __init__(self, room: list[Alarm]) -> None:
+        self.alarms = tuple(room)
+        self.ids = tuple(a.id for a in room)
+        index = {a_id: i for i, a_id in enumerate(self.ids)}
+
+        def mask(ids: Iterable[str]) -> int:
+            tr = 0
+            for a_id in ids:
+                tr |= 1 << index[a_id]
+            return tr
+
+        self.all_mask = (1 << len(room)) - 1
+        self.vertical_mask = mask(a.id for a in room if a.vertical)
+        self.vanilla_count = sum(a.vanilla for a in room)
+        self.eliminates = tuple(mask(a.disables) | (1 << i) for i, a in enumerate(room))
+        self.lessens = tuple(mask(a.lessens) for a in room)
+        self.blocks = tuple(
+            tuple(a.blocks_at(vary) for vary in range(a.vary + 1))
+            for a in room
+        )
+
+    def choose_blocks(self, index: int) -> AlarmBlocks:
+        """ random vary - the same random number as `block_iter` """
+        return self.blocks[index][randint(0, self.alarms[index].vary)]
+
+    def weighted_choice(self, eliminated: int, lessened: int, extra_vertical: bool) -> int:
+        """
+        index of a random alarm that isn't eliminated
+
+        Each one has 1 chance, 1 more if not lessened,
+        and 1 more after that if horizontal or `extra_vertical`.
+        (the same random number as `choice` from a list with those copies)
+        """
+        candidates = [i for i in range(len(self.alarms)) if not (eliminated >> i) & 1]
+        extras = [
+            0 if (lessened >> i) & 1 else (2 if extra_vertical or not (self.vertical_mask >> i) & 1 else 1)
+            for i in candidates
+        ]
+        r = randrange(len(candidates) + sum(extras))
+        if r < len(candidates):
+            return candidates[r]
+        r -= len(candidates)
+        for i, extra in zip(candidates, extras, strict=True):
+            if r < extra:
+                return i
+            r -= extra
+        raise AssertionError("random number out of range")
+
+    def ids_of(self, mask: int) -> set[str]:
+        return {a_id for i, a_id in enumerate(self.ids) if (mask >> i) & 1}
 
 
 to_vertical = {
@@ -616,3 +701,5 @@ alarm_data: dict[int, list[Alarm]] = {
     ],
 }
 """ map_index: list of possible `Alarm` in room """
+
+alarm_tables: dict[int, AlarmTable] = {map_index: AlarmTable(room) for map_index, room in alarm_data.items()}
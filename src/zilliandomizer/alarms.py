@@ -1,7 +1,10 @@
-from random import random, choice
+from collections.abc import Sequence
+from random import random
 from typing import Literal
 
-from zilliandomizer.alarm_data import ALARM_ROOMS, Alarm, alarm_data, to_horizontal, to_vertical, to_none
+from zilliandomizer.alarm_data import (
+    ALARM_ROOMS, AlarmBlocks, AlarmTable, alarm_data, alarm_tables, to_horizontal, to_vertical, to_none
+)
 from zilliandomizer.terrain_modifier import TerrainModifier
 from zilliandomizer.logger import Logger
 from zilliandomizer.low_resources.terrain_compressor import TerrainCompressor
@@ -38,28 +41,137 @@ class Alarms:
         # logger.debug_stdout = True
 
     def choose_all(self, skip_map_index: frozenset[int]) -> None:
+        # Each room removes alarms until the rooms after it can make up for the bytes it uses,
+        # so this only retries if the rooms don't fit even without alarms.
         # TODO: I haven't tested the tc save state and success loop yet
         self.tc.save_state()
         success = False  # chose all alarm lines without going over the byte limit
         while not success:
             self._logger.spoil("choosing alarm lines...")
             self._space_pacer = self._space_pacer_init
+            # bytes that each room could save by removing all of its alarms
+            reclaimable = {
+                map_index: len(self.tc.get_room(map_index)) - self.empty_size(map_index)
+                for map_index in ALARM_ROOMS
+                if map_index in alarm_data and map_index not in skip_map_index
+            }
+            reclaimable_later = sum(reclaimable.values())
             for map_index in ALARM_ROOMS:
-                if map_index in alarm_data and map_index not in skip_map_index:
-                    self._choose_for_room(map_index)
+                if map_index in reclaimable:
+                    reclaimable_later -= reclaimable[map_index]
+                    self._choose_for_room(map_index, reclaimable_later)
                 self._space_pacer -= self._space_per_room
             if self.tc.get_space() >= 0:
                 success = True
             else:
                 self.tc.load_state()
 
-    def _choose_for_room(self, map_index: int) -> None:
-        this_room = alarm_data[map_index]
-        chosen: set[str] = set()
-        eliminated: set[str] = set()  # chosen already, or conflicting with chosen
-        lessened: set[str] = set()
+    def _choose_for_room(self, map_index: int, reclaimable_later: int) -> None:
+        """ `reclaimable_later` - bytes the rooms after this one could save by removing all of their alarms """
+        table = alarm_tables[map_index]
+        chosen = self._sample(map_index)
 
-        vanilla_alarm_count = sum(a.vanilla for a in this_room)
+        bytes_ = TerrainCompressor.decompress(self.tc.get_room(map_index))
+        assert len(bytes_) == 96, f"room {map_index} doesn't have the right number of bytes: {len(bytes_)}"
+        alarm_blocks = Alarms._gather_blocks(map_index, bytes_)
+
+        # the compressed size this room can have without going over the limit
+        # (going over is ok if the rooms after this can remove enough)
+        room_limit = self.tc.get_space() + len(self.tc.get_room(map_index)) + reclaimable_later
+        size = Alarms.room_size(bytes_, table, alarm_blocks, chosen)
+        while size > room_limit and chosen:
+            # remove the alarm that saves the most bytes
+            costs = {
+                i: Alarms.room_size(bytes_, table, alarm_blocks, chosen & ~(1 << i))
+                for i in range(len(table.alarms))
+                if (chosen >> i) & 1
+            }
+            drop = min(costs, key=lambda i: costs[i])
+            self._logger.debug(f"room {map_index} size {size} over limit {room_limit} - removing {table.ids[drop]}")
+            chosen &= ~(1 << drop)
+            size = costs[drop]
+
+        self._logger.spoil(f"room: {map_index}  chosen: {table.ids_of(chosen)}")
+        self._set_room(map_index, bytes_, alarm_blocks, chosen)
+
+    def choose_all_global(self, skip_map_index: frozenset[int]) -> None:
+        """
+        alternative to `choose_all` - choose for every room with the same distribution
+        (without staying under the byte limit), then remove alarms from all the rooms until it fits
+
+        raises `OverflowError` if the rooms don't fit even without alarms (with the terrain back how it was before)
+        """
+        self.tc.save_state()
+        self._logger.spoil("choosing alarm lines...")
+        self._space_pacer = self._space_pacer_init
+        rooms: dict[int, tuple[list[int], list[AlarmBlocks], int]] = {}
+        """ map_index: (bytes_, alarm_blocks, chosen) """
+        for map_index in ALARM_ROOMS:
+            if map_index in alarm_data and map_index not in skip_map_index:
+                chosen = self._sample(map_index)
+                bytes_ = TerrainCompressor.decompress(self.tc.get_room(map_index))
+                assert len(bytes_) == 96, f"room {map_index} doesn't have the right number of bytes: {len(bytes_)}"
+                alarm_blocks = Alarms._gather_blocks(map_index, bytes_)
+                rooms[map_index] = (bytes_, alarm_blocks, chosen)
+                self._set_room(map_index, bytes_, alarm_blocks, chosen)
+            self._space_pacer -= self._space_per_room
+
+        # bytes saved by removing each chosen alarm, only for rooms that haven't changed since calculating
+        savings: dict[int, dict[int, int]] = {}
+        """ map_index: {alarm index: bytes saved} """
+        while self.tc.get_space() < 0:
+            # Remove the alarm that saves the most bytes, vertical first.
+            # Horizontal lines usually don't cost anything, and they make the same difference to the player.
+            best: tuple[tuple[bool, bool, int], int, int] | None = None
+            for map_index, (bytes_, alarm_blocks, chosen) in rooms.items():
+                table = alarm_tables[map_index]
+                if map_index not in savings:
+                    size = len(self.tc.get_room(map_index))
+                    savings[map_index] = {
+                        i: size - Alarms.room_size(bytes_, table, alarm_blocks, chosen & ~(1 << i))
+                        for i in range(len(table.alarms))
+                        if (chosen >> i) & 1
+                    }
+                for i, saving in savings[map_index].items():
+                    key = (saving > 0, bool((table.vertical_mask >> i) & 1), saving)
+                    if best is None or key > best[0]:
+                        best = (key, map_index, i)
+            if best is None:
+                self.tc.load_state()
+                raise OverflowError(f"alarm rooms don't fit without alarms - space {self.tc.get_space()}")
+            _, map_index, i = best
+            bytes_, alarm_blocks, chosen = rooms[map_index]
+            self._logger.debug(
+                f"space {self.tc.get_space()} - removing {alarm_tables[map_index].ids[i]} from room {map_index}"
+            )
+            chosen &= ~(1 << i)
+            rooms[map_index] = (bytes_, alarm_blocks, chosen)
+            del savings[map_index]
+            self._set_room(map_index, bytes_, alarm_blocks, chosen)
+
+        for map_index, (_, _, chosen) in rooms.items():
+            self._logger.spoil(f"room: {map_index}  chosen: {alarm_tables[map_index].ids_of(chosen)}")
+
+    def _set_room(self,
+                  map_index: int,
+                  bytes_: Sequence[int],
+                  alarm_blocks: list[AlarmBlocks],
+                  chosen: int) -> None:
+        """ `bytes_` is the room without these alarms applied (not modified) """
+        with_alarms = list(bytes_)
+        blocks = Alarms._blocks_for(alarm_tables[map_index], alarm_blocks, chosen)
+        Alarms.add_alarms_to_room_terrain_bytes(with_alarms, blocks)
+        self.tc.set_room(map_index, TerrainCompressor.compress(with_alarms))
+
+    def _sample(self, map_index: int) -> int:
+        """ random alarms for this room (mask of `alarm_tables[map_index]`), paced to the space available """
+        table = alarm_tables[map_index]
+        chosen = 0
+        chosen_count = 0
+        eliminated = 0  # chosen already, or conflicting with chosen
+        lessened = 0
+
+        vanilla_alarm_count = table.vanilla_count
         self._logger.debug(f"vanilla alarms in this room: {vanilla_alarm_count}")
 
         pace_diff = self.tc.get_space() - self._space_pacer
@@ -111,28 +223,21 @@ class Alarms:
             self._logger.debug(f"increasing prob_mult from {prob_mult} to {(prob_mult + increases) / (increases + 1)}")
             prob_mult = (prob_mult + increases) / (increases + 1)
             assert prob_mult < 1, f"sanity check on increasing prob_mult {prob_mult}, pace_diff {pace_diff}"
-        while (len(eliminated) < len(this_room)) and random() < (
+        while (eliminated != table.all_mask) and random() < (
             # usually at least as many alarms as vanilla, and unlikely to have many more
-            (prob * 0.3) if len(chosen) >= vanilla_alarm_count else prob
+            (prob * 0.3) if chosen_count >= vanilla_alarm_count else prob
         ):
-            choices: list[Alarm] = [a for a in this_room if a.id not in eliminated]
-            n = len(choices)  # not changing during iteration
-            for i in range(n):
-                if choices[i].id not in lessened:
-                    choices.append(choices[i])  # add an extra chance to choose this alarm
-                    if (pace_diff > 0) or (not choices[i].vertical):
-                        # if bytes to spare or horizontal, add another chance to choose this alarm
-                        choices.append(choices[i])
-                        # Because of run-length encoding that moves horizontally,
-                        # most horizontal alarm lines don't cost any extra bytes.
-                        # The vertical ones are the expensive ones,
-                        # because they break the horizontal run.
-
-            this_choice = choice(choices)
-            chosen.add(this_choice.id)
-            eliminated.update(this_choice.disables)
-            eliminated.add(this_choice.id)
-            lessened.update(this_choice.lessens)
+            # Not lessened gets an extra chance to be chosen,
+            # and another if bytes to spare or horizontal.
+            # Because of run-length encoding that moves horizontally,
+            # most horizontal alarm lines don't cost any extra bytes.
+            # The vertical ones are the expensive ones,
+            # because they break the horizontal run.
+            this_choice = table.weighted_choice(eliminated, lessened, pace_diff > 0)
+            chosen |= 1 << this_choice
+            chosen_count += 1
+            eliminated |= table.eliminates[this_choice]
+            lessened |= table.lessens[this_choice]
 
             prob *= prob_mult
             # TODO: which rooms should have more/fewer alarm lines
@@ -143,40 +248,80 @@ class Alarms:
 
         # testing d601
         # if 0x20 < map_index < 0x30:
-        #     chosen = {a.id for a in this_room if a.vertical}
-        #     chosen = set()
+        #     chosen = table.vertical_mask
+        #     chosen = 0
 
-        self._logger.spoil(f"room: {map_index}  chosen: {chosen}")
-        bytes_ = TerrainCompressor.decompress(self.tc.get_room(map_index))
-        assert len(bytes_) == 96, f"room {map_index} doesn't have the right number of bytes: {len(bytes_)}"
+        return chosen
+
+    @staticmethod
+    def _gather_blocks(map_index: int, bytes_: Sequence[int]) -> list[AlarmBlocks]:
+        """
+        blocks of each alarm in the room (this is where the random variance is chosen)
+
+        index is the index of the alarm in `alarm_tables[map_index]`
+        """
+        table = alarm_tables[map_index]
+        tr: list[AlarmBlocks] = []
+        for i, a in enumerate(table.alarms):
+            this_alarm = table.choose_blocks(i)
+            # verify
+            # since this isn't the Patcher class, I don't have access to its self.verify
+            # don't know whether I need these assertions...
+            # I like them to help me find errors, but it might cause trouble
+            # if I have have a reason to turn verify off in Patcher.
+            # (only vanilla has blocks to erase)
+            for block_index in this_alarm[0]:
+                if a.vertical:
+                    assert bytes_[block_index] == to_vertical[bytes_[block_index]], \
+                        f"vanilla vertical map {map_index} block {block_index}"
+                else:  # horizontal
+                    assert bytes_[block_index] == to_horizontal[bytes_[block_index]], \
+                        f"vanilla horizontal map {map_index} block {block_index}"
+            # else not vanilla - can't verify because it might cross a vanilla
+            tr.append(this_alarm)
+        return tr
 
-        # gather all the blocks involved
+    @staticmethod
+    def _blocks_for(table: AlarmTable,
+                    alarm_blocks: list[AlarmBlocks],
+                    chosen: int) -> dict[int, Literal["v", "h", "n"]]:
+        """ the `blocks` for `add_alarms_to_room_terrain_bytes` with these alarms chosen """
         blocks: dict[int, Literal["v", "h", "n"]] = {}  # key block_index
-        for a in this_room:
-            for block_index, erase in a.block_iter():
-                # verify
-                # since this isn't the Patcher class, I don't have access to its self.verify
-                # don't know whether I need these assertions...
-                # I like them to help me find errors, but it might cause trouble
-                # if I have have a reason to turn verify off in Patcher.
-                if a.vanilla and erase:
-                    if a.vertical:
-                        assert bytes_[block_index] == to_vertical[bytes_[block_index]], \
-                            f"vanilla vertical map {map_index} block {block_index}"
-                    else:  # horizontal
-                        assert bytes_[block_index] == to_horizontal[bytes_[block_index]], \
-                            f"vanilla horizontal map {map_index} block {block_index}"
-                # else not vanilla - can't verify because it might cross a vanilla
-
-                if a.id in chosen and not erase:
-                    blocks[block_index] = "v" if a.vertical else "h"
-                else:
+        for i, (erase, line) in enumerate(alarm_blocks):
+            for block_index in erase:
+                if block_index not in blocks:
+                    blocks[block_index] = "n"
+            if (chosen >> i) & 1:
+                to: Literal["v", "h"] = "v" if (table.vertical_mask >> i) & 1 else "h"
+                for block_index in line:
+                    blocks[block_index] = to
+            else:
+                for block_index in line:
                     if block_index not in blocks:
                         blocks[block_index] = "n"
+        return blocks
 
-        Alarms.add_alarms_to_room_terrain_bytes(bytes_, blocks)
+    @staticmethod
+    def room_size(bytes_: Sequence[int],
+                  table: AlarmTable,
+                  alarm_blocks: list[AlarmBlocks],
+                  chosen: int) -> int:
+        """
+        exact compressed size of this room (`bytes_` uncompressed) with these alarms chosen
 
-        self.tc.set_room(map_index, TerrainCompressor.compress(bytes_))
+        `alarm_blocks` from `_gather_blocks`, `chosen` mask of `table`
+        """
+        with_alarms = list(bytes_)
+        Alarms.add_alarms_to_room_terrain_bytes(with_alarms, Alarms._blocks_for(table, alarm_blocks, chosen))
+        return TerrainCompressor.compressed_size(with_alarms)
+
+    def empty_size(self, map_index: int) -> int:
+        """ compressed size of this room with no alarms """
+        bytes_ = TerrainCompressor.decompress(self.tc.get_room(map_index))
+        for a in alarm_data[map_index]:
+            for block_index in a.all_blocks():
+                bytes_[block_index] = to_none[bytes_[block_index]]
+        return TerrainCompressor.compressed_size(bytes_)
 
     @staticmethod
     def add_alarms_to_room_terrain_bytes(
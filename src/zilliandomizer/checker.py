@@ -0,0 +1,84 @@
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from zilliandomizer.game import Game
+from zilliandomizer.logic_components.items import KEYWORD, MAIN
+from zilliandomizer.logic_components.locations import Location, Req
+from zilliandomizer.logic_components.reachability import AbilityTable, Inventory, reachable_locations
+from zilliandomizer.logic_components.regions import Region, RegionData
+from zilliandomizer.options import Options
+
+
+@dataclass
+class CheckResult:
+    beatable: bool
+    """ main computer is reachable """
+    spheres: list[list[str]]
+    """ location names of the progression items found in each sphere """
+    location_count: int
+    """ how many locations are reachable """
+
+
+def regions_from_data(region_datas: Iterable[RegionData]) -> dict[str, Region]:
+    """ rebuild the logic regions from the output of `Randomizer.get_region_data` """
+    region_datas = list(region_datas)
+    regions: dict[str, Region] = {}
+    for rd in region_datas:
+        region = Region(rd.name, rd.door)
+        region.computer = rd.computer
+        for ld in rd.locations:
+            if ld.req is None:
+                raise ValueError(f"no logic data for location {ld.name} - generated by an older version?")
+            region.locations.append(Location(ld.name, Req.from_jsonable(ld.req), item=ld.item))
+        regions[rd.name] = region
+    for rd in region_datas:
+        connections = regions[rd.name].connections
+        for other_name, req in rd.connections.items():
+            connections[regions[other_name]] = Req.from_jsonable(req)
+    if "start" not in regions or len(regions["start"].connections) == 0:
+        raise ValueError("no logic data for regions - generated by an older version?")
+    return regions
+
+
+def check_regions(region_datas: Iterable[RegionData], options: Options) -> CheckResult:
+    """ verify that the main computer can be reached with these item placements """
+    regions = regions_from_data(region_datas)
+    spheres: list[list[Location]] = []
+    found = reachable_locations(regions["start"], AbilityTable(options), Inventory(), spheres)
+    beatable = any(loc.item and loc.item.code == MAIN for loc in found)
+    return CheckResult(
+        beatable,
+        [
+            [
+                loc.name
+                for loc in sphere
+                if loc.item and (loc.item.is_progression or loc.item.required) and loc.item.code != KEYWORD
+            ]
+            for sphere in spheres
+        ],
+        len(found)
+    )
+
+
+def check_game(game: Game | Mapping[str, object]) -> CheckResult:
+    """ `game` can be a `Game` or the output of `Game.to_jsonable` """
+    if not isinstance(game, Game):
+        game = Game.from_jsonable(dict(game))
+    return check_regions(game.regions, game.options)
+
+
+def check_games(games: Iterable[Game | Mapping[str, object]],
+                max_workers: int | None = None,
+                chunksize: int = 16) -> list[CheckResult]:
+    """
+    `check_game` for many games in a process pool
+
+    results are in the same order as `games`
+
+    `max_workers` `1` checks in this process, without a pool
+    """
+    if max_workers == 1:
+        return [check_game(game) for game in games]
+    with ProcessPoolExecutor(max_workers) as executor:
+        return list(executor.map(check_game, games, chunksize=chunksize))
@@ -1,20 +1,97 @@
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import TextIO
+
+
+@dataclass
+class SphereSpoiler:
+    """ progression found in each sphere, only rendered to text when the spoiler is read """
+
+    spheres: list[list[tuple[str, str]]] = field(default_factory=list)
+    """ `(item name, location name)` for each sphere (including the last one that finds nothing new) """
+
+    def lines(self) -> Iterator[str]:
+        for sphere_i, sphere in enumerate(self.spheres):
+            if sphere_i:
+                yield f"end of sphere: {sphere_i}"
+            for item_name, loc_name in sphere:
+                yield f"get {item_name} from {loc_name}"
 
 
 class Logger:
-    spoiler_lines: list[str]
+    _lines: list[str]
+    _spheres: list[tuple[int, SphereSpoiler]]
+    """ `(index in _lines, spheres)` spheres that haven't been rendered to lines yet """
     spoil_stdout: bool
     debug_stdout: bool
 
     def __init__(self) -> None:
-        self.spoiler_lines = []
+        self._lines = []
+        self._spheres = []
         self.spoil_stdout = False
         self.debug_stdout = False
 
+    @property
+    def spoiler_lines(self) -> list[str]:
+        """ renders the spheres into the lines - `write_spoiler` doesn't keep them all in memory """
+        for index, spheres in reversed(self._spheres):
+            self._lines[index:index] = spheres.lines()
+        self._spheres.clear()
+        return self._lines
+
+    @spoiler_lines.setter
+    def spoiler_lines(self, lines: list[str]) -> None:
+        self._lines = lines
+        self._spheres = []
+
+    def _entries(self) -> Iterator[str | SphereSpoiler]:
+        start = 0
+        for index, spheres in self._spheres:
+            yield from self._lines[start:index]
+            yield spheres
+            start = index
+        yield from self._lines[start:]
+
+    def iter_spoiler_lines(self) -> Iterator[str]:
+        for entry in self._entries():
+            if isinstance(entry, str):
+                yield entry
+            else:
+                yield from entry.lines()
+
+    def write_spoiler(self, file: TextIO) -> None:
+        file.writelines(line + "\n" for line in self.iter_spoiler_lines())
+
+    def save_spoiler(self) -> list[str | SphereSpoiler]:
+        """ a copy of the spoiler so far (not rendered) """
+        return list(self._entries())
+
+    def load_spoiler(self, spoiler: list[str | SphereSpoiler]) -> None:
+        """ replace the spoiler with one from `save_spoiler` """
+        self._lines = []
+        self._spheres = []
+        for entry in spoiler:
+            if isinstance(entry, str):
+                self._lines.append(entry)
+            else:
+                self._spheres.append((len(self._lines), entry))
+
     def spoil(self, line: str) -> None:
-        self.spoiler_lines.append(line)
+        self._lines.append(line)
         if self.spoil_stdout:
             print(line)
 
+    def spoil_spheres(self, spheres: SphereSpoiler) -> None:
+        if type(self).spoil is not Logger.spoil:
+            # a subclass that handles `spoil` gets every line
+            for line in spheres.lines():
+                self.spoil(line)
+            return
+        self._spheres.append((len(self._lines), spheres))
+        if self.spoil_stdout:
+            for line in spheres.lines():
+                print(line)
+
     def debug(self, line: str) -> None:
         if self.debug_stdout:
             print(line)
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import asdict, dataclass
-from typing import Any, Literal, TypedDict
+from typing import Any, Literal, TypedDict, cast
 
 from zilliandomizer.logic_components.items import Item
 
 CharReq = tuple[Literal["JJ", "Apple", "Champ"], ...]
 """ having any member of the tuple will meet requirement """
 
+_ANY_CHAR: CharReq = ("JJ", "Apple", "Champ")
+
+_INT_REQS = ("gun", "jump", "hp", "door", "skill", "red", "floppy")
+""" the `int` properties of `Req` that are serialized """
+
 
 class Req:
     """
@@ -47,7 +53,7 @@ class Req:
     def __init__(self, *,
                  gun: int = 0,
                  jump: int = 0,
-                 char: CharReq = ("JJ", "Apple", "Champ"),
+                 char: CharReq = _ANY_CHAR,
                  hp: int = 0,
                  door: int = 0,
                  skill: int = 0,
@@ -93,9 +99,36 @@ class Req:
         names_and_values: list[str] = []
         for name in names:
             value: object = getattr(self, name)
+            if callable(value):
+                continue
             names_and_values.append(f"{name}={value!r}")
         return f'Req({", ".join(names_and_values)})'
 
+    def to_jsonable(self) -> dict[str, object]:
+        """ only the values that are not default (`have_doors` is not included) """
+        dct: dict[str, object] = {}
+        for name in _INT_REQS:
+            value: int = getattr(self, name)
+            if value:
+                dct[name] = value
+        if self.char != _ANY_CHAR:
+            dct["char"] = list(self.char)
+        if self.union is not None:
+            dct["union"] = [each.to_jsonable() for each in self.union]
+        return dct
+
+    @staticmethod
+    def from_jsonable(dct: Mapping[str, object]) -> Req:
+        req = Req()
+        for name in _INT_REQS:
+            if name in dct:
+                setattr(req, name, dct[name])
+        if "char" in dct:
+            req.char = cast(CharReq, tuple(cast(list[str], dct["char"])))
+        if "union" in dct:
+            req.union = tuple(Req.from_jsonable(each) for each in cast(list[Mapping[str, object]], dct["union"]))
+        return req
+
 
 class ReqArgs(TypedDict, total=False):
     gun: int
@@ -134,6 +167,8 @@ class LocationData:
     name: str
     item: Item
     req_gun: int
+    req: dict[str, object] | None = None
+    """ `Req.to_jsonable` of the full requirement - `None` from versions that didn't save logic """
 
     @staticmethod
     def from_location(location: Location) -> LocationData:
@@ -143,7 +178,8 @@ class LocationData:
         return LocationData(
             location.name,
             item,
-            location.req.gun
+            location.req.gun,
+            location.req.to_jsonable()
         )
 
     def to_jsonable(self) -> dict[str, object]:
@@ -0,0 +1,210 @@
+from collections import deque
+from collections.abc import Iterable
+
+from zilliandomizer.logic_components.items import KEYWORD, RESCUE, Item
+from zilliandomizer.logic_components.locations import Location, Req
+from zilliandomizer.logic_components.regions import Region
+from zilliandomizer.options import ID, Chars, Options, char_to_hp, char_to_gun, char_to_jump, chars
+
+
+def _get_locations_inner(start: Region, have: Req) -> list[Location]:
+    """ adds doors to `have`  - see `get_locations` """
+    # Python set order is determined by OS memory state,
+    # making it "random" and not determined by random.seed()
+    # Otherwise found_locations would be a set.
+    found_locations: list[Location] = []
+    todo_queue: deque[Region] = deque()
+    regions_finished: set[str] = set()
+
+    todo_queue.append(start)
+
+    while len(todo_queue):
+        this_region = todo_queue.popleft()
+        if this_region.name in regions_finished:
+            continue
+        count_keywords = 0
+        for loc in this_region.locations:
+            loc_req = loc.req
+            if loc.item and loc.item.code == RESCUE:
+                # having a rescue in a location removes the gun requirement
+                loc_req.gun = 0
+            if have >= loc_req:
+                found_locations.append(loc)
+                if loc.item and loc.item.code == KEYWORD:
+                    count_keywords += 1
+        if count_keywords > 3:
+            have.have_doors.add(this_region.door)
+        for neighbor in this_region.connections:
+            conn_req = this_region.connections[neighbor]
+            if neighbor.name not in regions_finished and have >= conn_req:
+                todo_queue.append(neighbor)
+        regions_finished.add(this_region.name)
+
+    return found_locations
+
+
+def get_locations(start: Region, have: Req) -> list[Location]:
+    """ locations that I have access to without getting any more items (1 sphere) """
+    # I don't want a sphere for each door,
+    # so I get the sphere modifying what doors I have access to repeatedly
+    # until I don't get any more.
+    last_count = -1
+    locations: list[Location] = []
+    while len(locations) != last_count:
+        last_count = len(locations)
+        locations = _get_locations_inner(start, have)
+
+    return locations
+
+
+class Inventory:
+    """ item counts for making abilities - updated as items are added and removed, without counting again """
+
+    __slots__: tuple[str, ...] = ("counts", "item_count", "rescues")
+
+    counts: list[int]
+    """ index is `ID` (rescues not included) """
+    rescues: list[int]
+    """ index is rescue id """
+    item_count: int
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self.counts = [0] * len(ID)
+        self.rescues = [0, 0]
+        self.item_count = 0
+        for item in items:
+            self.add(item)
+
+    def add(self, item: Item) -> None:
+        if item.code == RESCUE:
+            self.rescues[item.id] += 1
+        else:
+            self.counts[item.id] += 1
+        self.item_count += 1
+
+    def remove(self, item: Item) -> None:
+        if item.code == RESCUE:
+            assert self.rescues[item.id] > 0, f"removing {item} not in inventory"
+            self.rescues[item.id] -= 1
+        else:
+            assert self.counts[item.id] > 0, f"removing {item} not in inventory"
+            self.counts[item.id] -= 1
+        self.item_count -= 1
+
+    def copy(self) -> "Inventory":
+        tr = Inventory()
+        tr.counts = self.counts.copy()
+        tr.rescues = self.rescues.copy()
+        tr.item_count = self.item_count
+        return tr
+
+
+class AbilityTable:
+    """ abilities for each combination of characters, gun count, and opa count, with these options """
+
+    skill: int
+    _start_bit: int
+    _rescue_bits: tuple[int, int]
+    """ index is rescue id """
+    _max_opa: int
+    """ opas after this don't change anything """
+    _chars: list[tuple[Chars, ...]]
+    """ index is chars bitmask (bit index from `chars`) """
+    _hp: list[list[int]]
+    """ [chars bitmask][opa count] """
+    _gun: list[list[int]]
+    """ [chars bitmask][gun count] """
+    _jump: list[list[int]]
+    """ [chars bitmask][opa count] """
+
+    def __init__(self, options: Options) -> None:
+        self.skill = options.skill
+        self._start_bit = 1 << chars.index(options.start_char)
+        # whichever char I start with is replaced with JJ
+        self._rescue_bits = (
+            1 << chars.index("JJ" if options.start_char == "Apple" else "Apple"),
+            1 << chars.index("JJ" if options.start_char == "Champ" else "Champ")
+        )
+        self._max_opa = (options.max_level - 1) * options.opas_per_level
+        levels = [
+            min(options.max_level - 1, opa_count // options.opas_per_level)
+            for opa_count in range(self._max_opa + 1)
+        ]
+        gun_count_limit = max(len(char_to_gun[char][options.gun_levels]) for char in chars)
+
+        self._chars = []
+        self._hp = []
+        self._gun = []
+        self._jump = []
+        for mask in range(1 << len(chars)):
+            have_chars: tuple[Chars, ...] = tuple(char for i, char in enumerate(chars) if mask & (1 << i))
+            self._chars.append(have_chars)
+            if len(have_chars) == 0:
+                self._hp.append([])
+                self._gun.append([])
+                self._jump.append([])
+                continue
+            base_hp = max(char_to_hp[char] for char in have_chars)
+            self._hp.append([base_hp + 20 * levels_gained for levels_gained in levels])
+            self._gun.append([
+                max(char_to_gun[char][options.gun_levels][
+                    min(gun_count, len(char_to_gun[char][options.gun_levels]) - 1)
+                ] for char in have_chars)
+                for gun_count in range(gun_count_limit)
+            ])
+            self._jump.append([
+                max(char_to_jump[char][options.jump_levels][
+                    min(levels_gained, len(char_to_jump[char][options.jump_levels]) - 1)
+                ] for char in have_chars)
+                for levels_gained in levels
+            ])
+
+    def make_ability(self, inventory: Inventory) -> Req:
+        """ from just these items and options """
+        mask = self._start_bit
+        for rescue_id, count in enumerate(inventory.rescues):
+            if count:
+                mask |= self._rescue_bits[rescue_id]
+        counts = inventory.counts
+        opa_count = min(counts[ID.opa], self._max_opa)
+        gun_row = self._gun[mask]
+        return Req(gun=gun_row[min(counts[ID.gun], len(gun_row) - 1)],
+                   jump=self._jump[mask][opa_count],
+                   char=self._chars[mask],
+                   hp=self._hp[mask][opa_count],
+                   skill=self.skill,
+                   red=counts[ID.red],
+                   floppy=counts[ID.floppy])
+
+
+def reachable_locations(start: Region,
+                        abilities: AbilityTable,
+                        items: Inventory,
+                        spheres: list[list[Location]] | None = None) -> list[Location]:
+    """
+    multiple spheres until I can't get any more items
+
+    If `spheres` is given, the locations with items found in each sphere are appended to it
+    (one list for each sphere, including the last one that finds nothing new).
+    """
+    items = items.copy()  # don't mutate
+    prev_item_count = items.item_count
+    # Python set order is determined by OS memory state,
+    # making it "random" and not determined by random.seed()
+    locations_found: dict[Location, bool] = {}
+
+    while True:
+        have = abilities.make_ability(items)
+        locs = get_locations(start, have)
+        this_sphere: list[Location] = []
+        for loc in locs:
+            if not (locations_found.get(loc) or loc.item is None):
+                items.add(loc.item)
+                this_sphere.append(loc)
+            locations_found[loc] = True
+        if spheres is not None:
+            spheres.append(this_sphere)
+        if items.item_count == prev_item_count:
+            # didn't get anything new this sphere
+            return list(locations_found)
+        prev_item_count = items.item_count
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from typing import TYPE_CHECKING, Any
 
 from zilliandomizer.logic_components.locations import Location, LocationData, Req, ReqArgs
@@ -46,6 +46,8 @@ class RegionData:
     door: int
     locations: list[LocationData]
     computer: bytes
+    connections: dict[str, dict[str, object]] = field(default_factory=dict)
+    """ `{ region_name: Req.to_jsonable() }` - empty from versions that didn't save logic """
 
     @staticmethod
     def from_region(region: Region) -> RegionData:
@@ -53,7 +55,11 @@ class RegionData:
             region.name,
             region.door,
             [LocationData.from_location(loc) for loc in region.locations],
-            region.computer
+            region.computer,
+            {
+                other.name: req.to_jsonable()
+                for other, req in region.connections.items()
+            }
         )
 
     def to_jsonable(self) -> dict[str, object]:
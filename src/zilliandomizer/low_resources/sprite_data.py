@@ -1,9 +1,11 @@
 from dataclasses import dataclass
+from itertools import accumulate
+from typing import Final
 
 from zilliandomizer.low_resources import rom_info
 
 
-@dataclass
+@dataclass(slots=True)
 class Sprite:
     """
     6 bytes for each sprite
@@ -101,363 +103,175 @@ index is map_index
 """
 
 
-data: dict[int, RoomSprites] = {
-    0: [],
-    1: [],
-    2: [],
-    3: [Sprite(ram=50112, y=96, x=8, type=(14, 0)),
-        Sprite(ram=50272, y=16, x=112, type=(9, 0))],
-    4: [],
-    5: [],
-    6: [Sprite(ram=50016, y=152, x=144, type=(16, 0)),
-        Sprite(ram=50272, y=16, x=16, type=(9, 0)),
-        Sprite(ram=50080, y=0, x=128, type=(12, 0))],
-    7: [],
-    8: [Sprite(ram=50272, y=168, x=48, type=(52, 2)),
-        Sprite(ram=50432, y=152, x=152, type=(20, 0))],
-    9: [Sprite(ram=50016, y=152, x=80, type=(16, 0))],
-    10: [Sprite(ram=50272, y=64, x=72, type=(31, 4))],
-    11: [Sprite(ram=50432, y=152, x=48, type=(20, 0)),
-         Sprite(ram=50464, y=152, x=16, type=(20, 0))],
-    12: [Sprite(ram=50272, y=168, x=80, type=(50, 0)),
-         Sprite(ram=50304, y=168, x=160, type=(50, 0)),
-         Sprite(ram=50432, y=152, x=192, type=(20, 1))],
-    13: [Sprite(ram=50272, y=8, x=96, type=(31, 4)),
-         Sprite(ram=50304, y=96, x=240, type=(57, 128))],
-    14: [],
-    15: [],
-    16: [Sprite(ram=50432, y=152, x=48, type=(20, 0))],
-    17: [Sprite(ram=50016, y=152, x=80, type=(16, 0))],
-    18: [Sprite(ram=50272, y=168, x=80, type=(50, 0)),
-         Sprite(ram=50304, y=168, x=160, type=(50, 0))],
-    19: [Sprite(ram=50336, y=168, x=80, type=(50, 0)),
-         Sprite(ram=50432, y=152, x=80, type=(20, 0)),
-         Sprite(ram=50464, y=152, x=128, type=(20, 0))],
-    20: [],
-    21: [Sprite(ram=50432, y=152, x=112, type=(20, 0))],
-    22: [Sprite(ram=50016, y=152, x=144, type=(16, 0))],
-    23: [Sprite(ram=50272, y=64, x=80, type=(31, 2)),
-         Sprite(ram=50432, y=152, x=144, type=(20, 0))],
-    24: [Sprite(ram=50016, y=152, x=80, type=(16, 0))],
-    25: [Sprite(ram=50304, y=152, x=80, type=(20, 0)),
-         Sprite(ram=50336, y=152, x=112, type=(20, 0)),
-         Sprite(ram=50368, y=152, x=144, type=(20, 0))],
-    26: [Sprite(ram=50272, y=128, x=120, type=(31, 4))],
-    27: [Sprite(ram=50304, y=64, x=120, type=(31, 4))],
-    28: [],
-    29: [Sprite(ram=50336, y=0, x=128, type=(31, 4)),
-         Sprite(ram=50432, y=152, x=72, type=(20, 0))],
-    30: [Sprite(ram=50016, y=152, x=144, type=(16, 0))],
-    31: [],
-    32: [Sprite(ram=50016, y=152, x=80, type=(16, 0)),
-         Sprite(ram=50432, y=152, x=128, type=(20, 0))],
-    33: [Sprite(ram=50272, y=0, x=80, type=(31, 4))],
-    34: [],
-    35: [Sprite(ram=50432, y=152, x=112, type=(20, 1)),
-         Sprite(ram=50464, y=152, x=144, type=(20, 1))],
-    36: [Sprite(ram=50272, y=56, x=64, type=(31, 1))],
-    37: [Sprite(ram=50304, y=64, x=168, type=(31, 4)),
-         Sprite(ram=50432, y=152, x=128, type=(20, 1)),
-         Sprite(ram=50464, y=152, x=160, type=(20, 1)),
-         Sprite(ram=50496, y=152, x=192, type=(20, 1))],
-    38: [Sprite(ram=50016, y=152, x=144, type=(16, 0)),
-         Sprite(ram=50432, y=152, x=48, type=(20, 0)),
-         Sprite(ram=50464, y=152, x=80, type=(20, 0))],
-    39: [Sprite(ram=50016, y=152, x=144, type=(16, 0)),
-         Sprite(ram=50496, y=152, x=64, type=(20, 1)),
-         Sprite(ram=50528, y=152, x=96, type=(20, 1))],
-    40: [Sprite(ram=50016, y=152, x=80, type=(16, 0)),
-         Sprite(ram=50432, y=152, x=168, type=(20, 3))],
-    41: [Sprite(ram=50272, y=80, x=72, type=(33, 35)),
-         Sprite(ram=50304, y=128, x=160, type=(33, 35)),
-         Sprite(ram=50336, y=128, x=192, type=(33, 34)),
-         Sprite(ram=50368, y=120, x=72, type=(31, 6)),
-         Sprite(ram=50400, y=56, x=112, type=(31, 1))],
-    42: [Sprite(ram=50016, y=152, x=80, type=(16, 0))],
-    43: [Sprite(ram=50272, y=104, x=96, type=(50, 0)),
-         Sprite(ram=50432, y=152, x=128, type=(20, 2)),
-         Sprite(ram=50464, y=152, x=160, type=(20, 2))],
-    44: [Sprite(ram=50304, y=64, x=128, type=(31, 4)),
-         Sprite(ram=50336, y=96, x=16, type=(33, 58)),
-         Sprite(ram=50368, y=0, x=136, type=(33, 34)),
-         Sprite(ram=50400, y=136, x=224, type=(33, 36)),
-         Sprite(ram=50432, y=24, x=96, type=(20, 3)),
-         Sprite(ram=50464, y=24, x=128, type=(20, 3))],
-    45: [],
-    46: [Sprite(ram=50016, y=152, x=144, type=(16, 0)),
-         Sprite(ram=50272, y=168, x=56, type=(50, 0))],
-    47: [Sprite(ram=50304, y=120, x=208, type=(31, 1)),
-         Sprite(ram=50432, y=152, x=104, type=(20, 3)),
-         Sprite(ram=50464, y=152, x=120, type=(20, 3))],
-    48: [Sprite(ram=50272, y=152, x=120, type=(52, 1))],
-    49: [Sprite(ram=50272, y=120, x=80, type=(31, 0)),
-         Sprite(ram=50304, y=120, x=160, type=(31, 0)),
-         Sprite(ram=50432, y=24, x=32, type=(20, 2)),
-         Sprite(ram=50464, y=24, x=192, type=(20, 2)),
-         Sprite(ram=50496, y=152, x=192, type=(20, 3))],
-    50: [Sprite(ram=50016, y=152, x=80, type=(16, 0))],
-    51: [Sprite(ram=50304, y=0, x=96, type=(31, 5)),
-         Sprite(ram=50336, y=104, x=208, type=(50, 0)),
-         Sprite(ram=50432, y=152, x=72, type=(20, 2))],
-    52: [Sprite(ram=50272, y=56, x=16, type=(33, 35)),
-         Sprite(ram=50368, y=64, x=144, type=(33, 34)),
-         Sprite(ram=50400, y=104, x=112, type=(50, 0)),
-         Sprite(ram=50336, y=40, x=144, type=(50, 0)),
-         Sprite(ram=50432, y=152, x=152, type=(20, 2))],
-    53: [],
-    54: [Sprite(ram=50272, y=0, x=112, type=(33, 34))],
-    55: [Sprite(ram=50272, y=104, x=40, type=(50, 0)),
-         Sprite(ram=50304, y=104, x=104, type=(50, 0)),
-         Sprite(ram=50336, y=104, x=168, type=(50, 0)),
-         Sprite(ram=50368, y=40, x=72, type=(50, 0)),
-         Sprite(ram=50400, y=40, x=136, type=(50, 0)),
-         Sprite(ram=50432, y=152, x=96, type=(20, 2)),
-         Sprite(ram=50464, y=152, x=128, type=(20, 2))],
-    56: [Sprite(ram=50016, y=152, x=80, type=(16, 0))],
-    57: [Sprite(ram=50336, y=64, x=40, type=(31, 4))],
-    58: [],
-    59: [],
-    60: [Sprite(ram=50272, y=0, x=56, type=(33, 34)),
-         Sprite(ram=50304, y=0, x=104, type=(33, 34)),
-         Sprite(ram=50336, y=0, x=160, type=(33, 34)),
-         Sprite(ram=50368, y=64, x=56, type=(33, 34)),
-         Sprite(ram=50400, y=64, x=144, type=(33, 34)),
-         Sprite(ram=50432, y=64, x=184, type=(33, 34)),
-         Sprite(ram=50464, y=128, x=88, type=(33, 34)),
-         Sprite(ram=50496, y=128, x=152, type=(33, 34))],
-    61: [Sprite(ram=50272, y=64, x=32, type=(33, 34)),
-         Sprite(ram=50304, y=64, x=72, type=(33, 34)),
-         Sprite(ram=50336, y=0, x=112, type=(33, 34)),
-         Sprite(ram=50368, y=64, x=168, type=(33, 34)),
-         Sprite(ram=50400, y=40, x=168, type=(50, 0))],
-    62: [Sprite(ram=50304, y=168, x=72, type=(50, 0)),
-         Sprite(ram=50432, y=152, x=160, type=(20, 2))],
-    63: [Sprite(ram=50464, y=96, x=40, type=(55, 2))],
-    64: [],
-    65: [Sprite(ram=50272, y=96, x=16, type=(33, 35)),
-         Sprite(ram=50304, y=48, x=224, type=(33, 36))],
-    66: [Sprite(ram=50016, y=152, x=80, type=(16, 0))],
-    67: [Sprite(ram=50272, y=72, x=16, type=(33, 58)),
-         Sprite(ram=50304, y=104, x=16, type=(33, 58)),
-         Sprite(ram=50432, y=152, x=192, type=(20, 1))],
-    68: [Sprite(ram=50336, y=128, x=120, type=(31, 4))],
-    69: [],
-    70: [Sprite(ram=50272, y=72, x=16, type=(33, 35)),
-         Sprite(ram=50304, y=128, x=16, type=(33, 35)),
-         Sprite(ram=50336, y=168, x=32, type=(50, 0)),
-         Sprite(ram=50368, y=168, x=88, type=(50, 0)),
-         Sprite(ram=50400, y=168, x=144, type=(50, 0)),
-         Sprite(ram=50560, y=168, x=200, type=(50, 0))],
-    71: [Sprite(ram=50272, y=0, x=24, type=(31, 4)),
-         Sprite(ram=50304, y=64, x=72, type=(33, 34)),
-         Sprite(ram=50336, y=64, x=120, type=(33, 34)),
-         Sprite(ram=50368, y=168, x=144, type=(50, 0)),
-         Sprite(ram=50432, y=88, x=192, type=(20, 0))],
-    72: [],
-    73: [Sprite(ram=50304, y=104, x=56, type=(50, 0)),
-         Sprite(ram=50336, y=72, x=88, type=(50, 0)),
-         Sprite(ram=50400, y=128, x=80, type=(31, 4)),
-         Sprite(ram=50432, y=96, x=120, type=(31, 5)),
-         Sprite(ram=50464, y=64, x=144, type=(31, 4)),
-         Sprite(ram=50496, y=120, x=16, type=(20, 2)),
-         Sprite(ram=50528, y=152, x=176, type=(20, 3))],
-    74: [Sprite(ram=50016, y=152, x=80, type=(16, 0)),
-         Sprite(ram=50272, y=152, x=72, type=(52, 4))],
-    75: [Sprite(ram=50304, y=8, x=88, type=(31, 4))],
-    76: [Sprite(ram=50272, y=32, x=16, type=(33, 58)),
-         Sprite(ram=50368, y=168, x=64, type=(50, 0)),
-         Sprite(ram=50400, y=168, x=144, type=(50, 0)),
-         Sprite(ram=50432, y=152, x=192, type=(20, 3))],
-    77: [Sprite(ram=50304, y=64, x=112, type=(31, 1)),
-         Sprite(ram=50336, y=64, x=160, type=(31, 1)),
-         Sprite(ram=50464, y=152, x=128, type=(20, 2))],
-    78: [],
-    79: [Sprite(ram=50272, y=64, x=56, type=(31, 4)),
-         Sprite(ram=50304, y=64, x=96, type=(31, 4)),
-         Sprite(ram=50336, y=64, x=136, type=(31, 4)),
-         Sprite(ram=50368, y=64, x=176, type=(31, 4)),
-         Sprite(ram=50400, y=136, x=224, type=(33, 36))],
-    80: [],
-    81: [Sprite(ram=50272, y=0, x=160, type=(33, 34)),
-         Sprite(ram=50304, y=48, x=224, type=(33, 36)),
-         Sprite(ram=50432, y=88, x=48, type=(20, 3)),
-         Sprite(ram=50464, y=88, x=88, type=(20, 2))],
-    82: [Sprite(ram=50336, y=72, x=64, type=(50, 0)),
-         Sprite(ram=50368, y=72, x=176, type=(50, 0))],
-    83: [Sprite(ram=50272, y=64, x=64, type=(33, 34)),
-         Sprite(ram=50304, y=64, x=176, type=(33, 34)),
-         Sprite(ram=50432, y=24, x=120, type=(20, 3)),
-         Sprite(ram=50464, y=24, x=144, type=(20, 3))],
-    84: [Sprite(ram=50272, y=136, x=64, type=(50, 0)),
-         Sprite(ram=50304, y=40, x=112, type=(50, 0)),
-         Sprite(ram=50368, y=0, x=88, type=(33, 34)),
-         Sprite(ram=50400, y=32, x=224, type=(33, 36)),
-         Sprite(ram=50432, y=152, x=208, type=(20, 3))],
-    85: [],
-    86: [Sprite(ram=50432, y=152, x=128, type=(20, 2)),
-         Sprite(ram=50464, y=152, x=160, type=(20, 2)),
-         Sprite(ram=50496, y=152, x=192, type=(20, 2))],
-    87: [Sprite(ram=50016, y=152, x=144, type=(16, 0)),
-         Sprite(ram=50496, y=152, x=64, type=(20, 2))],
-    88: [Sprite(ram=50016, y=152, x=80, type=(16, 0))],
-    89: [Sprite(ram=50432, y=152, x=104, type=(20, 3)),
-         Sprite(ram=50464, y=152, x=128, type=(20, 3))],
-    90: [Sprite(ram=50272, y=112, x=16, type=(33, 35)),
-         Sprite(ram=50304, y=48, x=40, type=(33, 36)),
-         Sprite(ram=50400, y=88, x=32, type=(31, 6)),
-         Sprite(ram=50432, y=152, x=104, type=(20, 2))],
-    91: [Sprite(ram=50272, y=168, x=80, type=(50, 0)),
-         Sprite(ram=50304, y=168, x=160, type=(50, 0)),
-         Sprite(ram=50336, y=0, x=112, type=(33, 56)),
-         Sprite(ram=50368, y=32, x=224, type=(33, 59)),
-         Sprite(ram=50432, y=152, x=144, type=(20, 3))],
-    92: [Sprite(ram=50272, y=168, x=80, type=(50, 0)),
-         Sprite(ram=50400, y=168, x=144, type=(50, 0)),
-         Sprite(ram=50432, y=152, x=80, type=(20, 2))],
-    93: [Sprite(ram=50272, y=16, x=96, type=(33, 36)),
-         Sprite(ram=50304, y=32, x=128, type=(33, 35)),
-         Sprite(ram=50336, y=88, x=16, type=(31, 1)),
-         Sprite(ram=50368, y=120, x=112, type=(31, 1)),
-         Sprite(ram=50432, y=152, x=144, type=(20, 3)),
-         Sprite(ram=50464, y=152, x=168, type=(20, 3))],
-    94: [Sprite(ram=50272, y=64, x=48, type=(33, 35)),
-         Sprite(ram=50304, y=96, x=80, type=(33, 35)),
-         Sprite(ram=50336, y=128, x=112, type=(33, 35)),
-         Sprite(ram=50368, y=64, x=160, type=(33, 34)),
-         Sprite(ram=50400, y=64, x=192, type=(33, 34)),
-         Sprite(ram=50432, y=88, x=24, type=(55, 3))],
-    95: [],
-    96: [],
-    97: [Sprite(ram=50272, y=0, x=112, type=(33, 34)),
-         Sprite(ram=50304, y=120, x=16, type=(31, 1)),
-         Sprite(ram=50336, y=56, x=208, type=(31, 1)),
-         Sprite(ram=50432, y=24, x=144, type=(20, 3)),
-         Sprite(ram=50464, y=88, x=96, type=(20, 3)),
-         Sprite(ram=50496, y=152, x=160, type=(20, 3))],
-    98: [Sprite(ram=50272, y=64, x=48, type=(33, 34)),
-         Sprite(ram=50304, y=128, x=80, type=(33, 34)),
-         Sprite(ram=50336, y=0, x=104, type=(33, 34)),
-         Sprite(ram=50368, y=88, x=160, type=(31, 0)),
-         Sprite(ram=50400, y=168, x=176, type=(50, 0))],
-    99: [Sprite(ram=50272, y=64, x=16, type=(33, 34)),
-         Sprite(ram=50400, y=104, x=96, type=(50, 0)),
-         Sprite(ram=50432, y=80, x=40, type=(55, 2)),
-         Sprite(ram=50464, y=96, x=48, type=(55, 2))],
-    100: [Sprite(ram=50272, y=168, x=128, type=(50, 0)),
-          Sprite(ram=50304, y=64, x=64, type=(33, 56)),
-          Sprite(ram=50336, y=0, x=96, type=(33, 56)),
-          Sprite(ram=50368, y=64, x=112, type=(33, 56)),
-          Sprite(ram=50432, y=152, x=128, type=(20, 2))],
-    101: [Sprite(ram=50336, y=24, x=160, type=(20, 3)),
-          Sprite(ram=50400, y=24, x=144, type=(20, 3)),
-          Sprite(ram=50432, y=152, x=104, type=(20, 2)),
-          Sprite(ram=50464, y=152, x=128, type=(20, 2)),
-          Sprite(ram=50496, y=152, x=160, type=(20, 2))],
-    102: [Sprite(ram=50304, y=0, x=112, type=(33, 34))],
-    103: [],
-    104: [Sprite(ram=50016, y=24, x=80, type=(16, 0))],
-    105: [Sprite(ram=50336, y=168, x=80, type=(50, 0)),
-          Sprite(ram=50368, y=168, x=96, type=(50, 0)),
-          Sprite(ram=50400, y=56, x=80, type=(31, 0)),
-          Sprite(ram=50432, y=136, x=112, type=(31, 7))],
-    106: [Sprite(ram=50272, y=168, x=64, type=(50, 0)),
-          Sprite(ram=50304, y=168, x=96, type=(50, 0)),
-          Sprite(ram=50368, y=168, x=160, type=(50, 0)),
-          Sprite(ram=50400, y=0, x=112, type=(33, 34)),
-          Sprite(ram=50432, y=152, x=128, type=(20, 3))],
-    107: [Sprite(ram=50272, y=64, x=48, type=(33, 34)),
-          Sprite(ram=50304, y=64, x=96, type=(33, 34)),
-          Sprite(ram=50336, y=64, x=136, type=(33, 34)),
-          Sprite(ram=50368, y=40, x=80, type=(50, 0)),
-          Sprite(ram=50400, y=40, x=112, type=(50, 0)),
-          Sprite(ram=50432, y=40, x=160, type=(50, 0)),
-          Sprite(ram=50528, y=152, x=104, type=(20, 2)),
-          Sprite(ram=50464, y=152, x=128, type=(20, 2)),
-          Sprite(ram=50496, y=152, x=152, type=(20, 2))],
-    108: [Sprite(ram=50272, y=96, x=56, type=(33, 34)),
-          Sprite(ram=50304, y=0, x=88, type=(33, 34)),
-          Sprite(ram=50336, y=128, x=112, type=(33, 34)),
-          Sprite(ram=50368, y=0, x=152, type=(33, 34)),
-          Sprite(ram=50432, y=120, x=176, type=(20, 2))],
-    109: [Sprite(ram=50272, y=0, x=96, type=(33, 34)),
-          Sprite(ram=50304, y=64, x=168, type=(33, 36)),
-          Sprite(ram=50336, y=24, x=224, type=(33, 36)),
-          Sprite(ram=50368, y=168, x=104, type=(50, 0)),
-          Sprite(ram=50400, y=40, x=112, type=(50, 0)),
-          Sprite(ram=50432, y=80, x=40, type=(55, 2)),
-          Sprite(ram=50464, y=96, x=48, type=(55, 2))],
-    110: [Sprite(ram=50336, y=168, x=32, type=(50, 0)),
-          Sprite(ram=50432, y=152, x=168, type=(20, 3)),
-          Sprite(ram=50464, y=152, x=192, type=(20, 3))],
-    111: [Sprite(ram=50016, y=24, x=144, type=(16, 0)),
-          Sprite(ram=50432, y=24, x=104, type=(20, 3))],
-    112: [Sprite(ram=50016, y=152, x=80, type=(16, 0))],
-    113: [Sprite(ram=50336, y=168, x=32, type=(50, 0)),
-          Sprite(ram=50304, y=168, x=80, type=(50, 0)),
-          Sprite(ram=50272, y=168, x=128, type=(50, 0))],
-    114: [],
-    115: [Sprite(ram=50272, y=168, x=96, type=(50, 0)),
-          Sprite(ram=50304, y=168, x=152, type=(50, 0)),
-          Sprite(ram=50368, y=168, x=208, type=(50, 0))],
-    116: [Sprite(ram=50400, y=64, x=64, type=(33, 34)),
-          Sprite(ram=50336, y=104, x=112, type=(50, 0)),
-          Sprite(ram=50272, y=8, x=224, type=(33, 36)),
-          Sprite(ram=50432, y=80, x=40, type=(55, 2)),
-          Sprite(ram=50464, y=96, x=48, type=(55, 2))],
-    117: [],
-    118: [Sprite(ram=50272, y=0, x=104, type=(33, 34)),
-          Sprite(ram=50304, y=104, x=112, type=(50, 0)),
-          Sprite(ram=50336, y=168, x=112, type=(50, 0)),
-          Sprite(ram=50368, y=104, x=160, type=(50, 0)),
-          Sprite(ram=50400, y=168, x=208, type=(50, 0)),
-          Sprite(ram=50432, y=168, x=160, type=(50, 0)),
-          Sprite(ram=50464, y=88, x=80, type=(20, 3)),
-          Sprite(ram=50496, y=88, x=104, type=(20, 3))],
-    119: [Sprite(ram=50016, y=152, x=144, type=(16, 0))],
-    120: [],
-    121: [Sprite(ram=50016, y=152, x=144, type=(16, 0)),
-          Sprite(ram=50432, y=152, x=208, type=(20, 3))],
-    122: [Sprite(ram=50272, y=104, x=128, type=(33, 34)),
-          Sprite(ram=50304, y=24, x=224, type=(33, 36)),
-          Sprite(ram=50336, y=64, x=176, type=(33, 36)),
-          Sprite(ram=50368, y=80, x=128, type=(50, 0)),
-          Sprite(ram=50400, y=80, x=144, type=(50, 0)),
-          Sprite(ram=50432, y=152, x=96, type=(20, 2))],
-    123: [Sprite(ram=50400, y=64, x=80, type=(33, 34)),
-          Sprite(ram=50432, y=152, x=120, type=(20, 2)),
-          Sprite(ram=50464, y=152, x=144, type=(20, 2))],
-    124: [Sprite(ram=50336, y=0, x=104, type=(33, 34)),
-          Sprite(ram=50368, y=64, x=144, type=(33, 34)),
-          Sprite(ram=50400, y=40, x=16, type=(50, 0)),
-          Sprite(ram=50272, y=104, x=96, type=(50, 0)),
-          Sprite(ram=50304, y=104, x=144, type=(50, 0)),
-          Sprite(ram=50432, y=168, x=144, type=(50, 0))],
-    125: [Sprite(ram=50336, y=96, x=32, type=(33, 34)),
-          Sprite(ram=50368, y=88, x=80, type=(31, 0)),
-          Sprite(ram=50304, y=120, x=80, type=(31, 1)),
-          Sprite(ram=50432, y=88, x=120, type=(20, 2)),
-          Sprite(ram=50464, y=88, x=144, type=(20, 2))],
-    126: [Sprite(ram=50272, y=96, x=56, type=(33, 34)),
-          Sprite(ram=50304, y=128, x=96, type=(33, 34)),
-          Sprite(ram=50336, y=168, x=144, type=(33, 59)),
-          Sprite(ram=50368, y=64, x=176, type=(33, 34)),
-          Sprite(ram=50400, y=16, x=224, type=(33, 36))],
-    127: [Sprite(ram=50016, y=152, x=144, type=(16, 0))],
-    128: [Sprite(ram=50016, y=152, x=80, type=(16, 0))],
-    129: [Sprite(ram=50016, y=152, x=144, type=(16, 0)),
-          Sprite(ram=50432, y=152, x=64, type=(20, 1)),
-          Sprite(ram=50464, y=152, x=96, type=(20, 1))],
-    130: [Sprite(ram=50272, y=64, x=80, type=(33, 34)),
-          Sprite(ram=50432, y=152, x=144, type=(20, 1)),
-          Sprite(ram=50464, y=152, x=168, type=(20, 1))],
-    131: [],
-    132: [Sprite(ram=50432, y=152, x=128, type=(20, 1)),
-          Sprite(ram=50464, y=152, x=160, type=(20, 1))],
-    133: [],
-    134: [Sprite(ram=50432, y=152, x=112, type=(20, 1)),
-          Sprite(ram=50464, y=152, x=144, type=(20, 1))],
-    135: [Sprite(ram=50016, y=152, x=144, type=(16, 0))]
-}
+_ROOM_HEX: Final = (
+    "",  # 0x00
+    "",  # 0x01
+    "",  # 0x02
+    "c0c308600e00 60c470100900",  # 0x03
+    "",  # 0x04
+    "",  # 0x05
+    "60c390981000 60c410100900 a0c380000c00",  # 0x06
+    "",  # 0x07
+    "60c430a83402 00c598981400",  # 0x08
+    "60c350981000",  # 0x09
+    "60c448401f04",  # 0x0a
+    "00c530981400 20c510981400",  # 0x0b
+    "60c450a83200 80c4a0a83200 00c5c0981401",  # 0x0c
+    "60c460081f04 80c4f0603980",  # 0x0d
+    "",  # 0x0e
+    "",  # 0x0f
+    "00c530981400",  # 0x10
+    "60c350981000",  # 0x11
+    "60c450a83200 80c4a0a83200",  # 0x12
+    "a0c450a83200 00c550981400 20c580981400",  # 0x13
+    "",  # 0x14
+    "00c570981400",  # 0x15
+    "60c390981000",  # 0x16
+    "60c450401f02 00c590981400",  # 0x17
+    "60c350981000",  # 0x18
+    "80c450981400 a0c470981400 c0c490981400",  # 0x19
+    "60c478801f04",  # 0x1a
+    "80c478401f04",  # 0x1b
+    "",  # 0x1c
+    "a0c480001f04 00c548981400",  # 0x1d
+    "60c390981000",  # 0x1e
+    "",  # 0x1f
+    "60c350981000 00c580981400",  # 0x20
+    "60c450001f04",  # 0x21
+    "",  # 0x22
+    "00c570981401 20c590981401",  # 0x23
+    "60c440381f01",  # 0x24
+    "80c4a8401f04 00c580981401 20c5a0981401 40c5c0981401",  # 0x25
+    "60c390981000 00c530981400 20c550981400",  # 0x26
+    "60c390981000 40c540981401 60c560981401",  # 0x27
+    "60c350981000 00c5a8981403",  # 0x28
+    "60c448502123 80c4a0802123 a0c4c0802122 c0c448781f06 e0c470381f01",  # 0x29
+    "60c350981000",  # 0x2a
+    "60c460683200 00c580981402 20c5a0981402",  # 0x2b
+    "80c480401f04 a0c41060213a c0c488002122 e0c4e0882124 00c560181403 20c580181403",  # 0x2c
+    "",  # 0x2d
+    "60c390981000 60c438a83200",  # 0x2e
+    "80c4d0781f01 00c568981403 20c578981403",  # 0x2f
+    "60c478983401",  # 0x30
+    "60c450781f00 80c4a0781f00 00c520181402 20c5c0181402 40c5c0981403",  # 0x31
+    "60c350981000",  # 0x32
+    "80c460001f05 a0c4d0683200 00c548981402",  # 0x33
+    "60c410382123 c0c490402122 e0c470683200 a0c490283200 00c598981402",  # 0x34
+    "",  # 0x35
+    "60c470002122",  # 0x36
+    "60c428683200 80c468683200 a0c4a8683200 c0c448283200 e0c488283200 00c560981402 20c580981402",  # 0x37
+    "60c350981000",  # 0x38
+    "a0c428401f04",  # 0x39
+    "",  # 0x3a
+    "",  # 0x3b
+    (
+        "60c438002122 80c468002122 a0c4a0002122 c0c438402122 e0c490402122"
+        " 00c5b8402122 20c558802122 40c598802122"
+    ),  # 0x3c
+    "60c420402122 80c448402122 a0c470002122 c0c4a8402122 e0c4a8283200",  # 0x3d
+    "80c448a83200 00c5a0981402",  # 0x3e
+    "20c528603702",  # 0x3f
+    "",  # 0x40
+    "60c410602123 80c4e0302124",  # 0x41
+    "60c350981000",  # 0x42
+    "60c41048213a 80c41068213a 00c5c0981401",  # 0x43
+    "a0c478801f04",  # 0x44
+    "",  # 0x45
+    "60c410482123 80c410802123 a0c420a83200 c0c458a83200 e0c490a83200 80c5c8a83200",  # 0x46
+    "60c418001f04 80c448402122 a0c478402122 c0c490a83200 00c5c0581400",  # 0x47
+    "",  # 0x48
+    "80c438683200 a0c458483200 e0c450801f04 00c578601f05 20c590401f04 40c510781402 60c5b0981403",  # 0x49
+    "60c350981000 60c448983404",  # 0x4a
+    "80c458081f04",  # 0x4b
+    "60c41020213a c0c440a83200 e0c490a83200 00c5c0981403",  # 0x4c
+    "80c470401f01 a0c4a0401f01 20c580981402",  # 0x4d
+    "",  # 0x4e
+    "60c438401f04 80c460401f04 a0c488401f04 c0c4b0401f04 e0c4e0882124",  # 0x4f
+    "",  # 0x50
+    "60c4a0002122 80c4e0302124 00c530581403 20c558581402",  # 0x51
+    "a0c440483200 c0c4b0483200",  # 0x52
+    "60c440402122 80c4b0402122 00c578181403 20c590181403",  # 0x53
+    "60c440883200 80c470283200 c0c458002122 e0c4e0202124 00c5d0981403",  # 0x54
+    "",  # 0x55
+    "00c580981402 20c5a0981402 40c5c0981402",  # 0x56
+    "60c390981000 40c540981402",  # 0x57
+    "60c350981000",  # 0x58
+    "00c568981403 20c580981403",  # 0x59
+    "60c410702123 80c428302124 e0c420581f06 00c568981402",  # 0x5a
+    "60c450a83200 80c4a0a83200 a0c470002138 c0c4e020213b 00c590981403",  # 0x5b
+    "60c450a83200 e0c490a83200 00c550981402",  # 0x5c
+    "60c460102124 80c480202123 a0c410581f01 c0c470781f01 00c590981403 20c5a8981403",  # 0x5d
+    "60c430402123 80c450602123 a0c470802123 c0c4a0402122 e0c4c0402122 00c518583703",  # 0x5e
+    "",  # 0x5f
+    "",  # 0x60
+    "60c470002122 80c410781f01 a0c4d0381f01 00c590181403 20c560581403 40c5a0981403",  # 0x61
+    "60c430402122 80c450802122 a0c468002122 c0c4a0581f00 e0c4b0a83200",  # 0x62
+    "60c410402122 e0c460683200 00c528503702 20c530603702",  # 0x63
+    "60c480a83200 80c440402138 a0c460002138 c0c470402138 00c580981402",  # 0x64
+    "a0c4a0181403 e0c490181403 00c568981402 20c580981402 40c5a0981402",  # 0x65
+    "80c470002122",  # 0x66
+    "",  # 0x67
+    "60c350181000",  # 0x68
+    "a0c450a83200 c0c460a83200 e0c450381f00 00c570881f07",  # 0x69
+    "60c440a83200 80c460a83200 c0c4a0a83200 e0c470002122 00c580981403",  # 0x6a
+    (
+        "60c430402122 80c460402122 a0c488402122 c0c450283200 e0c470283200"
+        " 00c5a0283200 60c568981402 20c580981402 40c598981402"
+    ),  # 0x6b
+    "60c438602122 80c458002122 a0c470802122 c0c498002122 00c5b0781402",  # 0x6c
+    "60c460002122 80c4a8402124 a0c4e0182124 c0c468a83200 e0c470283200 00c528503702 20c530603702",  # 0x6d
+    "a0c420a83200 00c5a8981403 20c5c0981403",  # 0x6e
+    "60c390181000 00c568181403",  # 0x6f
+    "60c350981000",  # 0x70
+    "a0c420a83200 80c450a83200 60c480a83200",  # 0x71
+    "",  # 0x72
+    "60c460a83200 80c498a83200 c0c4d0a83200",  # 0x73
+    "e0c440402122 a0c470683200 60c4e0082124 00c528503702 20c530603702",  # 0x74
+    "",  # 0x75
+    (
+        "60c468002122 80c470683200 a0c470a83200 c0c4a0683200 e0c4d0a83200"
+        " 00c5a0a83200 20c550581403 40c568581403"
+    ),  # 0x76
+    "60c390981000",  # 0x77
+    "",  # 0x78
+    "60c390981000 00c5d0981403",  # 0x79
+    "60c480682122 80c4e0182124 a0c4b0402124 c0c480503200 e0c490503200 00c560981402",  # 0x7a
+    "e0c450402122 00c578981402 20c590981402",  # 0x7b
+    "a0c468002122 c0c490402122 e0c410283200 60c460683200 80c490683200 00c590a83200",  # 0x7c
+    "a0c420602122 c0c450581f00 80c450781f01 00c578581402 20c590581402",  # 0x7d
+    "60c438602122 80c460802122 a0c490a8213b c0c4b0402122 e0c4e0102124",  # 0x7e
+    "60c390981000",  # 0x7f
+    "60c350981000",  # 0x80
+    "60c390981000 00c540981401 20c560981401",  # 0x81
+    "60c450402122 00c590981401 20c5a8981401",  # 0x82
+    "",  # 0x83
+    "00c580981401 20c5a0981401",  # 0x84
+    "",  # 0x85
+    "00c570981401 20c590981401",  # 0x86
+    "60c390981000",  # 0x87
+)
+""" rom format (`Sprite.to_bytes`) sprites of each room (index is map_index) - made by `make_sprite_data` """
+
+_room_bytes = [bytes.fromhex(room_hex) for room_hex in _ROOM_HEX]
+
+sprite_table: Final = b"".join(_room_bytes)
+""" the sprites of all the rooms, 6 bytes each (`Sprite.to_bytes`) """
+
+room_offsets: Final = tuple(accumulate((len(room) for room in _room_bytes), initial=0))
+""" the sprites of a room are at `room_offsets[map_index]` up to `room_offsets[map_index + 1]` in `sprite_table` """
+
+
+def room_view(map_index: int) -> memoryview:
+    """ the rom format sprites of a room, without copying """
+    return memoryview(sprite_table)[room_offsets[map_index]:room_offsets[map_index + 1]]
+
+
+def room_sprites(map_index: int) -> RoomSprites:
+    """ new `Sprite` objects for a room """
+    return [
+        Sprite.from_bytes(sprite_table[address:address + 6])
+        for address in range(room_offsets[map_index], room_offsets[map_index + 1], 6)
+    ]
 
 
 def make_sprite_rooms(o: bytes) -> None:
@@ -472,16 +286,20 @@ def make_sprite_rooms(o: bytes) -> None:
 
 
 def make_sprite_data(o: bytes) -> None:
-    data: dict[int, RoomSprites] = {}
-
+    """ prints `_ROOM_HEX` """
+    print("_ROOM_HEX: Final = (")
     for map_index, room_address in enumerate(sprite_rooms):
-        room_sprites: RoomSprites = []
         count = o[room_address]
-        for sprite_no in range(count):
-            sprite_address = room_address + 1 + 6 * sprite_no
-            room_sprites.append(Sprite.from_bytes(
-                o[sprite_address:sprite_address + 6]
-            ))
-        data[map_index] = room_sprites
-    from pprint import pprint
-    pprint(data)  # noqa: T203
+        sprites = [
+            o[sprite_address:sprite_address + 6].hex()
+            for sprite_address in range(room_address + 1, room_address + 1 + 6 * count, 6)
+        ]
+        # line length limit
+        if len(sprites) <= 7:
+            print(f'    "{" ".join(sprites)}",  # {map_index:#04x}')
+        else:
+            print("    (")
+            print(f'        "{" ".join(sprites[:5])}"')
+            print(f'        " {" ".join(sprites[5:])}"')
+            print(f"    ),  # {map_index:#04x}")
+    print(")")
@@ -61,3 +61,28 @@ class TerrainCompressor:
                     tr.append(current_byte)
         tr.append(0x00)
         return tr
+
+    @staticmethod
+    def compressed_size(_bytes: Sequence[int]) -> int:
+        """ `len(compress(_bytes))` without making the compressed data """
+        size = 1  # terminator
+        copying = False
+        cursor = 0
+        while cursor < len(_bytes):
+            run_end = cursor + 1
+            while run_end < len(_bytes) and _bytes[run_end] == _bytes[cursor]:
+                run_end += 1
+            count = run_end - cursor
+            cursor = run_end
+            if copying:
+                if count < 3:
+                    size += count
+                else:
+                    copying = False
+                    size += 2
+            else:
+                if count == 1:
+                    copying = True
+                # command and byte
+                size += 2
+        return size
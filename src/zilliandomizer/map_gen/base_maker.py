@@ -1,9 +1,11 @@
-from collections.abc import Container, Iterable, Iterator, Sequence, Set as AbstractSet
+from collections import deque
+from collections.abc import Callable, Container, Iterable, Iterator, Sequence, Set as AbstractSet
+from dataclasses import dataclass
 from random import Random
 from typing import NamedTuple
 
 from zilliandomizer.map_gen.door_manager import DoorManager
-from zilliandomizer.utils.disjoint_set import DisjointSet
+from zilliandomizer.utils.disjoint_set import ArrayDisjointSet
 from zilliandomizer.utils.deterministic_set import DetSet
 
 # ruff: noqa: E241, RUF102, RUF100
@@ -29,18 +31,220 @@ def h(y: int, x: int) -> Edge:
     return frozenset((Node(y, x), Node(y, x + 1)))
 
 
+DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+""" down, right, up, left - bit index (`1 << i`) in edge bitmasks """
+_DOWN = 1
+_RIGHT = 2
+_UP = 4
+_LEFT = 8
+
+
+def direction_offsets(width: int) -> tuple[int, int, int, int]:
+    """ the difference in node id (`y * width + x`) for each of `DIRECTIONS` """
+    return (width, 1, -width, -1)
+
+
+class TreeIndex:
+    """
+    the rooms and connections of a spanning tree (or forest), rooted,
+    for path queries without searching
+
+    binary lifting for lowest common ancestor
+    """
+
+    width: int
+    depth: list[int]
+    component: list[int]
+    """ index of the root of the tree that this node is in """
+    up: list[list[int]]
+    """ `up[k][i]` is the `2 ** k` ancestor of node index `i` (a root is its own parent) """
+
+    def __init__(self, height: int, width: int, edges: Sequence[int], root: Node) -> None:
+        """ `edges` - for each node id, bitmask of `DIRECTIONS` with a connection """
+        self.width = width
+        node_count = height * width
+        offsets = direction_offsets(width)
+        adjacency: list[list[int]] = [[] for _ in range(node_count)]
+        edge_count = 0
+        for i, bits in enumerate(edges):
+            for d, offset in enumerate(offsets):
+                if bits & (1 << d):
+                    adjacency[i].append(i + offset)
+                    edge_count += 1
+        edge_count //= 2  # each edge is in both nodes
+
+        parent = [-1] * node_count
+        self.depth = [0] * node_count
+        self.component = [-1] * node_count
+        root_i = self._i(root)
+        tree_count = 0
+        for tree_root in (root_i, *range(node_count)):
+            if self.component[tree_root] != -1:
+                continue
+            tree_count += 1
+            self.component[tree_root] = tree_root
+            parent[tree_root] = tree_root
+            queue = deque((tree_root,))
+            while queue:  # breadth first
+                here = queue.popleft()
+                for adj in adjacency[here]:
+                    if self.component[adj] == -1:
+                        self.component[adj] = tree_root
+                        parent[adj] = here
+                        self.depth[adj] = self.depth[here] + 1
+                        queue.append(adj)
+        assert edge_count == node_count - tree_count, "cycle in tree"
+
+        self.up = [parent]
+        for _ in range(max(self.depth).bit_length() - 1):
+            prev = self.up[-1]
+            self.up.append([prev[prev[i]] for i in range(node_count)])
+
+    def _i(self, node: Node) -> int:
+        return node.y * self.width + node.x
+
+    def _node(self, i: int) -> Node:
+        return Node(*divmod(i, self.width))
+
+    def _ancestor(self, i: int, depth: int) -> int:
+        """ the ancestor of `i` at this depth """
+        climb = self.depth[i] - depth
+        k = 0
+        while climb:
+            if climb & 1:
+                i = self.up[k][i]
+            climb >>= 1
+            k += 1
+        return i
+
+    def _lca(self, a: int, b: int) -> int:
+        """ `a` and `b` need to be in the same component """
+        if self.depth[a] > self.depth[b]:
+            a = self._ancestor(a, self.depth[b])
+        elif self.depth[b] > self.depth[a]:
+            b = self._ancestor(b, self.depth[a])
+        if a == b:
+            return a
+        for k in range(len(self.up) - 1, -1, -1):
+            up_k = self.up[k]
+            if up_k[a] != up_k[b]:
+                a = up_k[a]
+                b = up_k[b]
+        return self.up[0][a]
+
+    def connected(self, a: Node, b: Node) -> bool:
+        return self.component[self._i(a)] == self.component[self._i(b)]
+
+    def distance(self, a: Node, b: Node) -> int:
+        """ number of connections on the path (`a` and `b` need to be connected) """
+        a_i = self._i(a)
+        b_i = self._i(b)
+        return self.depth[a_i] + self.depth[b_i] - 2 * self.depth[self._lca(a_i, b_i)]
+
+    def path(self, fro: Node, to: Node) -> list[Node]:
+        """ `[fro]` if not connected """
+        fro_i = self._i(fro)
+        to_i = self._i(to)
+        if self.component[fro_i] != self.component[to_i]:
+            return [fro]
+        lca = self._lca(fro_i, to_i)
+        parent = self.up[0]
+        up_part: list[Node] = []
+        while fro_i != lca:
+            up_part.append(self._node(fro_i))
+            fro_i = parent[fro_i]
+        down_part: list[Node] = []
+        while to_i != lca:
+            down_part.append(self._node(to_i))
+            to_i = parent[to_i]
+        up_part.append(self._node(lca))
+        down_part.reverse()
+        return up_part + down_part
+
+    def on_path(self, node: Node, fro: Node, to: Node) -> bool:
+        """ whether `node` is on the path from `fro` to `to` (including `fro` and `to`) """
+        if node == fro:
+            return True
+        if not (self.connected(fro, to) and self.connected(node, fro)):
+            return False
+        return self.distance(fro, node) + self.distance(node, to) == self.distance(fro, to)
+
+    def next_on_path(self, fro: Node, to: Node) -> Node | None:
+        """ the neighbor of `fro` on the path to `to` - `None` if `fro == to` or not connected """
+        fro_i = self._i(fro)
+        to_i = self._i(to)
+        if fro_i == to_i or self.component[fro_i] != self.component[to_i]:
+            return None
+        if self._lca(fro_i, to_i) == fro_i:
+            # `to` is below `fro`
+            return self._node(self._ancestor(to_i, self.depth[fro_i] + 1))
+        return self._node(self.up[0][fro_i])
+
+    def meeting(self, a: Node, b: Node, c: Node) -> Node:
+        """ the node that is on all 3 paths between these (they need to be connected) """
+        a_i = self._i(a)
+        b_i = self._i(b)
+        c_i = self._i(c)
+        return self._node(max(
+            (self._lca(a_i, b_i), self._lca(a_i, c_i), self._lca(b_i, c_i)),
+            key=lambda i: self.depth[i]
+        ))
+
+
+@dataclass
+class RejectionStats:
+    """ how many layouts were tried, and where they were thrown away """
+
+    attempts: int = 0
+    early: int = 0
+    """ rejected by a check while making the tree """
+    late: int = 0
+    """ rejected after the tree was complete """
+
+    @property
+    def accepted(self) -> int:
+        return self.attempts - self.early - self.late
+
+    def __str__(self) -> str:
+        rate = self.accepted / self.attempts if self.attempts else 0
+        return f"{self.accepted}/{self.attempts} accepted ({rate:.0%}) - rejected {self.early} early, {self.late} late"
+
+
 class BaseMaker:
+    """
+    The graph is stored with integer node ids (`y * width + x`)
+    and a bitmask of `DIRECTIONS` for each node.
+
+    `Node` and `Edge` are for the interface.
+    """
+
     random: Random
     row_offset: int
     col_offset: int
     height: int
     width: int
     prev_door: int
-    possible_edges: DetSet[Edge]
-    existing_edges: DetSet[Edge]
-    original_possible_edges: AbstractSet[Edge]
-    paths: dict[Node, list[Node]]
-    """ destination: path """
+    _existing: list[int]
+    """ node id: bitmask of `DIRECTIONS` with a room transition """
+    _possible: list[int]
+    """
+    edge ids where there can be a room transition (and not yet) - in order for deterministic random choice
+
+    edge id is `node id * 2` for down from that node, `node id * 2 + 1` for right
+    """
+    _original_possible: list[int]
+    """ node id: bitmask of `DIRECTIONS` where there could be a room transition before `make` """
+    _offsets: tuple[int, int, int, int]
+    _components: ArrayDisjointSet | None
+    """ only while `make` is running """
+    _order_index: dict[int, int]
+    """ edge id: index in the order that `make` is looking at possible edges """
+    _order_next: int
+    """ index of the next edge that `make` will look at """
+    _tree: TreeIndex | None
+    """ index of `_existing` - `None` until needed after it changes """
+    _walks: dict[Node, list[tuple[Node, Node | None]]]
+    """ `walk` for each start - empty after `_existing` changes """
     no_changes: set[Node]
     """ which rooms will have no changes to the entrances and exits """
     door_manager: DoorManager
@@ -68,28 +272,88 @@ class BaseMaker:
         self.height = height
         self.width = width
         self.prev_door = prev_door
-        self.possible_edges = DetSet(possible)
-        self.existing_edges = DetSet(existing)
-        self.original_possible_edges = frozenset(possible)
-        self.paths = {}
-
-        for edge in self.existing_edges:
-            assert edge not in self.possible_edges
+        self._offsets = direction_offsets(width)
+        node_count = height * width
+        self._existing = [0] * node_count
+        for edge in existing:
+            self._add_edge(self._existing, self._edge_id(edge))
+        self._possible = list({self._edge_id(edge): True for edge in possible})
+        self._original_possible = [0] * node_count
+        for edge_id in self._possible:
+            self._add_edge(self._original_possible, edge_id)
+        self._components = None
+        self._order_index = {}
+        self._order_next = 0
+        self._tree = None
+        self._walks = {}
+
+        for i in range(node_count):
+            assert not (self._existing[i] & self._original_possible[i]), f"existing and possible {self._node(i)}"
 
         self.no_changes = {
-            Node(y, x)
-            for y in range(height)
-            for x in range(width)
-            if (
-                h(y, x) not in self.possible_edges and
-                v(y, x) not in self.possible_edges and
-                h(y, x - 1) not in self.possible_edges and
-                v(y - 1, x) not in self.possible_edges
-            )
+            self._node(i)
+            for i in range(node_count)
+            if self._original_possible[i] == 0
         }
 
         self.door_manager = door_manager
 
+    def _node(self, i: int) -> Node:
+        return Node(*divmod(i, self.width))
+
+    def _edge_id(self, edge: Edge) -> int:
+        a, b = sorted(edge)
+        assert a.y >= 0 and a.x >= 0 and b.y < self.height and b.x < self.width, f"edge outside of sector {edge}"
+        a_i = a.y * self.width + a.x
+        if b == Node(a.y + 1, a.x):
+            return a_i * 2
+        assert b == Node(a.y, a.x + 1), f"not an edge between adjacent rooms {edge}"
+        return a_i * 2 + 1
+
+    def _edge_nodes(self, edge_id: int) -> tuple[int, int]:
+        a_i = edge_id >> 1
+        return a_i, a_i + (1 if edge_id & 1 else self.width)
+
+    def _edge(self, edge_id: int) -> Edge:
+        a_i, b_i = self._edge_nodes(edge_id)
+        return frozenset((self._node(a_i), self._node(b_i)))
+
+    def _add_edge(self, bitmasks: list[int], edge_id: int) -> None:
+        a_i, b_i = self._edge_nodes(edge_id)
+        if edge_id & 1:
+            bitmasks[a_i] |= _RIGHT
+            bitmasks[b_i] |= _LEFT
+        else:
+            bitmasks[a_i] |= _DOWN
+            bitmasks[b_i] |= _UP
+
+    @property
+    def existing_edges(self) -> DetSet[Edge]:
+        """ (copy) where there is a room transition """
+        tr: DetSet[Edge] = DetSet()
+        for i, bits in enumerate(self._existing):
+            if bits & _DOWN:
+                tr.add(self._edge(i * 2))
+            if bits & _RIGHT:
+                tr.add(self._edge(i * 2 + 1))
+        return tr
+
+    @property
+    def possible_edges(self) -> DetSet[Edge]:
+        """ (copy) where there can be a room transition that hasn't been chosen or ruled out by `make` """
+        return DetSet(self._edge(edge_id) for edge_id in self._possible)
+
+    @property
+    def original_possible_edges(self) -> AbstractSet[Edge]:
+        """ (copy) where there could be a room transition before `make` """
+        tr: set[Edge] = set()
+        for i, bits in enumerate(self._original_possible):
+            if bits & _DOWN:
+                tr.add(self._edge(i * 2))
+            if bits & _RIGHT:
+                tr.add(self._edge(i * 2 + 1))
+        return frozenset(tr)
+
     def map_str(self, stretch_x: int = 1, to_mark: Container[Node] = (), mark_edges: Container[Edge] = ()) -> str:
         """ draw the map in ascii art """
         tr = ""
@@ -97,20 +361,18 @@ class BaseMaker:
             for x in range(self.width):
                 room_here = Node(y, x) not in self.no_changes
                 tr += "@" if Node(y, x) in to_mark else "O" if room_here else "-"
-                this_h_edge = h(y, x)
-                if this_h_edge in mark_edges:
+                if h(y, x) in mark_edges:
                     h_edge_char = "."
-                elif this_h_edge in self.existing_edges:
+                elif self._existing[y * self.width + x] & _RIGHT:
                     h_edge_char = "-"
                 else:
                     h_edge_char = " "
                 tr += f"{' ' * stretch_x}{h_edge_char}{' ' * stretch_x}"
             tr += '\n'
             for x in range(self.width):
-                this_v_edge = v(y, x)
-                if this_v_edge in mark_edges:
+                if v(y, x) in mark_edges:
                     v_edge_char = ":"
-                elif this_v_edge in self.existing_edges:
+                elif self._existing[y * self.width + x] & _DOWN:
                     v_edge_char = "|"
                 else:
                     v_edge_char = " "
@@ -126,108 +388,167 @@ class BaseMaker:
 
         `{split_node: dipper}`
         """
+        tree = self.tree()
         possible_splits: dict[Node, Node] = {}
-        for y in range(self.height):
-            for x in range(self.width):
-                here = Node(y, x)
-                if here in no_doors:
-                    continue
-                adjs = list(self.adjs(here))
-                room_through = here not in self.no_changes and len(adjs) > 1
-                if not room_through:
-                    continue
-                not_direct = [
-                    node
-                    for node in self.geo_adjs(here)
-                    if node not in adjs and frozenset((node, here)) in self.original_possible_edges
-                ]
-                can_dip = [
-                    node
-                    for node in not_direct
-                    if here not in self.path(start, node)
-                ]
-                if len(can_dip) > 0:
-                    dipper = self.random.choice(can_dip)
-                    possible_splits[here] = dipper
+        for i, existing in enumerate(self._existing):
+            here = self._node(i)
+            if here in no_doors:
+                continue
+            room_through = self._original_possible[i] != 0 and existing.bit_count() > 1
+            if not room_through:
+                continue
+            not_direct = self._original_possible[i] & ~existing
+            can_dip: list[Node] = []
+            for d, offset in enumerate(self._offsets):
+                if not_direct & (1 << d):
+                    node = self._node(i + offset)
+                    if not tree.on_path(here, start, node):
+                        can_dip.append(node)
+            if len(can_dip) > 0:
+                dipper = self.random.choice(can_dip)
+                possible_splits[here] = dipper
         return possible_splits
 
-    def make(self) -> DetSet[Edge]:
-        """ returns spanning tree covering this sector """
+    class Rejected(RuntimeError):
+        """ `make` stopped because the `reject` check failed """
 
-        components: DisjointSet[Node] = DisjointSet()
+    def make(self, reject: Callable[[], bool] | None = None) -> DetSet[Edge]:
+        """
+        returns spanning tree covering this sector
 
-        for a, b in self.existing_edges:
-            components.union(a, b)
+        `reject` is called after each edge is added.
+        If it returns `True` (this tree can't meet the constraints), raises `BaseMaker.Rejected`
+        """
+        self._tree = None
+        self._walks = {}
+
+        components = ArrayDisjointSet(self.height * self.width)
+
+        for i, bits in enumerate(self._existing):
+            if bits & _DOWN:
+                components.union(i, i + self.width)
+            if bits & _RIGHT:
+                components.union(i, i + 1)
+
+        # randomized Kruskal
+        # (The next edge accepted is a uniform choice from the edges that don't make a cycle,
+        #  the same as choosing randomly from what's left after removing the edges that make cycles.)
+        order = self._possible
+        self._possible = []
+        self.random.shuffle(order)
+        self._components = components
+        self._order_index = {edge_id: i for i, edge_id in enumerate(order)}
+        try:
+            for i, edge_id in enumerate(order):
+                self._order_next = i + 1
+                a, b = self._edge_nodes(edge_id)
+                if components.union(a, b):
+                    self._add_edge(self._existing, edge_id)
+                    if reject and reject():
+                        raise BaseMaker.Rejected(f"rejected after {i + 1} of {len(order)} edges")
+        finally:
+            self._components = None
+            self._order_index = {}
+            self._tree = None  # in case a check used a partial tree
+            self._walks = {}
 
-        def crop_possible() -> Iterable[Edge]:
-            """ the edges to remove from possible to avoid cycles """
-            tr: list[Edge] = []
-            for p_edge in self.possible_edges:
-                a, b = p_edge
-                if components.find(a) == components.find(b):
-                    tr.append(p_edge)
-            return tr
+        return self.existing_edges
 
-        for edge in crop_possible():
-            self.possible_edges.remove(edge)
+    def connected(self, a: Node, b: Node) -> bool:
+        """ whether there's a path between these now (can be used during `make`) """
+        if self._components:
+            return (
+                self._components.find(a.y * self.width + a.x) ==
+                self._components.find(b.y * self.width + b.x)
+            )
+        return self.tree().connected(a, b)
 
-        while len(self.possible_edges):
-            edge = self.random.choice(self.possible_edges)
-            self.possible_edges.remove(edge)
-            self.existing_edges.add(edge)
-            a, b = edge
-            components.union(a, b)
-            remove = crop_possible()
-            for edge in remove:
-                self.possible_edges.remove(edge)
+    def max_degree(self, node: Node) -> int:
+        """
+        how many room transitions this node can have when `make` is done
 
-        return self.existing_edges
+        (can be used during `make` for checks that can fail early)
+        """
+        i = node.y * self.width + node.x
+        tr = self._existing[i].bit_count()
+        if self._components is None:
+            return tr
+        can_add = self._original_possible[i] & ~self._existing[i]
+        for d, offset in enumerate(self._offsets):
+            if can_add & (1 << d):
+                edge_id = i * 2 + (d == 1) if d < 2 else (i + offset) * 2 + (d == 3)
+                other = i + offset
+                if (
+                    self._order_index[edge_id] >= self._order_next and
+                    self._components.find(i) != self._components.find(other)
+                ):
+                    tr += 1
+        return tr
 
     def geo_adjs(self, node: Node) -> Iterator[Node]:
         """ geographically adjacent nodes (whether adjacent or not) """
         y, x = node
-        for dy, dx in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+        for dy, dx in DIRECTIONS:
             target_y = y + dy
             target_x = x + dx
             if target_x >= 0 and target_x < self.width and target_y >= 0 and target_y < self.height:
                 yield Node(target_y, target_x)
 
     def adjs(self, node: Node) -> Iterator[Node]:
-        # could use `geo_adjs` but probably a little faster if it doesn't
+        """ nodes with a room transition to this node """
         y, x = node
-        for dy, dx in ((1, 0), (0, 1), (-1, 0), (0, -1)):
-            target_y = y + dy
-            target_x = x + dx
-            if frozenset((Node(y, x), Node(target_y, target_x))) in self.existing_edges:
-                yield Node(target_y, target_x)
-
-    def path(self, fro: Node, to: Node) -> Sequence[Node]:
-        if to in self.paths and self.paths[to][0] == fro:
-            # print("found path in cache")
-            return self.paths[to]
+        bits = self._existing[y * self.width + x]
+        for d, (dy, dx) in enumerate(DIRECTIONS):
+            if bits & (1 << d):
+                yield Node(y + dy, x + dx)
+
+    def tree(self) -> TreeIndex:
+        """ index of the room transitions for path queries """
+        if self._tree is None:
+            self._tree = TreeIndex(self.height, self.width, self._existing, Node(0, 0))
+        return self._tree
+
+    def walk(self, start: Node) -> Sequence[tuple[Node, Node | None]]:
+        """
+        breadth-first order of the nodes connected to `start`, with the parent of each (`None` for `start`)
 
-        been: set[Node] = set()
-        path_tr = [fro]
+        children are in the order of `adjs`
 
-        def dfs() -> bool:
-            here = path_tr[-1]
-            if here == to:
-                return True
-            if here not in been:
-                # print(f"searching {here}")
-                been.add(here)
-                for adj in self.adjs(here):
-                    path_tr.append(adj)
-                    if dfs():
-                        return True
-                    else:
-                        path_tr.pop()
-            return False
+        (made once and shared by everything that goes through the rooms in this order)
+        """
+        tr = self._walks.get(start)
+        if tr is None:
+            width = self.width
+            start_i = start.y * width + start.x
+            parent_ids: dict[int, int] = {start_i: -1}
+            order = [start_i]
+            order_i = 0
+            while order_i < len(order):
+                i = order[order_i]
+                order_i += 1
+                bits = self._existing[i]
+                for d, offset in enumerate(self._offsets):
+                    if bits & (1 << d):
+                        child = i + offset
+                        if child not in parent_ids:
+                            parent_ids[child] = i
+                            order.append(child)
+            tr = [
+                (self._node(i), None if parent_ids[i] == -1 else self._node(parent_ids[i]))
+                for i in order
+            ]
+            self._walks[start] = tr
+        return tr
 
-        dfs()
+    def path(self, fro: Node, to: Node) -> Sequence[Node]:
+        return self.tree().path(fro, to)
 
-        self.paths[to] = path_tr
-        return path_tr
+    def path_length(self, fro: Node, to: Node) -> int:
+        """ `len(self.path(fro, to))` without making the path """
+        tree = self.tree()
+        if not tree.connected(fro, to):
+            return 1
+        return tree.distance(fro, to) + 1
 
     def fork_altitude(self, start: Node, ends: Sequence[Node]) -> float:
         """
@@ -236,27 +557,21 @@ class BaseMaker:
 
         ends should be in geographic order (around the outside of the sector)
         """
+        tree = self.tree()
         total = 0
         count = 0
         for i in range(len(ends) - 1):
-            path_1 = self.path(start, ends[i])
-            path_2 = self.path(start, ends[i + 1])
-            path_set_1 = frozenset(path_1)
-            for j, node in enumerate(reversed(path_2)):
-                if node in path_set_1:
-                    if j == 0:
-                        return 0
-                    total += j
-                    count += 1
-                    break
-            path_set_2 = frozenset(path_2)
-            for j, node in enumerate(reversed(path_1)):
-                if node in path_set_2:
-                    if j == 0:
-                        return 0
-                    total += j
-                    count += 1
-                    break
+            end_1 = ends[i]
+            end_2 = ends[i + 1]
+            assert tree.connected(start, end_1) and tree.connected(start, end_2), f"{start} {end_1} {end_2}"
+            # where the path to end_2 leaves the path to end_1
+            fork = tree.meeting(start, end_1, end_2)
+            for end in (end_2, end_1):
+                distance = tree.distance(end, fork)
+                if distance == 0:
+                    return 0
+                total += distance
+                count += 1
         return total / count
 
 
@@ -292,18 +607,47 @@ def red_inputs() -> tuple[list[Edge], list[Edge]]:
     return possible_edges, existing_edges
 
 
-def get_red_base(dm: DoorManager, seed: int | str | None) -> BaseMaker:
+def _red_rejecter(bm: BaseMaker, start: Node, ends: Sequence[Node], r07c7: Node) -> Callable[[], bool]:
+    """ checks that can fail before `bm.make` is finished """
+    fork_checked = False
+
+    def reject() -> bool:
+        nonlocal fork_checked
+        # we don't want r07c7 to be a dead end, because there are only 4 canisters, so nothing to put behind a door
+        if bm.max_degree(r07c7) < 2:
+            return True
+        # the paths to the exits don't change after they're connected
+        if not fork_checked and all(bm.connected(start, end) for end in ends):
+            fork_checked = True
+            if bm.fork_altitude(start, ends) == 0:
+                return True
+        return False
+
+    return reject
+
+
+def get_red_base(dm: DoorManager, seed: int | str | None, stats: RejectionStats | None = None) -> BaseMaker:
     random = Random(seed)
+    if stats is None:
+        stats = RejectionStats()
+    start = Node(0, 3)
+    ends = (Node(1, 0), Node(3, 0), Node(4, 0))
+    r07c7 = Node(2, 4)
     while True:
         possible, existing = red_inputs()
         bm = BaseMaker(5, 3, 5, 5, 0x25, possible, existing, dm, random.randrange(1999999999))
-        bm.make()
+        stats.attempts += 1
+        try:
+            bm.make(_red_rejecter(bm, start, ends, r07c7))
+        except BaseMaker.Rejected:
+            stats.early += 1
+            continue
         # we don't want the path to one red exit to go past another red exit
-        fork_distance = bm.fork_altitude(Node(0, 3), (Node(1, 0), Node(3, 0), Node(4, 0)))
-        # we don't want r07c7 to be a dead end, because there are only 4 canisters, so nothing to put behind a door
-        r07c7_is_dead_end = len(list(bm.adjs(Node(2, 4)))) < 2
+        fork_distance = bm.fork_altitude(start, ends)
+        r07c7_is_dead_end = len(list(bm.adjs(r07c7))) < 2
         if fork_distance > 0 and not r07c7_is_dead_end:
             return bm
+        stats.late += 1
 
 
 def paperclip_inputs() -> tuple[list[Edge], list[Edge]]:
@@ -361,8 +705,34 @@ def paperclip_inputs() -> tuple[list[Edge], list[Edge]]:
     return possible_edges, existing_edges
 
 
-def get_paperclip_base(dm: DoorManager, seed: int | str | None) -> BaseMaker:
+def _paperclip_rejecter(bm: BaseMaker,
+                        start: Node,
+                        goal: Node,
+                        vanilla_path: Callable[[BaseMaker], bool]) -> Callable[[], bool]:
+    """ checks that can fail before `bm.make` is finished """
+    path_checked = False
+
+    def reject() -> bool:
+        nonlocal path_checked
+        # the path doesn't change after it's connected
+        if not path_checked and bm.connected(start, goal):
+            path_checked = True
+            return vanilla_path(bm)
+        return False
+
+    return reject
+
+
+def get_paperclip_base(dm: DoorManager, seed: int | str | None, stats: RejectionStats | None = None) -> BaseMaker:
     random = Random(seed)
+    if stats is None:
+        stats = RejectionStats()
+    start = Node(0, 0)
+    goal = Node(0, 5)
+
+    def vanilla_path(bm: BaseMaker) -> bool:
+        path_to_goal = bm.path(start, goal)
+        return len(path_to_goal) > 10 and path_to_goal[-8] == Node(4, 6) and path_to_goal[-10] == Node(5, 7)
 
     # make it less likely that the path to the goal is vanilla
     attempts_to_get_non_vanilla_path = 0
@@ -370,12 +740,18 @@ def get_paperclip_base(dm: DoorManager, seed: int | str | None) -> BaseMaker:
     while attempts_to_get_non_vanilla_path < 3:  # 3 gives about 0.125 rate of vanilla path
         possible, existing = paperclip_inputs()
         bm = BaseMaker(10, 0, 7, 8, 0x39, possible, existing, dm, random.randrange(1999999999))
-        bm.make()
         attempts_to_get_non_vanilla_path += 1
+        stats.attempts += 1
+        last_attempt = attempts_to_get_non_vanilla_path == 3
+        try:
+            bm.make(None if last_attempt else _paperclip_rejecter(bm, start, goal, vanilla_path))
+        except BaseMaker.Rejected:
+            stats.early += 1
+            continue
 
-        path_to_goal = bm.path(Node(0, 0), Node(0, 5))
-        if len(path_to_goal) > 10 and path_to_goal[-8] == Node(4, 6) and path_to_goal[-10] == Node(5, 7):
+        if vanilla_path(bm) and not last_attempt:
             # input(f"vanilla path on attempt {attempts_to_get_non_vanilla_path}\n{bm.map_str()}\ntrying again")
+            stats.late += 1
             continue
         else:
             return bm
@@ -1,4 +1,3 @@
-from collections import deque
 from collections.abc import Mapping
 from dataclasses import dataclass
 from enum import Enum, auto
@@ -106,20 +105,20 @@ _red_right_area_exits = {
 }
 
 
-def make_edge_descriptions(bm: BaseMaker, splits: Mapping[Node, Node]) -> dict[Node, dict[Node, Desc]]:
+def make_edge_descriptions(bm: BaseMaker,
+                           splits: Mapping[Node, Node],
+                           last_sector: bool = False) -> dict[Node, dict[Node, Desc]]:
     """
     choose locations of doors and elevators
 
     The first `Desc` in the inner `dict` is the entrance to the room (the outer `Node`).
+
+    `last_sector` - no more doors will be deleted after this sector's rooms are cleared,
+    so this can raise `OverflowError` as soon as the door data doesn't fit
     """
     # print(bm.map_str())
 
     if bm.height == 5:  # red
-        parents: dict[Node, Node | None] = {
-            Node(0, 3): None,
-            Node(0, 2): Node(0, 3),
-            Node(0, 4): Node(0, 3),
-        }
         edge_descriptions: dict[Node, dict[Node, Desc]] = {
             Node(0, 3): {
                 Node(0, 2): Desc(DE.door, 4, 0x08),
@@ -131,10 +130,6 @@ def make_edge_descriptions(bm: BaseMaker, splits: Mapping[Node, Node]) -> dict[N
         start_node = Node(0, 3)
     else:
         assert bm.height == 7, f"{bm.height=}"  # paperclip
-        parents = {
-            Node(0, 0): None,
-            Node(1, 0): Node(0, 0),
-        }
         edge_descriptions = {
             Node(0, 0): {
                 Node(1, 0): Desc(DE.hallway_elevator, 0, 0),
@@ -144,6 +139,9 @@ def make_edge_descriptions(bm: BaseMaker, splits: Mapping[Node, Node]) -> dict[N
         requires_y = _pc_requires_y
         start_node = Node(0, 0)
 
+    walk = bm.walk(start_node)
+    parents = dict(walk)
+
     def back_to_computer(node: Node) -> int:
         """ map_index of last keyword room in path """
         back: Node | None = node
@@ -158,24 +156,17 @@ def make_edge_descriptions(bm: BaseMaker, splits: Mapping[Node, Node]) -> dict[N
         for col in range(bm.col_offset, bm.col_offset + bm.width):
             map_index = row * 8 + col
             bm.door_manager.del_room(map_index)
+    if last_sector:
+        bm.door_manager.stop_at_overflow()
 
     dippers = set(splits.values())
 
-    done: set[Node] = set()
-    q: deque[Node] = deque([start_node])
-
-    while len(q):
-        here = q.popleft()
-        if here in done:
-            continue
-        done.add(here)
+    for here, parent in walk:
         row = bm.row_offset + here.y
         col = bm.col_offset + here.x
         map_index = row * 8 + col
-        adjs = list(bm.adjs(here))
-        parent = parents[here]
-        outs = [n for n in adjs if n != parent]
         if parent:
+            outs = [n for n in bm.adjs(here) if n != parent]
             assert here not in edge_descriptions, f"{here=}"
             edge_descriptions[here] = {}
             in_desc = edge_descriptions[parent][here]
@@ -342,11 +333,9 @@ def make_edge_descriptions(bm: BaseMaker, splits: Mapping[Node, Node]) -> dict[N
 
                 edge_descriptions[here][out] = out_desc
                 corners_used_in_this_room.extend(out_desc.corner_conflicts())
-                parents[out] = here
             area_exit = _red_right_area_exits.get(map_index)
             if area_exit:
                 bm.door_manager.add_door(map_index, area_exit.y, area_exit.x, map_index)
-        q.extend(outs)
 
     for split, dipper in splits.items():
         split_row = bm.row_offset + split.y
@@ -6,6 +6,9 @@ from zilliandomizer.low_resources import rom_info
 from zilliandomizer.utils.deterministic_set import DetSet
 
 BANK_4_OFFSET = 0x8000
+DOOR_DATA_END = 0x14000
+""" door data can't go past the end of this bank """
+ROOM_COUNT = 136
 
 DoorStatusIndex = tuple[int, int]
 """ low byte of address and bit mask for whether a door is opened """
@@ -101,18 +104,57 @@ class DoorManager:
     """
     _locked: bool
     """ instance shouldn't be changed anymore """
+    _byte_count: int
+    """ size of the door data that `get_writes` will make - kept up to date as doors are changed """
+    _stop_at_overflow: bool
+    """ no more doors will be deleted, so raise `OverflowError` as soon as the door data doesn't fit """
 
     def __init__(self) -> None:
         self.original_statuses = {}
         self.freed_statuses = DetSet()
         self.status_reference_counts = defaultdict(list)
         self._locked = False
+        self._stop_at_overflow = False
         from copy import deepcopy
         from .door_data import doors
         self.doors = defaultdict(list, deepcopy(doors))
+        self._byte_count = 1 + sum(self._room_byte_count(map_index) for map_index in self.doors)
 
         self._fill()
 
+    def _room_byte_count(self, map_index: int) -> int:
+        """ size of the door data for this room in `get_writes` """
+        door_count = len(self.doors.get(map_index, ()))
+        if door_count == 0 or map_index >= ROOM_COUNT:
+            return 0
+        return 1 + 5 * door_count
+
+    def _append(self, map_index: int, door_data: bytes) -> None:
+        self._byte_count -= self._room_byte_count(map_index)
+        self.doors[map_index].append(door_data)
+        self._byte_count += self._room_byte_count(map_index)
+        if self._stop_at_overflow and self.overflowed:
+            raise OverflowError(f"door data overflowed bank: {hex(rom_info.door_data_begin_13ce8 + self._byte_count)}")
+
+    @property
+    def byte_count(self) -> int:
+        """ size of the door data in the rom (including the null door list) """
+        return self._byte_count
+
+    @property
+    def overflowed(self) -> bool:
+        """ the door data is too big to fit in the rom - `get_writes` would raise `OverflowError` """
+        return rom_info.door_data_begin_13ce8 + self._byte_count > DOOR_DATA_END
+
+    def stop_at_overflow(self) -> None:
+        """
+        promise that no more doors will be deleted
+
+        After this, the door data can only get bigger,
+        so `add_door` and `add_elevator` raise `OverflowError` as soon as it doesn't fit.
+        """
+        self._stop_at_overflow = True
+
     def _fill(self) -> None:
         # paperclip maker needs to know map_index 57 status bit
         self.original_statuses[57] = (0x13, 0x01)
@@ -133,18 +175,23 @@ class DoorManager:
     def del_room(self, map_index: int) -> None:
         """ and matching status references in other rooms (elevator in destination room) """
         assert not self._locked, "del_room on locked door manager"
+        assert not self._stop_at_overflow, "del_room after stop_at_overflow"
         if map_index in self.doors:
             door_list = self.doors[map_index]
             while len(door_list):
+                self._byte_count -= self._room_byte_count(map_index)
                 door = door_list.pop()
+                self._byte_count += self._room_byte_count(map_index)
                 a, b, _, _, _ = door
                 status: DoorStatusIndex = (a, b)
                 for each_map_index in self.status_reference_counts[status]:
+                    self._byte_count -= self._room_byte_count(each_map_index)
                     self.doors[each_map_index] = [
                         each_door
                         for each_door in self.doors[each_map_index]
                         if not each_door.startswith(bytes(status))
                     ]
+                    self._byte_count += self._room_byte_count(each_map_index)
                 self.status_reference_counts[status] = []
                 assert status not in self.freed_statuses, f"{map_index=} {status=}"
                 self.freed_statuses.add(status)
@@ -155,7 +202,7 @@ class DoorManager:
         x_door = x_pixel >> 2
         sprite = DoorSprite.get_door(map_index, x_door)
         door_data = bytes((status[0], status[1], x_door, y_large, sprite))
-        self.doors[map_index].append(door_data)
+        self._append(map_index, door_data)
         self.status_reference_counts[status].append(map_index)
 
     def add_elevator(self, map_index: int, y_large: Literal[0, 5], x_pixel: int, opened_by: int) -> None:
@@ -165,7 +212,7 @@ class DoorManager:
         x_door = x_pixel >> 2
         sprite = DoorSprite.get_elevator(map_index, y_large)
         door_data = bytes((status[0], status[1], x_door, y_large, sprite))
-        self.doors[map_index].append(door_data)
+        self._append(map_index, door_data)
         self.status_reference_counts[status].append(map_index)
 
         dest_y: Literal[0, 5]
@@ -179,7 +226,7 @@ class DoorManager:
             dest_y = 0
         dest_sprite = DoorSprite.get_elevator(dest_map_index, dest_y)
         dest_door_data = bytes((status[0], status[1], x_door, dest_y, dest_sprite))
-        self.doors[dest_map_index].append(dest_door_data)
+        self._append(dest_map_index, dest_door_data)
         self.status_reference_counts[status].append(dest_map_index)
 
     def _get_new_status(self) -> DoorStatusIndex:
@@ -232,6 +279,8 @@ class DoorManager:
 
         This invalidates the `add_door` and `add_elevator` functions
         and should only be used after no more doors will be created.
+
+        (This doesn't change the size of the door data.)
         """
         for map_index, door_list in self.doors.items():
             used_in_this_room: set[DoorStatusIndex] = set()
@@ -255,6 +304,7 @@ class DoorManager:
                     used_in_this_room.add(status)
 
     def get_writes(self) -> dict[int, int]:
+        """ raises `OverflowError` if the door data doesn't fit (check `overflowed` to know without this) """
         self._locked = True
         self._fix_double_doors()
 
@@ -264,7 +314,7 @@ class DoorManager:
         tr = {null_address: 0}
         address = null_address + 1
 
-        for map_index in range(136):
+        for map_index in range(ROOM_COUNT):
             row = map_index // 8
             col = map_index % 8
             door_data_pointer_address = rom_info.terrain_index_13725 + 65 * row + 8 * col + 5
@@ -281,15 +331,16 @@ class DoorManager:
                 tr[door_data_pointer_address] = banked_data_lo
                 tr[door_data_pointer_address + 1] = banked_data_hi
 
-                if address >= 0x14000:
+                if address >= DOOR_DATA_END:
                     raise OverflowError(f"door data overflowed bank: {hex(address)}")
                 tr[address] = len(doors)
                 address += 1
                 for door in doors:
                     for b in door:
-                        if address >= 0x14000:
+                        if address >= DOOR_DATA_END:
                             raise OverflowError(f"door data overflowed bank: {hex(address)}")
                         tr[address] = b
                         address += 1
 
+        assert address - null_address == self._byte_count, f"{hex(address - null_address)} {hex(self._byte_count)}"
         return tr
@@ -0,0 +1,93 @@
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+import itertools
+from random import Random
+
+from zilliandomizer.room_gen.common import RoomData
+
+from .base import Base
+from .base_maker import Node, RejectionStats, get_paperclip_base, get_red_base
+from .door_manager import DoorManager
+from .map_data import pc_no_doors
+from .room_data_maker import make_room_gen_data
+from .split_maker import choose_splits
+
+
+@dataclass
+class MapLayout:
+    """ "full" map_gen map - everything before room gen """
+
+    base: Base
+    room_gen_data: dict[int, RoomData]
+    red_stats: RejectionStats = field(default_factory=RejectionStats)
+    pc_stats: RejectionStats = field(default_factory=RejectionStats)
+    overflow_stats: RejectionStats = field(default_factory=RejectionStats)
+    """ door data overflow """
+    seed: int | str | None = None
+    """ if made by `make_layout` """
+    random_state: tuple[object, ...] | None = None
+    """ state of `Random(seed)` after making this layout (where `System` continues from) """
+
+
+def make_layout_with(random: Random) -> MapLayout:
+    """ `random` is the random generator of `System` """
+    red_stats = RejectionStats()
+    pc_stats = RejectionStats()
+    overflow_stats = RejectionStats()
+    while True:
+        dm = DoorManager()
+        red_base = get_red_base(dm, random.randrange(1999999999), red_stats)
+        pc_base = get_paperclip_base(dm, random.randrange(1999999999), pc_stats)
+        pc_splits = choose_splits(pc_base, pc_no_doors, Node(0, 0))
+        base = Base(red_base, pc_base, dm, pc_splits)
+
+        overflow_stats.attempts += 1
+        try:
+            room_gen_data = make_room_gen_data(base)
+        except OverflowError:
+            overflow_stats.early += 1
+            continue
+        if dm.overflowed:
+            overflow_stats.late += 1
+            continue
+
+        return MapLayout(base, room_gen_data, red_stats, pc_stats, overflow_stats)
+
+
+def make_layout(seed: int | str) -> MapLayout:
+    """ the same layout that `System.make_map` makes right after `System.seed(seed)` """
+    random = Random(seed)
+    layout = make_layout_with(random)
+    layout.seed = seed
+    layout.random_state = random.getstate()
+    return layout
+
+
+def make_layouts(seeds: Iterable[int | str],
+                 ahead: int = 4,
+                 max_workers: int | None = None) -> Iterator[MapLayout]:
+    """
+    `make_layout` for each seed, made in a process pool while the earlier ones are being used
+
+    layouts are in the same order as `seeds`
+
+    `ahead` - how many layouts can be waiting to be used
+
+    `max_workers` `1` makes each layout in this process when it's needed, without a pool
+    """
+    if max_workers == 1:
+        yield from map(make_layout, seeds)
+        return
+    assert ahead > 0, f"{ahead=}"
+    seed_iter = iter(seeds)
+    with ProcessPoolExecutor(max_workers) as executor:
+        waiting: deque[Future[MapLayout]] = deque(
+            executor.submit(make_layout, seed) for seed in itertools.islice(seed_iter, ahead)
+        )
+        while len(waiting):
+            layout = waiting.popleft().result()
+            for seed in itertools.islice(seed_iter, 1):
+                waiting.append(executor.submit(make_layout, seed))
+            yield layout
@@ -1,4 +1,4 @@
-from collections import defaultdict, deque
+from collections import defaultdict
 from collections.abc import Container, Iterable, Mapping
 
 from zilliandomizer.logic_components.region_data import MapBuilder
@@ -34,10 +34,8 @@ def make_regions_bm(bm: BaseMaker,
     no_doors = set(reg_name(node) for node in node_no_doors)
     no_doors.add(pre_entrance_region)
 
-    entrance_name = reg_name(start_node)
-
-    parents: dict[str, str] = {entrance_name: pre_entrance_region}
-    """ key is only the base region name r00c0, value might be more r00c0passage """
+    logical_region_names: dict[Node, str] = {}
+    """ value might be more than the base region name r00c0 - r00c0passage """
 
     split_doors_to_correct_later: dict[str, list[str]] = defaultdict(list)
     """
@@ -45,15 +43,7 @@ def make_regions_bm(bm: BaseMaker,
     with door value (key - pudding suffix + dipped suffix)
     """
 
-    done: set[Node] = set()
-    q = deque([start_node])
-
-    while len(q):
-        node = q.popleft()
-        if node in done:
-            continue
-        done.add(node)
-
+    for node, parent_node in bm.walk(start_node):
         row, col = node
         map_row = row + bm.row_offset
         map_col = col + bm.col_offset
@@ -63,7 +53,7 @@ def make_regions_bm(bm: BaseMaker,
         computer_opens_door = region_name_base not in no_doors
         dead_end_door = dead_end and computer_opens_door
 
-        parent = parents[region_name_base]
+        parent = pre_entrance_region if parent_node is None else logical_region_names[parent_node]
         # This `parent` could be a pudding_name will be checked in no_doors,
         # which will always be false
         # since pudding names don't get put in no_doors.
@@ -139,11 +129,7 @@ def make_regions_bm(bm: BaseMaker,
             if parent.endswith(_pudding_suffix):
                 split_doors_to_correct_later[parent].append(region_name_base)
 
-        for adj in adjs:
-            if adj not in done:
-                child_name = reg_name(adj)
-                parents[child_name] = logical_region_name
-                q.append(adj)
+        logical_region_names[node] = logical_region_name
 
     for split_node, dipper in splits.items():
         dipper_name = reg_name(dipper)
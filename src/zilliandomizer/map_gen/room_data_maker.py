@@ -78,16 +78,20 @@ def room_data_exits_from_descs(descs: Iterable[Desc]) -> tuple[list[Coord], Edge
 
 
 def make_room_gen_data(base: Base) -> dict[int, RoomData]:
+    """ raises `OverflowError` if the door data doesn't fit """
     out = GEN_ROOMS.copy()
 
-    _add_to_gen_rooms(out, base.red, {})
-    _add_to_gen_rooms(out, base.paperclip, base.pc_splits)
+    _add_to_gen_rooms(out, base.red, {}, False)
+    _add_to_gen_rooms(out, base.paperclip, base.pc_splits, True)
 
     return out
 
 
-def _add_to_gen_rooms(out: dict[int, RoomData], bm: BaseMaker, splits: Mapping[Node, Node]) -> None:
-    edge_descriptions = make_edge_descriptions(bm, splits)
+def _add_to_gen_rooms(out: dict[int, RoomData],
+                      bm: BaseMaker,
+                      splits: Mapping[Node, Node],
+                      last_sector: bool) -> None:
+    edge_descriptions = make_edge_descriptions(bm, splits, last_sector)
 
     for row in range(bm.row_offset, bm.row_offset + bm.height):
         for col in range(bm.col_offset, bm.col_offset + bm.width):
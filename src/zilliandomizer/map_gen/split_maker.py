@@ -1,5 +1,4 @@
-from collections import defaultdict
-from collections.abc import Collection, Iterable, Mapping, Set as AbstractSet
+from collections.abc import Collection, Container, Iterable, Iterator, Mapping, Set as AbstractSet
 import itertools
 
 from .base_maker import BaseMaker, Edge, Node
@@ -40,14 +39,142 @@ def find_cycles(nodes: Iterable[Node], dependencies: Mapping[Node, Iterable[Node
     return cycle_nodes
 
 
+def strong_components(nodes: Iterable[Node],
+                      dependencies: Mapping[Node, Iterable[Node]],
+                      include: Container[Node]) -> list[list[Node]]:
+    """
+    strongly connected components (Tarjan) of the dependency graph with only the nodes in `include`
+
+    (not recursive)
+    """
+    index: dict[Node, int] = {}
+    low_link: dict[Node, int] = {}
+    stack: list[Node] = []
+    on_stack: set[Node] = set()
+    components: list[list[Node]] = []
+
+    for root in nodes:
+        if root in index or root not in include:
+            continue
+        index[root] = low_link[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work: list[tuple[Node, Iterator[Node]]] = [(root, iter(dependencies.get(root, ())))]
+        while len(work):
+            node, neighbors = work[-1]
+            for neighbor in neighbors:
+                if neighbor not in include:
+                    continue
+                if neighbor not in index:
+                    index[neighbor] = low_link[neighbor] = len(index)
+                    stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    work.append((neighbor, iter(dependencies.get(neighbor, ()))))
+                    break
+                if neighbor in on_stack:
+                    low_link[node] = min(low_link[node], index[neighbor])
+            else:  # finished neighbors
+                work.pop()
+                if len(work):
+                    parent = work[-1][0]
+                    low_link[parent] = min(low_link[parent], low_link[node])
+                if low_link[node] == index[node]:
+                    component: list[Node] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.remove(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+class DependencyCycles:
+    """
+    the nodes in dependency cycles, kept up to date as nodes are removed
+
+    The dependency graph is only made once.
+    Removing a node can only break up the strongly connected component that it's in,
+    so that is the only component that is looked at again.
+    """
+
+    _dependencies: Mapping[Node, Iterable[Node]]
+    _order: dict[Node, int]
+    """ nodes that haven't been removed - value is order given to constructor """
+    _component_of: dict[Node, int]
+    """ for nodes in cycles - key to `_components` """
+    _components: dict[int, list[Node]]
+    """ strongly connected components that have cycles """
+    _next_component_id: int
+
+    def __init__(self, nodes: Iterable[Node], dependencies: Mapping[Node, Iterable[Node]]) -> None:
+        self._dependencies = dependencies
+        self._order = {node: i for i, node in enumerate(nodes)}
+        self._component_of = {}
+        self._components = {}
+        self._next_component_id = 0
+        self._add_components(strong_components(self._order, dependencies, self._order))
+
+    def _add_components(self, components: Iterable[list[Node]]) -> None:
+        for component in components:
+            if len(component) == 1:
+                node = component[0]
+                if node not in self._dependencies.get(node, ()):
+                    continue
+            component_id = self._next_component_id
+            self._next_component_id += 1
+            self._components[component_id] = component
+            for node in component:
+                self._component_of[node] = component_id
+
+    def cycle_nodes(self) -> list[Node]:
+        """ nodes that are part of dependency cycles, in the order given to the constructor """
+        return sorted(self._component_of, key=self._order.__getitem__)
+
+    def remove(self, node: Node) -> None:
+        del self._order[node]
+        component_id = self._component_of.pop(node, None)
+        if component_id is None:
+            # not in a cycle, so removing it doesn't break any cycles
+            return
+        component = self._components.pop(component_id)
+        for member in component:
+            self._component_of.pop(member, None)
+        remaining = {member: True for member in component if member != node}
+        self._add_components(strong_components(remaining, self._dependencies, remaining))
+
+
+def split_dependencies(bm: BaseMaker, splits: Mapping[Node, Node], start: Node) -> dict[Node, list[Node]]:
+    """ the splits that need to be made before each split (on the path to it or to its dipper) """
+    # splits on the path from `start` to each node (one traversal instead of a path for each split)
+    splits_to: dict[Node, list[Node]] = {start: [start] if start in splits else []}
+    stack = [start]
+    while len(stack):
+        here = stack.pop()
+        for adj in bm.adjs(here):
+            if adj not in splits_to:
+                splits_to[adj] = splits_to[here] + [adj] if adj in splits else splits_to[here]
+                stack.append(adj)
+
+    dependencies: dict[Node, list[Node]] = {}
+    for node, dipper in splits.items():
+        dependencies[node] = list({
+            path_node: True
+            for path_node in itertools.chain(splits_to.get(node, ()), splits_to.get(dipper, ()))
+            if path_node != node
+        })
+    return dependencies
+
+
 def find_enter_by_elevator(nodes: Iterable[Node], bm: BaseMaker, start: Node) -> Collection[Node]:
     elevator_entrances: list[Node] = []
+    tree = bm.tree()
     for node in nodes:
-        path = bm.path(start, node)
-        if len(path) < 2:
+        parent = tree.next_on_path(node, start)
+        if parent is None:
             elevator_entrances.append(node)
             continue
-        parent = path[-2]
         if parent.y != node.y:
             elevator_entrances.append(node)
     return elevator_entrances
@@ -57,7 +184,8 @@ def choose_splits(bm: BaseMaker, no_doors: AbstractSet[Node], start: Node) -> di
     possible_splits = bm.get_possible_splits(start, no_doors)
     # print(bm.map_str(1, possible_splits))
 
-    path_to_goal = bm.path(start, Node(0, 5))
+    goal = Node(0, 5)
+    path_to_goal = frozenset(bm.path(start, goal))
 
     # TODO: don't exclude elevator entrances - block elevator with door like vanilla r15c6
     while True:
@@ -67,12 +195,13 @@ def choose_splits(bm: BaseMaker, no_doors: AbstractSet[Node], start: Node) -> di
         for node in elevator_entrances:
             del possible_splits[node]
 
+    # how many other splits are geographically adjacent to each split
+    adj_split_counts = {
+        node: sum((adj_node in possible_splits) for adj_node in bm.geo_adjs(node))
+        for node in possible_splits
+    }
     while True:
-        adj_candidates = [
-            node
-            for node in possible_splits
-            if any((adj_node in possible_splits) for adj_node in bm.geo_adjs(node))
-        ]
+        adj_candidates = [node for node in possible_splits if adj_split_counts[node]]
         if len(adj_candidates) == 0:
             break
         # print(f"just geo adjacents:\n{bm.map_str(1, adj_candidates)}")
@@ -84,30 +213,21 @@ def choose_splits(bm: BaseMaker, no_doors: AbstractSet[Node], start: Node) -> di
 
         to_evict = bm.random.choice(adj_candidates)
         del possible_splits[to_evict]
+        for adj_node in bm.geo_adjs(to_evict):
+            if adj_node in possible_splits:
+                adj_split_counts[adj_node] -= 1
 
     # print(f"no adjacents - {len(possible_splits)=}\n{bm.map_str(1, possible_splits)}")
 
     # now need to eliminate dependency cycles
+    # (Removing a split doesn't change the dependencies between the others.)
+    cycles = DependencyCycles(possible_splits, split_dependencies(bm, possible_splits, start))
     while True:
-        dependencies: dict[Node, list[Node]] = defaultdict(list)
-        for node, dipper in possible_splits.items():
-            path_to_node = bm.path(start, node)
-            path_to_dipper = bm.path(start, dipper)
-            for path_node in itertools.chain(path_to_node, path_to_dipper):
-                if path_node in possible_splits and path_node != node:
-                    dependencies[node].append(path_node)
-
-        # from pprint import pp
-        # pp(possible_splits)
-        # pp(dependencies)
-        # input()
-        cycles = find_cycles(possible_splits, dependencies)
-        # input(f"{cycles=}")
-        if len(cycles) == 0:
+        cycle_list = cycles.cycle_nodes()
+        # input(f"{cycle_list=}")
+        if len(cycle_list) == 0:
             break
 
-        cycle_list = list(cycles)
-
         # more likely to evict if not on path to goal
         not_on_path = [node for node in cycle_list if node not in path_to_goal]
         cycle_list.extend(not_on_path)
@@ -115,6 +235,7 @@ def choose_splits(bm: BaseMaker, no_doors: AbstractSet[Node], start: Node) -> di
 
         to_evict = bm.random.choice(cycle_list)
         del possible_splits[to_evict]
+        cycles.remove(to_evict)
 
     # print(f"no cycles - {len(possible_splits)=}\n{bm.map_str(1, possible_splits, split_edges(possible_splits))}")
 
@@ -1,11 +1,17 @@
-from copy import deepcopy
+from zilliandomizer.low_resources.sprite_data import (
+    RoomSprites, Sprite, room_offsets, room_sprites, room_view, sprite_rooms
+)
 
-from zilliandomizer.low_resources.sprite_data import RoomSprites, data as sprite_data, sprite_rooms
+
+def _copy_room(room: RoomSprites) -> RoomSprites:
+    return [Sprite(sprite.ram, sprite.y, sprite.x, sprite.type) for sprite in room]
 
 
 class NPSpriteManager:
+    """ the vanilla sprites are read from `sprite_table` - only rooms that are set are kept as `Sprite` objects """
+
     _data: dict[int, RoomSprites]
-    """ `{ map_index: room_sprites }` """
+    """ `{ map_index: room_sprites }` only rooms that have been set """
     _saved_data: dict[int, RoomSprites]
 
     def __init__(self) -> None:
@@ -13,33 +19,42 @@ class NPSpriteManager:
         self.save_state()
 
     def _load(self) -> None:
-        self._data = deepcopy(sprite_data)
+        self._data = {}
 
     def get_room(self, map_index: int) -> RoomSprites:
-        return deepcopy(self._data[map_index])
+        room = self._data.get(map_index)
+        if room is None:
+            return room_sprites(map_index)
+        return _copy_room(room)
 
     def set_room(self, map_index: int, sprites: RoomSprites) -> None:
-        assert len(sprites) == len(self._data[map_index]), \
+        count = (room_offsets[map_index + 1] - room_offsets[map_index]) // 6
+        assert len(sprites) == count, \
             f"wrong number of sprites in room {map_index}: " \
-            f"{len(sprites)} should be {len(self._data[map_index])}"
+            f"{len(sprites)} should be {count}"
         self._data[map_index] = sprites
 
     def get_writes(self) -> dict[int, int]:
         tr: dict[int, int] = {}
 
         for map_index, room_address in enumerate(sprite_rooms):
-            room_sprites = self._data[map_index]
-            for sprite_no, sprite in enumerate(room_sprites):
-                # not changing the number of sprites in each room
-                sprite_address = room_address + 1 + 6 * sprite_no
-                b = sprite.to_bytes()
-                for i, byte in enumerate(b):
-                    tr[sprite_address + i] = byte
+            # not changing the number of sprites in each room
+            start = room_address + 1
+            room = self._data.get(map_index)
+            if room is None:
+                for i, byte in enumerate(room_view(map_index)):
+                    tr[start + i] = byte
+            else:
+                for sprite_no, sprite in enumerate(room):
+                    sprite_address = start + 6 * sprite_no
+                    b = sprite.to_bytes()
+                    for i, byte in enumerate(b):
+                        tr[sprite_address + i] = byte
 
         return tr
 
     def save_state(self) -> None:
-        self._saved_data = deepcopy(self._data)
+        self._saved_data = {map_index: _copy_room(room) for map_index, room in self._data.items()}
 
     def load_state(self) -> None:
-        self._data = deepcopy(self._saved_data)
+        self._data = {map_index: _copy_room(room) for map_index, room in self._saved_data.items()}
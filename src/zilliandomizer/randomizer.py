@@ -1,20 +1,19 @@
-from collections import Counter, defaultdict, deque
 from random import choice, randint, randrange, shuffle
 import time
 from typing import cast
 
 from zilliandomizer.logic_components.location_data import make_locations
-from zilliandomizer.logger import Logger
+from zilliandomizer.logger import Logger, SphereSpoiler
 from zilliandomizer.map_gen.base import Base
-from zilliandomizer.options import ID, Chars, Options, char_to_hp, char_to_gun, char_to_jump
+from zilliandomizer.options import ID, Options
+from zilliandomizer.logic_components.reachability import AbilityTable, Inventory, get_locations, reachable_locations
 from zilliandomizer.logic_components.region_data import make_regions
 from zilliandomizer.logic_components.regions import Region, RegionData
 from zilliandomizer.logic_components.locations import Location, Req
 from zilliandomizer.logic_components.items import KEYWORD, MAIN, MAIN_ITEM, RESCUE, Item, items
 from zilliandomizer.room_gen.room_gen import RoomGen
-from zilliandomizer.utils import parse_reg_name, parse_loc_name, make_room_name
-from zilliandomizer.utils.loc_name_matcher import loc_name_maker
-from zilliandomizer.utils.loc_name_maps import loc_to_id
+from zilliandomizer.utils import parse_reg_name
+from zilliandomizer.utils.loc_name_matcher import pretty_names
 
 # this is used in math, not just an id
 # (in case someone is tempted to change it to 0-2 to match rom value)
@@ -24,6 +23,7 @@ MAX_GUN = 3
 
 class Randomizer:
     options: Options
+    abilities: AbilityTable
     logger: Logger
     regions: dict[str, Region]
     locations: dict[str, Location]
@@ -41,6 +41,7 @@ class Randomizer:
                  base: Base | None,
                  logger: Logger | None = None) -> None:
         self.options = options
+        self.abilities = AbilityTable(options)
         if logger is None:
             logger = Logger()
             logger.spoil_stdout = False
@@ -75,23 +76,7 @@ class Randomizer:
         self.regions = regions
         self.locations = locations
 
-        room_2_locs: dict[int, list[str]] = defaultdict(list)
-        for loc in locations:
-            if loc == 'main':
-                continue
-            row, col, _, _ = parse_loc_name(loc)
-            map_index = row * 8 + col
-            room_2_locs[map_index].append(loc)
-        self.loc_name_2_pretty = {}
-        for map_index, loc_names in room_2_locs.items():
-            row = map_index // 8
-            col = map_index & 7
-            room_name = make_room_name(row, col)
-            room_name_map = loc_name_maker(loc_names)
-            for loc_name, pretty_in_room in room_name_map.items():
-                pretty_name = f"{room_name} {pretty_in_room}"
-                assert pretty_name in loc_to_id, f"{pretty_name} not in pre-made pretty names"
-                self.loc_name_2_pretty[loc_name] = pretty_name
+        self.loc_name_2_pretty = pretty_names(loc for loc in locations if loc != 'main')
 
         # I'm not that interested in requiring different numbers of red cards.
         locations['main'].req.red = 1
@@ -200,80 +185,26 @@ class Randomizer:
                 # locs was shuffled above, so this is shuffled
                 no_jump_locs[0].req.gun = 1
 
-    def _get_locations_inner(self, have: Req) -> list[Location]:
-        """ adds doors to `have`  - see get_locations """
-        # Python set order is determined by OS memory state,
-        # making it "random" and not determined by random.seed()
-        # Otherwise found_locations would be a set.
-        found_locations: list[Location] = []
-        todo_queue: deque[Region] = deque()
-        regions_finished: set[str] = set()
-
-        todo_queue.append(self.regions["start"])
-
-        while len(todo_queue):
-            this_region = todo_queue.popleft()
-            if this_region.name in regions_finished:
-                continue
-            count_keywords = 0
-            for loc in this_region.locations:
-                loc_req = loc.req
-                if loc.item and loc.item.code == RESCUE:
-                    # having a rescue in a location removes the gun requirement
-                    loc_req.gun = 0
-                if have >= loc_req:
-                    found_locations.append(loc)
-                    if loc.item and loc.item.code == KEYWORD:
-                        count_keywords += 1
-            if count_keywords > 3:
-                have.have_doors.add(this_region.door)
-            for neighbor in this_region.connections:
-                conn_req = this_region.connections[neighbor]
-                if neighbor.name not in regions_finished and have >= conn_req:
-                    todo_queue.append(neighbor)
-            regions_finished.add(this_region.name)
-
-        return found_locations
-
     def get_locations(self, have: Req) -> list[Location]:
         """ locations that I have access to without getting any more items (1 sphere) """
-        # I don't want a sphere for each door,
-        # so I get the sphere modifying what doors I have access to repeatedly
-        # until I don't get any more.
-        last_count = -1
-        locations: list[Location] = []
-        while len(locations) != last_count:
-            last_count = len(locations)
-            locations = self._get_locations_inner(have)
-
-        return locations
-
-    def reachable_locations(self, items: list[Item], checking: bool = False) -> list[Location]:
+        return get_locations(self.regions["start"], have)
+
+    def reachable_locations(self, items: list[Item] | Inventory, checking: bool = False) -> list[Location]:
         """ multiple spheres until I can't get any more items """
-        items = items.copy()  # don't mutate
-        prev_item_count = len(items)
-        # Python set order is determined by OS memory state,
-        # making it "random" and not determined by random.seed()
-        locations_found: dict[Location, bool] = defaultdict(lambda: False)
-
-        sphere = 0
-        while True:
-            if checking and sphere:
-                self.logger.spoil(f"end of sphere: {sphere}")
-            have = self.make_ability(items)
-            locs = self.get_locations(have)
-            for loc in locs:
-                if not (locations_found[loc] or loc.item is None):
-                    items.append(loc.item)
-                    if (loc.item.is_progression or loc.item.required) and loc.item.code != KEYWORD:
-                        if checking:
-                            self.logger.spoil(f"get {loc.item.name} from {loc.name}")
-                locations_found[loc] = True
-            if len(items) == prev_item_count:
-                # didn't get anything new this sphere
-                return [loc for loc in locations_found if locations_found[loc]]
-            prev_item_count = len(items)
-            sphere += 1
+        if not isinstance(items, Inventory):
+            items = Inventory(items)
+        spheres: list[list[Location]] | None = [] if checking else None
+        found = reachable_locations(self.regions["start"], self.abilities, items, spheres)
+        if spheres:
+            self.logger.spoil_spheres(SphereSpoiler([
+                [
+                    (loc.item.name, loc.name)
+                    for loc in sphere
+                    if loc.item and (loc.item.is_progression or loc.item.required) and loc.item.code != KEYWORD
+                ]
+                for sphere in spheres
+            ]))
+        return found
 
     def make_item_pool(self) -> list[Item]:
         """ from options """
@@ -308,37 +239,7 @@ class Randomizer:
 
     def make_ability(self, item_list: list[Item]) -> Req:
         """ from just these items and options """
-        have_chars: list[Chars] = [self.options.start_char]
-        # whichever char I start with is replaced with JJ
-        id_to_char: list[Chars] = [
-            "JJ" if self.options.start_char == "Apple" else "Apple",
-            "JJ" if self.options.start_char == "Champ" else "Champ"
-        ]
-        counts: Counter[int] = Counter()
-        for item in item_list:
-            if item.code == RESCUE:
-                have_chars.append(id_to_char[item.id])
-            else:
-                counts[item.id] += 1
-        base_hp = max(char_to_hp[char] for char in have_chars)
-        levels_gained = counts[ID.opa] // self.options.opas_per_level
-        levels_gained = min(self.options.max_level - 1, levels_gained)
-        added_hp = 20 * levels_gained
-        gun = max(char_to_gun[char][self.options.gun_levels][
-            min(counts[ID.gun], len(char_to_gun[char][self.options.gun_levels]) - 1)
-        ] for char in have_chars)
-        jump = max(char_to_jump[char][self.options.jump_levels][
-            min(levels_gained, len(char_to_jump[char][self.options.jump_levels]) - 1)
-        ] for char in have_chars)
-        red = counts[ID.red]
-        floppy = counts[ID.floppy]
-        return Req(gun=gun,
-                   jump=jump,
-                   char=tuple(have_chars),
-                   hp=(base_hp + added_hp),
-                   skill=self.options.skill,
-                   red=red,
-                   floppy=floppy)
+        return self.abilities.make_ability(Inventory(item_list))
 
     def assume_fill(self) -> None:
         self.place_canister_gun_reqs()
@@ -367,9 +268,11 @@ class Randomizer:
             else:
                 non_progs.append(item)
         shuffle(progressions)
+        progressions_inventory = Inventory(progressions)
         while len(progressions):
             item = progressions.pop()
-            locs = [loc for loc in self.reachable_locations(progressions) if self.can_put_item(loc)]
+            progressions_inventory.remove(item)
+            locs = [loc for loc in self.reachable_locations(progressions_inventory) if self.can_put_item(loc)]
             if len(locs) == 0:
                 raise Randomizer.RollFail(f"no locations available for {item.name}")
             loc = choice(locs)
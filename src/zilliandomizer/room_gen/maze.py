@@ -1,4 +1,5 @@
-from collections import deque
+from bisect import bisect_left
+from collections import defaultdict, deque
 from collections.abc import Container, Iterable, Sequence, Set as AbstractSet
 from copy import deepcopy
 from dataclasses import dataclass
@@ -18,6 +19,9 @@ RIGHT = 13
 TOP = 0
 BOTTOM = 5
 
+JUMP_LEVELS: Final[tuple[float, ...]] = (2, 2.5, 3)
+""" jump blocks of the jump levels - each can make all the moves of the ones before it """
+
 
 # TODO: StrEnum ?
 @final
@@ -52,7 +56,7 @@ def g_row(s: str) -> list[CellType]:
     return tr  # type: ignore[return-value]  # pyright: ignore[reportReturnType]
 
 
-class Grid:
+class Grid:  # noqa: PLR0904
     data: list[list[CellType]]
     exits: list[Coord]
     """ places I enter and exit room - coords of lower left """
@@ -113,6 +117,11 @@ class Grid:
         self.walkways = self.walkways_in_room()
         self.reset()
 
+    @property
+    def skill(self) -> int:
+        """ skill from options """
+        return self._skill
+
     def reset(self) -> None:
         self.data = [[Cell.wall for _ in range(14)] for _ in range(6)]
         self.is_walkway = [[0 for _ in range(14)] for _ in range(6)]
@@ -175,14 +184,15 @@ class Grid:
 
     def _adj_moves(self,
                    state: tuple[int, int, bool],
-                   highest_jump: float) -> list[tuple[int, int, bool]]:
+                   highest_jump: float) -> list[tuple[tuple[int, int, bool], float]]:
         """
-        return all the places I can move in one step
+        return all the places I can move in one step,
+        each with the lowest jump (grid blocks) that can make that move (0 if it doesn't need a jump)
 
         state is (row, col, standing)
         """
 
-        moves: list[tuple[int, int, bool]] = []
+        moves: list[tuple[tuple[int, int, bool], float]] = []
         row, col, standing = state
 
         if not standing:
@@ -206,7 +216,7 @@ class Grid:
                     )
                 )
             ):
-                moves.append((row, col, True))
+                moves.append(((row, col, True), 0))
 
             # move left or right crawling
             for direction in (-1, 1):
@@ -214,16 +224,16 @@ class Grid:
                 if target_col >= LEFT and target_col <= RIGHT:
                     tile = self.data[row][target_col]
                     if tile == Cell.floor:
-                        moves.append((row, target_col, False))
+                        moves.append(((row, target_col, False), 0))
                     elif tile == Cell.space:
                         # fall
                         target_row = row + 1
                         while self.data[target_row][target_col] == Cell.space:
                             target_row += 1
-                        moves.append((target_row, target_col, True))
+                        moves.append(((target_row, target_col, True), 0))
         else:  # standing
             # can change to not standing
-            moves.append((row, col, False))
+            moves.append(((row, col, False), 0))
 
             is_walkway = self.is_walkway[row][col]
 
@@ -236,14 +246,14 @@ class Grid:
                             self.side_of_jump_around(row, col, -1, 2) or
                             self.side_of_jump_around(row, col, 1, 2)
                         ):
-                    moves.append((row - 2, col, True))
+                    moves.append(((row - 2, col, True), 2))
                 if highest_jump >= 3 and row > 3 and \
                         self.data[row - 3][col] == Cell.floor and \
                         self.data[row - 4][col] == Cell.space and (
                             self.side_of_jump_around(row, col, -1, 3) or
                             self.side_of_jump_around(row, col, 1, 3)
                         ):
-                    moves.append((row - 3, col, True))
+                    moves.append(((row - 3, col, True), 3))
 
             # check jump and move left or right
             for jump_height in range(1, int(highest_jump) + 1):  # grid spaces, not jump levels
@@ -329,7 +339,7 @@ class Grid:
                                     break
 
                             if not found_something_blocking_jump:
-                                moves.append((target_row, target_col, True))
+                                moves.append(((target_row, target_col, True), jump_height))
 
             for direction in (-1, 1):
                 # check move
@@ -340,14 +350,14 @@ class Grid:
                     self.data[row - 1][next_col] == Cell.space
                 ):
                     if self.data[row][next_col] == Cell.floor:
-                        moves.append((row, next_col, True))
+                        moves.append(((row, next_col, True), 0))
                     # horizontal jump over gap of 1
                     next_next_col = next_col + direction
                     if next_next_col >= LEFT and next_next_col <= RIGHT and \
                             self.data[row][next_col] == Cell.space and \
                             self.data[row - 1][next_next_col] == Cell.space and \
                             self.data[row][next_next_col] == Cell.floor:
-                        moves.append((row, next_next_col, True))
+                        moves.append(((row, next_next_col, True), 0))
                     # horizontal jump over gap of 2
                     nnn_col = next_next_col + direction
                     if nnn_col >= LEFT and nnn_col <= RIGHT and \
@@ -357,12 +367,12 @@ class Grid:
                             self.data[row - 1][nnn_col] == Cell.space and \
                             self.data[row][nnn_col] == Cell.floor:
                         if not self.is_walkway[row][col]:
-                            moves.append((row, nnn_col, True))
+                            moves.append(((row, nnn_col, True), 0))
                         else:
                             # from moving walkway
                             if self._skill > 2 and (row == 1 or self.data[row - 2][next_col] != Cell.space):
                                 # can bonk ceiling
-                                moves.append((row, nnn_col, True))
+                                moves.append(((row, nnn_col, True), 0))
                             elif (
                                 row > 1 and
                                 # don't need skill if there is space above me
@@ -370,7 +380,7 @@ class Grid:
                                 self.data[row - 2][next_col] == Cell.space and
                                 self.data[row - 2][next_next_col] == Cell.space
                             ):
-                                moves.append((row, nnn_col, True))
+                                moves.append(((row, nnn_col, True), 0))
                     # horizontal jump over gap of 3
                     # this is only used on top row
                     # because it requires jump 3 for the speed
@@ -387,13 +397,13 @@ class Grid:
                                 self.data[1][nnn_col] == Cell.space and \
                                 self.data[0][nnnn_col] == Cell.space and \
                                 self.data[1][nnnn_col] == Cell.floor:
-                            moves.append((row, nnnn_col, True))
+                            moves.append(((row, nnnn_col, True), 3))
                     # or fall
                     if self.data[row][next_col] == Cell.space:
                         target_row = row
                         while self.data[target_row][next_col] == Cell.space:
                             target_row += 1
-                        moves.append((target_row, next_col, True))
+                        moves.append(((target_row, next_col, True), 0))
 
             # long distance jumps, so jump level 2 (jump_blocks 2.5) can be in logic
             if not is_walkway and highest_jump >= 2.5:
@@ -411,7 +421,7 @@ class Grid:
                         # jump height 2 distance 6 (gap 5) - jump_blocks 2 can't do that
                         if self.data[row - 3][distance_6] == Cell.space and \
                            self.data[row - 2][distance_6] == Cell.floor:
-                            moves.append((row - 2, distance_6, True))
+                            moves.append(((row - 2, distance_6, True), 2.5))
                         # jump height 1 distance 7 (gap 6) - jump_blocks 2 can't do that
                         elif (
                             distance_7 >= LEFT and
@@ -423,7 +433,7 @@ class Grid:
                             self.data[row - 2][distance_7] == Cell.space and
                             self.data[row - 1][distance_7] == Cell.floor
                         ):
-                            moves.append((row - 1, distance_7, True))
+                            moves.append(((row - 1, distance_7, True), 2.5))
                     # h0d6 (w/ ceiling at 3) is difficult with jb2, easy with jb2.5
                     if (
                         row == 2 and
@@ -435,10 +445,10 @@ class Grid:
                         self.data[1][distance_6] == Cell.space and
                         self.data[2][distance_6] == Cell.floor
                     ):
-                        moves.append((2, distance_6, True))
+                        moves.append(((2, distance_6, True), 2.5))
         return moves
 
-    def _search(self,
+    def search(self,
                 start: Coord,
                 highest_jump: float,
                 standing: bool = True,
@@ -458,7 +468,7 @@ class Grid:
                 # print(self.map_str([(here[0], here[1])]))
                 if here == target_end:
                     return been
-                to_move_from.extend(self._adj_moves(here, highest_jump))
+                to_move_from.extend(move for move, _ in self._adj_moves(here, highest_jump))
         return been
 
     def solve(self, highest_jump: float) -> bool:
@@ -472,20 +482,68 @@ class Grid:
             a, b = self.ends
             a_state = (a[0], a[1], True)
             b_state = (b[0], b[1], True)
-            return a_state in self._search(b, highest_jump, True, a_state) \
-                and b_state in self._search(a, highest_jump, True, b_state)
+            return a_state in self.search(b, highest_jump, True, a_state) \
+                and b_state in self.search(a, highest_jump, True, b_state)
 
         start = self.ends[0]
         start_state = (start[0], start[1], True)
-        start_goables = self._search(start, highest_jump)
+        start_goables = self.search(start, highest_jump)
         all_ends = True
         for end in self.ends[1:]:
             all_ends = all_ends and ((end[0], end[1], True) in start_goables)
-            all_ends = all_ends and (start_state in self._search(
+            all_ends = all_ends and (start_state in self.search(
                 end, highest_jump, True, start_state
             ))
         return all_ends
 
+    def min_jumps(self,
+                  start: Coord,
+                  levels: Sequence[float] = JUMP_LEVELS) -> tuple["JumpLabels", "JumpLabels"]:
+        """
+        one label-setting search for all of the `levels` (jump blocks)
+
+        Each level needs to be able to make all the moves of the levels before it.
+
+        returns (
+            {state: lowest level to go there from `start` (standing)},
+            {state: lowest level to come back to `start` from there}
+        )
+        with only the states I can go to with the highest level
+        """
+        start_state = (start[0], start[1], True)
+        highest_jump = levels[-1]
+        to: JumpLabels = {}
+        # {state: [(state that has a move to it, index of the lowest level that has that move), ...]}
+        into: defaultdict[tuple[int, int, bool], list[tuple[tuple[int, int, bool], int]]] = defaultdict(list)
+        to_move_from: list[list[tuple[int, int, bool]]] = [[] for _ in levels]
+        to_move_from[0].append(start_state)
+        for level_i, level in enumerate(levels):
+            stack = to_move_from[level_i]
+            while len(stack):
+                here = stack.pop()
+                if here in to:
+                    continue
+                to[here] = level
+                for move, move_jump in self._adj_moves(here, highest_jump):
+                    move_i = bisect_left(levels, move_jump)
+                    into[move].append((here, move_i))
+                    if move not in to:
+                        to_move_from[max(level_i, move_i)].append(move)
+
+        back: JumpLabels = {}
+        to_move_from[0].append(start_state)
+        for level_i, level in enumerate(levels):
+            stack = to_move_from[level_i]
+            while len(stack):
+                here = stack.pop()
+                if here in back:
+                    continue
+                back[here] = level
+                for came_from, move_i in into[here]:
+                    if came_from not in back:
+                        to_move_from[max(level_i, move_i)].append(came_from)
+        return to, back
+
     def map_str(self, marks: Iterable[Coord] = ()) -> str:
         coord_marks: AbstractSet[Coord] = frozenset(marks)
         under = "̲"  # unicode underline prev char
@@ -699,7 +757,7 @@ class Grid:
         `custom_start` allows the search to start from somewhere other than the normal entrance
         """
         start = self.ends[0] if custom_start is None else custom_start
-        return self._search(start, jump_blocks)
+        return self.search(start, jump_blocks)
 
     def get_standing_goables(self, jump_blocks: float) -> list[tuple[int, int, bool]]:
         return [
@@ -882,17 +940,15 @@ class Grid:
 
     def softlock_exists(self) -> bool:
         start = self.ends[0]
-        start_state = (start[0], start[1], True)
         skill_temp = self._skill
         # skill 5 and jump 4 to make sure I don't miss any places I can go
         self._skill = 5
-        for jump_blocks in (2, 2.5, 3, 4):
-            start_goables = self._search(start, jump_blocks)
-            for y, x, standing in start_goables:
-                here = (y, x)
-                here_goables = self._search(here, jump_blocks, standing, start_state)
-                if start_state not in here_goables:
-                    # self._logger.debug(f"softlock at row {y} col {x} jump {jump_blocks}")
+        # jump 4 can't jump over a gap of 3 on the top row, so it isn't one of the `JUMP_LEVELS`
+        for levels in (JUMP_LEVELS, (4,)):
+            to, back = self.min_jumps(start, levels)
+            for here, jump_blocks in to.items():
+                if here not in back or back[here] > jump_blocks:
+                    # self._logger.debug(f"softlock at {here} jump {jump_blocks}")
                     # self._logger.debug(self.map_str())
                     self._skill = skill_temp
                     return True
@@ -994,3 +1050,91 @@ class Grid:
     def get_edge_doors(self) -> EdgeDoors:
         """ `None` if vanilla """
         return self._edge_doors
+
+
+Goables = set[tuple[int, int, bool]]
+""" (row, col, standing) - see `Grid.get_goables` """
+
+JumpLabels = dict[tuple[int, int, bool], float]
+""" {(row, col, standing): jump blocks} - see `Grid.min_jumps` """
+
+
+class Reachability:
+    """
+    searches of a `Grid` that is finished changing,
+    so the placement steps and checks can share them, each search done at most once
+
+    The `Grid` can't be modified after making this.
+    """
+
+    grid: Grid
+    _searches: dict[tuple[tuple[int, int, bool], float, int], Goables]
+    """ (start state, jump blocks, skill): everywhere I can go """
+    _reaches: dict[tuple[tuple[int, int, bool], float, int, tuple[int, int, bool]], bool]
+    """ (start state, jump blocks, skill, target state): whether I can go there """
+    _min_jumps: dict[int, tuple[JumpLabels, JumpLabels]]
+    """ skill: `Grid.min_jumps` from the entrance """
+
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
+        self._searches = {}
+        self._reaches = {}
+        self._min_jumps = {}
+
+    def search(self, start: Coord, jump_blocks: float, standing: bool = True) -> Goables:
+        """ `Grid.search` without a target - don't modify the returned set """
+        key = ((start[0], start[1], standing), jump_blocks, self.grid.skill)
+        if key not in self._searches:
+            self._searches[key] = self.grid.search(start, jump_blocks, standing)
+        return self._searches[key]
+
+    def goables(self, jump_blocks: float, custom_start: Coord | None = None) -> Goables:
+        """ `Grid.get_goables` - don't modify the returned set """
+        start = self.grid.ends[0] if custom_start is None else custom_start
+        return self.search(start, jump_blocks)
+
+    def reaches(self, start: Coord, jump_blocks: float, target: tuple[int, int, bool]) -> bool:
+        """ can go from `start` (standing) to `target` """
+        full_key = ((start[0], start[1], True), jump_blocks, self.grid.skill)
+        if full_key in self._searches:
+            return target in self._searches[full_key]
+        key = (*full_key, target)
+        if key not in self._reaches:
+            self._reaches[key] = target in self.grid.search(start, jump_blocks, True, target)
+        return self._reaches[key]
+
+    def min_jumps(self) -> tuple[JumpLabels, JumpLabels]:
+        """ `Grid.min_jumps` from the entrance for the `JUMP_LEVELS` - don't modify the returned dicts """
+        skill = self.grid.skill
+        if skill not in self._min_jumps:
+            self._min_jumps[skill] = self.grid.min_jumps(self.grid.ends[0])
+        return self._min_jumps[skill]
+
+    def jump_to(self, coord: Coord) -> float:
+        """ lowest of the `JUMP_LEVELS` to stand at `coord` (the highest if I can't go there) """
+        to, _ = self.min_jumps()
+        return to.get((coord[0], coord[1], True), JUMP_LEVELS[-1])
+
+    def lowest_solve(self) -> float | None:
+        """ lowest of the `JUMP_LEVELS` that `solve` is true for """
+        to, back = self.min_jumps()
+        lowest = JUMP_LEVELS[0]
+        for end in self.grid.ends[1:]:
+            end_state = (end[0], end[1], True)
+            if end_state not in to or end_state not in back:
+                return None
+            lowest = max(lowest, to[end_state], back[end_state])
+        return lowest
+
+    def solve(self, highest_jump: float) -> bool:
+        """ `Grid.solve` """
+        if highest_jump in JUMP_LEVELS:
+            lowest = self.lowest_solve()
+            return lowest is not None and lowest <= highest_jump
+        start = self.grid.ends[0]
+        start_state = (start[0], start[1], True)
+        start_goables = self.search(start, highest_jump)
+        return all(
+            (end[0], end[1], True) in start_goables and self.reaches(end, highest_jump, start_state)
+            for end in self.grid.ends[1:]
+        )
@@ -1,5 +1,8 @@
-from collections.abc import Iterable, Mapping, Sequence
+from collections.abc import Generator, Iterable, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
 from random import gauss, random, randrange, sample, shuffle
+from time import perf_counter
 from typing import Literal
 
 from zilliandomizer.alarm_data import ALARM_ROOMS
@@ -11,8 +14,9 @@ from zilliandomizer.low_resources.sprite_types import AutoGunSub, BarrierSub, Sp
 from zilliandomizer.np_sprite_manager import NPSpriteManager
 from zilliandomizer.room_gen.aem import AlarmEntranceManager
 from zilliandomizer.room_gen.common import BOT_LEFT, Coord, EdgeDoors, RoomData, coord_to_pixel
-from zilliandomizer.room_gen.maze import Cell, CellType, Grid, MakeFailure
+from zilliandomizer.room_gen.maze import JUMP_LEVELS, Cell, CellType, Grid, MakeFailure, Reachability
 from zilliandomizer.room_gen.sprite_placing import alarm_places, auto_gun_places, barrier_places, choose_alarms
+from zilliandomizer.room_gen.templates import RoomTemplate, TemplateLibrary
 from zilliandomizer.terrain_modifier import TerrainModifier
 from zilliandomizer.utils import make_loc_name, make_reg_name
 from zilliandomizer.logger import Logger
@@ -27,6 +31,27 @@ floor_sprite_types = (
 )
 
 
+@dataclass
+class StageStats:
+    """ how many room candidates got to a stage of room generation, and how many it threw away """
+
+    attempts: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    """ time spent in this stage """
+
+    def __str__(self) -> str:
+        rate = self.rejected / self.attempts if self.attempts else 0
+        return f"{self.rejected}/{self.attempts} rejected ({rate:.0%}) in {self.seconds:.2f}s"
+
+
+GEN_STAGES = ("template", "make", "post-process", "softlock", "placeables", "r02c0", "pudding", "place", "size")
+""" the stages of making a room, in the order they're done """
+
+TEMPLATE_FAILURES = 100
+""" after this many rejected candidates from `RoomGen.library` for a room, make new terrain for it instead """
+
+
 class RoomGen:
     """
     Anything else modifying terrain needs to be done before initializing this object,
@@ -58,13 +83,29 @@ class RoomGen:
     _gen_rooms: Mapping[int, RoomData]
     """ data specifying what to generate - `{ map_index: RoomData }` """
 
+    stage_stats: dict[str, StageStats]
+    """ from the last `generate_all` - `{ stage name: StageStats }` for `GEN_STAGES` """
+
+    library: TemplateLibrary | None
+    """
+    terrain made ahead of time, to use instead of making new terrain
+
+    The templates are only used for rooms with the same exits as the room data they were made with.
+    (This isn't saved in snapshots.)
+    """
+
+    mutations: int
+    """ how many random changes to make to each room from `library` (for variety) """
+
     def __init__(self,
                  tc: TerrainModifier,
                  sm: NPSpriteManager,
                  aem: AlarmEntranceManager,
                  logger: Logger,
                  skill: int,
-                 gen_data: Mapping[int, RoomData]) -> None:
+                 gen_data: Mapping[int, RoomData],
+                 library: TemplateLibrary | None = None,
+                 mutations: int = 0) -> None:
         self.tc = tc
         self.sm = sm
         self.aem = aem
@@ -72,12 +113,20 @@ class RoomGen:
         self._skill = skill
         self._alarm_rooms = frozenset(ALARM_ROOMS)
         self._gen_rooms = gen_data
+        self.stage_stats = {name: StageStats() for name in GEN_STAGES}
+        self.library = library
+        self.mutations = mutations
         self.reset()
 
         # testing
         # logger.spoil_stdout = True
         # logger.debug_stdout = True
 
+    def __getstate__(self) -> dict[str, object]:
+        state = self.__dict__.copy()
+        state["library"] = None
+        return state
+
     def reset(self) -> None:
         self._canisters = {}
         self.pudding_cans = set()
@@ -89,6 +138,7 @@ class RoomGen:
         self.tc.save_state()
         self.sm.save_state()
         self.reset()
+        self.stage_stats = {name: StageStats() for name in GEN_STAGES}
 
         # so the top rooms don't always have more space than the bottom
         shuffled_gen_rooms = list(self._gen_rooms.keys())
@@ -161,6 +211,93 @@ class RoomGen:
                 self.tc.load_state()
                 self.sm.load_state()
                 self.reset()
+        for name, stats in self.stage_stats.items():
+            if stats.attempts:
+                self._logger.debug(f"room gen {name}: {stats}")
+
+    @contextmanager
+    def _stage(self, name: str) -> Generator[None, None, None]:
+        """ record the `StageStats` of a stage that rejects a room candidate with `MakeFailure` """
+        stats = self.stage_stats[name]
+        stats.attempts += 1
+        start = perf_counter()
+        try:
+            yield
+        except MakeFailure:
+            stats.rejected += 1
+            raise
+        finally:
+            stats.seconds += perf_counter() - start
+
+    def _make_candidate(self,
+                        exits: list[Coord],
+                        ends: list[Coord],
+                        map_index: int,
+                        jump_blocks: float,
+                        size_limit: float,
+                        no_space: Iterable[Coord],
+                        no_change: Iterable[Coord],
+                        edge_doors: EdgeDoors,
+                        pudding_tiles: Mapping[Coord, CellType],
+                        use_library: bool) -> tuple[Grid, Reachability]:
+        """ from `library` if `use_library` and it has any rooms that fit, else `_make_optimized_no_softlock` """
+        if self.library and use_library and not pudding_tiles:
+            exits_tuple = tuple(exits)
+            templates = [
+                template
+                for template in self.library.fitting((map_index, jump_blocks, self._skill), size_limit)
+                if template.ends[:len(exits_tuple)] == exits_tuple
+            ]
+            if len(templates):
+                with self._stage("template"):
+                    template = templates[randrange(len(templates))]
+                    grid = template.to_grid(exits, map_index, self._logger, self._skill, no_space, edge_doors)
+                    for _ in range(self.mutations):
+                        self._mutate(grid, jump_blocks, size_limit)
+                    reach = Reachability(grid)
+                    # in case the movement rules changed after the library was made
+                    if not reach.solve(jump_blocks) or grid.softlock_exists():
+                        raise MakeFailure("template doesn't work")
+                return grid, reach
+        return self._make_optimized_no_softlock(
+            exits, ends, map_index, jump_blocks, size_limit, no_space, no_change, edge_doors, pudding_tiles
+        )
+
+    @staticmethod
+    def _mutate(grid: Grid, jump_blocks: float, size_limit: float) -> None:
+        """ a random `sparsify` or `shortify` of a finished room (undone if it breaks the room) """
+        data = [row.copy() for row in grid.data]
+        is_walkway = [row.copy() for row in grid.is_walkway]
+        change = grid.sparsify if random() < 0.5 else grid.shortify
+        if change():
+            if grid.walkways:
+                grid.place_walkways()
+            if (
+                len(grid.to_room_data({})) <= size_limit and
+                Reachability(grid).solve(jump_blocks) and
+                not grid.softlock_exists()
+            ):
+                return
+        grid.data = data
+        grid.is_walkway = is_walkway
+
+    def make_template(self, map_index: int, jump_blocks: float, size_limit: float) -> RoomTemplate:
+        """ terrain for a `TemplateLibrary` (not for split rooms) """
+        this_room = self._gen_rooms[map_index]
+        assert this_room.split_dip_entrance is None, f"split room {map_index=}"
+        fail_count = 0
+        while True:
+            exits, ends = self._choose_ends(map_index)
+            try:
+                grid, _ = self._make_optimized_no_softlock(
+                    exits, ends, map_index, jump_blocks, size_limit,
+                    this_room.no_space, (), this_room.edge_doors, {}
+                )
+                return RoomTemplate.from_grid(grid)
+            except MakeFailure:
+                fail_count += 1
+                if fail_count > 200:
+                    raise MakeFailure(f"too many failures making template {map_index=} {size_limit=}") from None
 
     def _make_optimized_no_softlock(self,
                                     exits: list[Coord],
@@ -171,7 +308,8 @@ class RoomGen:
                                     no_space: Iterable[Coord],
                                     no_change: Iterable[Coord],
                                     edge_doors: EdgeDoors,
-                                    pudding_tiles: Mapping[Coord, CellType]) -> Grid:
+                                    pudding_tiles: Mapping[Coord, CellType]) -> tuple[Grid, Reachability]:
+        """ the `Reachability` is for the finished `Grid` """
         tr = Grid(exits,
                   ends,
                   map_index,
@@ -183,30 +321,36 @@ class RoomGen:
         for c, tile in pudding_tiles.items():
             y, x = c
             tr.data[y][x] = tile
-        tr.make(jump_blocks, size_limit)
-        if random() < 0.5:
-            # I used to use this for softlock avoidance,
-            # but after improving the movement adjacency function,
-            # I don't need it for softlock avoidance anymore (maybe?).
-            # But it makes a significantly different style of room,
-            # so I include it randomly for variety.
-            tr.fix_crawl_fall()
-        tr.optimize_encoding()
-        # place some new walkways after post-processing
-        solved = False
-        for _ in range(5 if tr.walkways else 1):
-            if tr.walkways:
-                tr.place_walkways()
-            if tr.solve(jump_blocks):
-                solved = True
-                break
-        if tr.softlock_exists():
-            raise MakeFailure("softlock")
-        if not solved:
-            # This is expected to happen changing walkways after optimization
-            # self._logger.warn("WARNING: room generation post-processing removed navigability")
-            raise MakeFailure("post-proc broke room")
-        return tr
+        with self._stage("make"):
+            tr.make(jump_blocks, size_limit)
+        with self._stage("post-process"):
+            if random() < 0.5:
+                # I used to use this for softlock avoidance,
+                # but after improving the movement adjacency function,
+                # I don't need it for softlock avoidance anymore (maybe?).
+                # But it makes a significantly different style of room,
+                # so I include it randomly for variety.
+                tr.fix_crawl_fall()
+            tr.optimize_encoding()
+            # place some new walkways after post-processing
+            solved = False
+            reach = Reachability(tr)
+            for _ in range(5 if tr.walkways else 1):
+                if tr.walkways:
+                    tr.place_walkways()
+                    reach = Reachability(tr)
+                if reach.solve(jump_blocks):
+                    solved = True
+                    break
+            if not solved:
+                # This is expected to happen changing walkways after optimization
+                # self._logger.warn("WARNING: room generation post-processing removed navigability")
+                raise MakeFailure("post-proc broke room")
+        # Softlocks can't be found before post-processing, because post-processing can change where I can go.
+        with self._stage("softlock"):
+            if tr.softlock_exists():
+                raise MakeFailure("softlock")
+        return tr, reach
 
     def _generate_split(
         self,
@@ -341,6 +485,30 @@ class RoomGen:
 
         return [dip_entrance], ends, no_space, no_change, pudding_tiles
 
+    def _choose_ends(self, map_index: int) -> tuple[list[Coord], list[Coord]]:
+        """ returns (exits, ends) for a room that isn't split """
+        exits = self._gen_rooms[map_index].exits[:]  # real exits
+        ends = exits[:]  # places I want to be able to get to
+
+        # special case row 14 col 1 - because of the exit-only door
+        # This must be done before these random ends are added,
+        # because a random end might conflict with this one.
+        if map_index == 113:
+            if BOT_LEFT not in ends:
+                ends.append(BOT_LEFT)
+
+        # make sure traversal doesn't just stay in one corner of the room
+        if not any(end[1] < 5 for end in ends):
+            ends.append((randrange(1, 6), 0))
+        if not any(end[1] > 8 for end in ends):
+            ends.append((randrange(1, 6), 12))
+        if not any(end[0] > 4 for end in ends):
+            ends.append((5, randrange(5, 8)))
+        if not any(end[0] < 3 for end in ends):
+            if random() < 0.5:
+                ends.append((1, randrange(0, 13)))
+        return exits, ends
+
     def _generate_room(self,
                        map_index: int,
                        jump_blocks: float,
@@ -353,26 +521,7 @@ class RoomGen:
             exits, ends, no_space, no_change, pudding_tiles = self._generate_split(map_index, jump_blocks, size_limit)
             second_candidate_for_elevation = False
         else:
-            exits = this_room.exits[:]  # real exits
-            ends = exits[:]  # places I want to be able to get to
-
-            # special case row 14 col 1 - because of the exit-only door
-            # This must be done before these random ends are added,
-            # because a random end might conflict with this one.
-            if map_index == 113:
-                if BOT_LEFT not in ends:
-                    ends.append(BOT_LEFT)
-
-            # make sure traversal doesn't just stay in one corner of the room
-            if not any(end[1] < 5 for end in ends):
-                ends.append((randrange(1, 6), 0))
-            if not any(end[1] > 8 for end in ends):
-                ends.append((randrange(1, 6), 12))
-            if not any(end[0] > 4 for end in ends):
-                ends.append((5, randrange(5, 8)))
-            if not any(end[0] < 3 for end in ends):
-                if random() < 0.5:
-                    ends.append((1, randrange(0, 13)))
+            exits, ends = self._choose_ends(map_index)
 
             # If all the ends are on the bottom, I want an extra chance to get high goables
             second_candidate_for_elevation = all(end[0] > 2 for end in ends)
@@ -382,6 +531,7 @@ class RoomGen:
             pudding_tiles = {}
 
         g: Grid | None = None
+        g_reach: Reachability | None = None
         primary_placed: list[Coord] = []
         pudding_placed: list[Coord] = []
         alarm_blocks: dict[int, Literal['v', 'h', 'n']] = {}
@@ -389,23 +539,25 @@ class RoomGen:
         fail_count = 0
         while not g:
             try:
-                candidate = self._make_optimized_no_softlock(
+                use_library = fail_count < TEMPLATE_FAILURES
+                candidate, candidate_reach = self._make_candidate(
                     exits, ends, map_index, jump_blocks, size_limit,
-                    no_space, no_change, this_room.edge_doors, pudding_tiles
+                    no_space, no_change, this_room.edge_doors, pudding_tiles, use_library
                 )
-                candidate_goables = candidate.get_goables(jump_blocks)
+                candidate_goables = candidate_reach.goables(jump_blocks)
                 if second_candidate_for_elevation:
                     # lowest y coordinate is highest elevation
                     highest = min(c[0] for c in candidate_goables)
                     if highest > 1:
-                        candidate_2 = self._make_optimized_no_softlock(
+                        candidate_2, candidate_2_reach = self._make_candidate(
                             exits, ends, map_index, jump_blocks, size_limit,
-                            no_space, no_change, this_room.edge_doors, pudding_tiles
+                            no_space, no_change, this_room.edge_doors, pudding_tiles, use_library
                         )
-                        candidate_2_goables = candidate_2.get_goables(jump_blocks)
+                        candidate_2_goables = candidate_2_reach.goables(jump_blocks)
                         highest_2 = min(c[0] for c in candidate_2_goables)
                         if highest_2 < highest:
                             candidate = candidate_2
+                            candidate_reach = candidate_2_reach
                             candidate_goables = candidate_2_goables
                 # TODO: find out which exits require jump 2.5, 3
                 standing = [g for g in candidate_goables if g[2]]
@@ -425,17 +577,6 @@ class RoomGen:
                         pudding_can = True
                     pudding_floor_sprite_count = min((can_place_in_pudding - pudding_can), room_floor_sprite_count)
                     will_place_in_pudding = pudding_floor_sprite_count + pudding_can
-                    pudding_goables = candidate.get_goables(jump_blocks, this_room.exits[0])
-                    pudding_standing = [g for g in pudding_goables if g[2]]
-                    pudding_placeables = [
-                        (y, x)
-                        for y, x, _ in pudding_standing
-                        if not candidate.in_exit(y, x, this_room.exits)
-                    ]
-                    self._logger.debug(f"{pudding_placeables=}")
-                    if len(pudding_placeables) < will_place_in_pudding:
-                        raise MakeFailure(f"Not enough room in {map_index=} pudding to place {will_place_in_pudding}")
-                    pudding_placed = sample(pudding_placeables, will_place_in_pudding)
                 else:
                     will_place_in_pudding = 0
                     pudding_floor_sprite_count = 0
@@ -450,8 +591,33 @@ class RoomGen:
                 #     f"need to place {primary_placeable_count} in room {map_index} primary region and "
                 #     f"{will_place_in_pudding} in pudding region, including {pudding_can=} with {len(pudding_tiles)=}"
                 # )
-                if len(primary_placeables) < primary_placeable_count:
-                    raise MakeFailure("not enough places to put things")
+
+                # cheapest checks first - these don't use the random generator
+                with self._stage("placeables"):
+                    if len(primary_placeables) < primary_placeable_count:
+                        raise MakeFailure("not enough places to put things")
+                if map_index == 0x10 and not (pudding_can or this_room.dead_end_can):
+                    # This is part of making sure 1st sphere is not empty.
+                    # (the same check after placing, but without any place to put that can)
+                    with self._stage("r02c0"):
+                        if not any(candidate_reach.jump_to(c) <= 2 for c in primary_placeables):
+                            raise MakeFailure("need location in r02c0 that doesn't require jump levels")
+                if len(pudding_tiles) > 20:
+                    with self._stage("pudding"):
+                        pudding_goables = candidate_reach.goables(jump_blocks, this_room.exits[0])
+                        pudding_standing = [g for g in pudding_goables if g[2]]
+                        pudding_placeables = [
+                            (y, x)
+                            for y, x, _ in pudding_standing
+                            if not candidate.in_exit(y, x, this_room.exits)
+                        ]
+                        self._logger.debug(f"{pudding_placeables=}")
+                        if len(pudding_placeables) < will_place_in_pudding:
+                            raise MakeFailure(
+                                f"Not enough room in {map_index=} pudding to place {will_place_in_pudding}"
+                            )
+                    pudding_placed = sample(pudding_placeables, will_place_in_pudding)
+
                 if primary_placeable_count > 0:
                     # take 2 samples, and choose whichever has higher coords
                     # (to counter the tendency of putting most on the lowest level)
@@ -460,25 +626,30 @@ class RoomGen:
                     sum_1 = sum(p[0] for p in placed_1)
                     sum_2 = sum(p[0] for p in placed_2)
                     primary_placed = placed_1 if sum_1 < sum_2 else placed_2
-                alarm_blocks = self.place(
-                    primary_placed, sprites, map_index, candidate, this_room.dead_end_can, pudding_placed, pudding_can
-                )
+                with self._stage("place"):
+                    alarm_blocks = self.place(
+                        primary_placed, sprites, map_index, candidate, this_room.dead_end_can, pudding_placed,
+                        pudding_can, candidate_reach
+                    )
 
                 if map_index == 0x10:
                     # This is part of making sure 1st sphere is not empty.
-                    placed_cans = self._canisters[map_index]
-                    assert len(placed_cans) == 5, f"{map_index=} {len(placed_cans)=}"
-                    good = any(can[1] <= 2 for can in placed_cans)
-                    # can get to at least 1 can without any jump levels
-                    if not good:
-                        raise MakeFailure("need location in r02c0 that doesn't require jump levels")
-
-                compressed = candidate.to_room_data(alarm_blocks)
-                if len(compressed) > size_limit:
-                    raise MakeFailure("over size limit")
+                    with self._stage("r02c0"):
+                        placed_cans = self._canisters[map_index]
+                        assert len(placed_cans) == 5, f"{map_index=} {len(placed_cans)=}"
+                        good = any(can[1] <= 2 for can in placed_cans)
+                        # can get to at least 1 can without any jump levels
+                        if not good:
+                            raise MakeFailure("need location in r02c0 that doesn't require jump levels")
+
+                with self._stage("size"):
+                    compressed = candidate.to_room_data(alarm_blocks)
+                    if len(compressed) > size_limit:
+                        raise MakeFailure("over size limit")
                 if pudding_can:
                     self.pudding_cans.add(map_index)
                 g = candidate
+                g_reach = candidate_reach
                 # testing - TODO: make unit test for Grid.no_space
                 # if map_index in (0x4b, 0x21):
             except MakeFailure:  # noqa: PERF203
@@ -489,7 +660,8 @@ class RoomGen:
                                       f" - index {map_index} sl {size_limit}") from None
         print()
 
-        jump_blocks_required = 2 if g.solve(2) else (2.5 if g.solve(2.5) else 3)
+        assert g_reach
+        jump_blocks_required = g_reach.lowest_solve() or JUMP_LEVELS[-1]
         # require jumping to computer
         if map_index in self._computers:
             computer_jump = self._computers[map_index][1]
@@ -514,7 +686,8 @@ class RoomGen:
               grid: Grid,
               dead_end_can: Coord | None,
               pudding_placed: list[Coord],
-              pudding_can: bool) -> dict[int, Literal['v', 'h', 'n']]:
+              pudding_can: bool,
+              reach: Reachability | None = None) -> dict[int, Literal['v', 'h', 'n']]:
         """
         place the things that need to be placed in this room
 
@@ -529,16 +702,20 @@ class RoomGen:
         There needs to be enough coordinates from dipped for all the canisters and the computer
         (taken from the beginning of the list).
 
+        `reach` - searches of `grid` to share with other steps
+
         returns alarm block data (input to `Alarms.add_alarms_to_room_terrain_bytes`)
         """
         # TODO: possible uncompletable seed: Make sure I can get to 2 places
         # in the height of the lowest canister.
         # (This might be solved with new end adding near the beginning of _generate_room)
 
+        if reach is None:
+            reach = Reachability(grid)
         all_floor_placements_pudding_at_end = primary_coords + pudding_placed
         full_room_exits = set(self._gen_rooms[map_index].exits)  # set for __contains__ performance
         agp = auto_gun_places(grid, full_room_exits)
-        bp = barrier_places(grid, all_floor_placements_pudding_at_end, full_room_exits)
+        bp = barrier_places(grid, all_floor_placements_pudding_at_end, full_room_exits, reach)
         # last index will be saved for pudding_can
         end_cursor = len(all_floor_placements_pudding_at_end) - (1 + pudding_can)
         for sprite in sprites:
@@ -618,27 +795,15 @@ class RoomGen:
                 sprite.y = y
             else:
                 self._logger.warn(f"sprite type {sprite.type[0]} unhandled in room {map_index}")
-        goables_2 = grid.get_standing_goables(2)
-        goables_25 = grid.get_standing_goables(2.5)
         begin_cursor = 0
         if self._gen_rooms[map_index].computer:
-            y, x = primary_coords[begin_cursor]
             # to make sure computer can be accessed to traverse room
-            state = (y, x, True)
-            jump = 2 if state in goables_2 else (
-                2.5 if state in goables_25 else 3
-            )
-            self._computers[map_index] = (primary_coords[begin_cursor], jump)
+            self._computers[map_index] = (primary_coords[begin_cursor], reach.jump_to(primary_coords[begin_cursor]))
             begin_cursor += 1
         # canisters
         cans: list[tuple[Coord, float]] = []
         for coord in primary_coords[begin_cursor:end_cursor + 1]:
-            y, x = coord
-            state = (y, x, True)
-            jump = 2 if state in goables_2 else (
-                2.5 if state in goables_25 else 3
-            )
-            cans.append((coord, jump))
+            cans.append((coord, reach.jump_to(coord)))
         self._canisters[map_index] = cans
         # self._logger.debug(f"{map_index=} placed {len(cans)=} {begin_cursor=} {end_cursor=} {pudding_can=}")
         if pudding_can:
@@ -687,7 +852,7 @@ class RoomGen:
             count = 0
             while count < 1:
                 count = round(gauss(mu, 1))
-            ap = alarm_places(grid, all_floor_placements_pudding_at_end)
+            ap = alarm_places(grid, all_floor_placements_pudding_at_end, reach)
             return choose_alarms(ap, count)
         else:
             return {}
@@ -752,3 +917,38 @@ class RoomGen:
         if map_index in self._rooms:
             return self._rooms[map_index]
         return 0
+
+
+def build_library(gen_data: Mapping[int, RoomData],
+                  skills: Iterable[int],
+                  per_key: int,
+                  size_limits: Sequence[float] = (50, 56, 62),
+                  library: TemplateLibrary | None = None) -> TemplateLibrary:
+    """
+    make `per_key` templates for each room in `gen_data` (not split rooms), jump level, and skill,
+    spread over the `size_limits`
+
+    This takes about as long as generating `per_key * 3 * len(skills)` seeds,
+    so it's meant to be done once and saved with `TemplateLibrary.save`.
+
+    `library` - add to this library instead of a new one
+    """
+    if library is None:
+        library = TemplateLibrary()
+    logger = Logger()
+    logger.spoil_stdout = False
+    for skill in skills:
+        room_gen = RoomGen(TerrainModifier(), NPSpriteManager(), AlarmEntranceManager(), logger, skill, gen_data)
+        for map_index, room in gen_data.items():
+            if room.split_dip_entrance:
+                continue
+            for jump_blocks in JUMP_LEVELS:
+                for i in range(per_key):
+                    size_limit = size_limits[i % len(size_limits)]
+                    try:
+                        template = room_gen.make_template(map_index, jump_blocks, size_limit)
+                    except MakeFailure:
+                        logger.debug(f"no template for {map_index=} {jump_blocks=} {skill=} {size_limit=}")
+                        continue
+                    library.add((map_index, jump_blocks, skill), template)
+    return library
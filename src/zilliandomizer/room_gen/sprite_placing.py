@@ -1,9 +1,9 @@
-from collections.abc import Container
+from collections.abc import Container, Iterable
 from dataclasses import dataclass
 from random import shuffle
 from typing import Literal
 from zilliandomizer.room_gen.common import Coord
-from zilliandomizer.room_gen.maze import BOTTOM, LEFT, RIGHT, TOP, Cell, Grid, MakeFailure
+from zilliandomizer.room_gen.maze import BOTTOM, LEFT, RIGHT, TOP, Cell, Grid, MakeFailure, Reachability
 
 
 class AutoGunPlaces:
@@ -39,6 +39,19 @@ def auto_gun_places(g: Grid, exits: Container[Coord]) -> AutoGunPlaces:
     return tr
 
 
+_ROW_MASK = (1 << (RIGHT + 1)) - 1
+
+
+def exit_masks(exits: Iterable[Coord]) -> list[int]:
+    """ [row] bit `x` is set if `(row, x)` is in an exit area (see `Grid.in_exit`) """
+    tr = [0] * (BOTTOM + 1)
+    for row, col in exits:
+        for y in (row - 1, row):
+            if TOP <= y <= BOTTOM:
+                tr[y] |= (0b11 << col) & _ROW_MASK
+    return tr
+
+
 @dataclass
 class BarPlace:
     """ horizontal bars go at the bottom of the large tiles """
@@ -76,18 +89,25 @@ class BarPlaces:
         self.bars.append(BarPlace(c, horizontal, length))
 
 
-def barrier_places(g: Grid, floor_things: list[Coord], exits: Container[Coord]) -> BarPlaces:
+def barrier_places(g: Grid,
+                   floor_things: list[Coord],
+                   exits: Iterable[Coord],
+                   reach: Reachability | None = None) -> BarPlaces:
+    """ `reach` - searches of `g` to share with other steps """
     tr = BarPlaces(frozenset(floor_things))
+    exit_rows = exit_masks(exits)
     for y, row in enumerate(g.data):
+        exit_row = exit_rows[y]
         for x, this_cell in enumerate(row):
             here = (y, x)
-            if this_cell == Cell.space and not g.in_exit(y, x, exits):
+            in_exit = (exit_row >> x) & 1
+            if this_cell == Cell.space and not in_exit:
                 if x == LEFT or g.data[y][x - 1] != Cell.space:
                     # (the bottom of this) is a place where a horizontal bar can start
                     if x == RIGHT or g.data[y][x + 1] != Cell.space:
                         tr.add(here, True, 1)
                     else:  # space to the right
-                        if not g.in_exit(y, x + 1, exits):
+                        if not (exit_row >> (x + 1)) & 1:
                             if x + 1 == RIGHT or g.data[y][x + 2] != Cell.space:
                                 tr.add(here, True, 2)
                             # else would have to be longer than 2, but barrier max length is 2
@@ -98,7 +118,7 @@ def barrier_places(g: Grid, floor_things: list[Coord], exits: Container[Coord])
                 ):
                     # length 2 vertical bar can be here
                     tr.add(here, False, 2)
-            elif this_cell == Cell.floor and not g.in_exit(y, x, exits) and (
+            elif this_cell == Cell.floor and not in_exit and (
                 y > TOP and g.data[y - 1][x] != Cell.space
             ):
                 # length 1 vertical bar can be here
@@ -108,7 +128,7 @@ def barrier_places(g: Grid, floor_things: list[Coord], exits: Container[Coord])
     # put the places I can't go first in the list, so they're the last to get chosen
     cant_go: list[BarPlace] = []
     can_go: list[BarPlace] = []
-    goables = g.get_goables(3)
+    goables = (reach or Reachability(g)).goables(3)
     for bar in tr.bars:
         y, x = bar.c
         if bar.horizontal:
@@ -124,38 +144,79 @@ def barrier_places(g: Grid, floor_things: list[Coord], exits: Container[Coord])
     return tr
 
 
-def alarm_places(g: Grid, floor_things: list[Coord]) -> BarPlaces:
-    """ returns places where alarms can go """
+def _horizontal_alarm_runs(g: Grid, y: int, exit_row: int) -> tuple[list[int], list[bool]]:
+    """
+    for each x in row `y`, the x where a horizontal alarm starting there has to end (exclusive),
+    and whether that's because of an exit or walkway
+    """
+    ends = [RIGHT + 1] * (RIGHT + 2)
+    blocked = [False] * (RIGHT + 2)
+    row = g.data[y]
+    walkway_below = g.is_walkway[y + 1]
+    for x in range(RIGHT, LEFT - 1, -1):
+        exit_or_walkway = bool((exit_row >> x) & 1) or bool(walkway_below[x])
+        if row[x] != Cell.space or exit_or_walkway:
+            ends[x] = x
+            blocked[x] = exit_or_walkway
+        else:
+            ends[x] = ends[x + 1]
+            blocked[x] = blocked[x + 1]
+    return ends, blocked
+
+
+def _vertical_alarm_runs(g: Grid, x: int, exit_rows: list[int]) -> tuple[list[int], list[bool]]:
+    """
+    for each y in column `x`, the y where a vertical alarm starting there stops,
+    and whether that's because of an exit or walkway
+    """
+    ends = [BOTTOM + 1] * (BOTTOM + 2)
+    blocked = [False] * (BOTTOM + 2)
+    for y in range(BOTTOM, TOP - 1, -1):
+        exit_or_walkway = bool((exit_rows[y] >> x) & 1) or bool(g.is_walkway[y][x])
+        if g.data[y][x] == Cell.floor or g.data[y][x - 1] == Cell.floor or exit_or_walkway:
+            ends[y] = y
+            blocked[y] = exit_or_walkway
+        else:
+            ends[y] = ends[y + 1]
+            blocked[y] = blocked[y + 1]
+    return ends, blocked
+
+
+def alarm_places(g: Grid, floor_things: list[Coord], reach: Reachability | None = None) -> BarPlaces:
+    """
+    returns places where alarms can go
+
+    `reach` - searches of `g` to share with other steps
+    """
     tr = BarPlaces(frozenset(floor_things))
+    exit_rows = exit_masks(g.exits)
+    # made when they're needed, [y] and [x]
+    horizontal_runs: dict[int, tuple[list[int], list[bool]]] = {}
+    vertical_runs: dict[int, tuple[list[int], list[bool]]] = {}
     for y, row in enumerate(g.data):
+        exit_row = exit_rows[y]
         for x, this_cell in enumerate(row):
             here = (y, x)
+            in_exit = (exit_row >> x) & 1
             # can horizontal start below this?
             if (
-                (this_cell == Cell.space and not g.in_exit(y, x)) and
+                (this_cell == Cell.space and not in_exit) and
                 (x == LEFT or g.data[y][x - 1] != Cell.space) and
                 (not g.is_walkway[y + 1][x])
             ):
                 # (below this) is a place where a horizontal bar can start
-                end_x = x
-                ran_into_exit_or_walkway = False
-                while end_x <= RIGHT:
-                    ran_into_exit_or_walkway = (
-                        g.in_exit(y, end_x) or
-                        bool(g.is_walkway[y + 1][end_x])
-                    )
-                    if g.data[y][end_x] != Cell.space or ran_into_exit_or_walkway:
-                        break
-                    end_x += 1
-                if not ran_into_exit_or_walkway:
-                    length = end_x - x
+                if y not in horizontal_runs:
+                    horizontal_runs[y] = _horizontal_alarm_runs(g, y, exit_row)
+                ends, blocked = horizontal_runs[y]
+                if not blocked[x]:
+                    length = ends[x] - x
                     tr.add(here, True, length)
                 # else ran into exit
             # can a vertical bar start here?
             if (
                 (this_cell == Cell.space or this_cell == Cell.floor) and
                 (not g.is_walkway[y][x]) and
-                (not g.in_exit(y, x)) and
+                (not in_exit) and
                 (x > LEFT and g.data[y][x - 1] != Cell.wall) and
                 (
                     y == TOP or
@@ -163,21 +224,11 @@ def alarm_places(g: Grid, floor_things: list[Coord]) -> BarPlaces:
                     g.data[y - 1][x] != Cell.space
                 )
             ):
-                end_y = y
-                ran_into_exit_or_walkway = False
-                while end_y <= BOTTOM:
-                    ran_into_exit_or_walkway = (
-                        g.in_exit(end_y, x) or
-                        bool(g.is_walkway[end_y][x])
-                    )
-                    if (
-                        g.data[end_y][x] == Cell.floor or
-                        g.data[end_y][x - 1] == Cell.floor or
-                        ran_into_exit_or_walkway
-                    ):
-                        break
-                    end_y += 1
-                if not ran_into_exit_or_walkway:
+                if x not in vertical_runs:
+                    vertical_runs[x] = _vertical_alarm_runs(g, x, exit_rows)
+                ends, blocked = vertical_runs[x]
+                end_y = ends[y]
+                if not blocked[y]:
                     length = end_y + 1 - y
                     # red vertical alarms can only be
                     # length 2, ceiling to floor, starting in even row
@@ -210,7 +261,7 @@ def alarm_places(g: Grid, floor_things: list[Coord]) -> BarPlaces:
     # put the places I can't go first in the list, so they're the last to get chosen
     cant_go: list[BarPlace] = []
     can_go: list[BarPlace] = []
-    goables = g.get_goables(3)
+    goables = (reach or Reachability(g)).goables(3)
     for bar in tr.bars:
         y, x = bar.c
         if bar.horizontal:
@@ -232,31 +283,50 @@ def alarm_places(g: Grid, floor_things: list[Coord]) -> BarPlaces:
 
 def choose_alarms(ap: BarPlaces, count: int) -> dict[int, Literal["v", "h", "n"]]:
     """ returns input to `Alarms.add_alarms_to_room_terrain_bytes` """
-
-    def collides(a: BarPlace, b: BarPlace) -> bool:
-        if a.horizontal == b.horizontal:
-            return False
-        if a.horizontal:
-            a, b = b, a
-        # a vertical, b horizontal
-        a_range = range(a.c[0], a.c[0] + a.length)
-        if (b.c[0] + 1) not in a_range:
-            return False
-        b_range = range(b.c[1], b.c[1] + b.length)
-        return a.c[1] in b_range
+    bars = ap.bars
+    removed = [False] * len(bars)
+    """ chosen or collides with something chosen """
+    # index of bars that a choice could collide with
+    horizontals_in_row: list[list[int]] = [[] for _ in range(BOTTOM + 2)]
+    """ [row of the alarm (below the tile)] """
+    verticals_in_col: list[list[int]] = [[] for _ in range(RIGHT + 1)]
+    for i, bar in enumerate(bars):
+        if bar.horizontal:
+            horizontals_in_row[bar.c[0] + 1].append(i)
+        else:
+            verticals_in_col[bar.c[1]].append(i)
 
     tr: dict[int, Literal["v", "h", "n"]] = {}
+    remaining = len(bars)
+    """ everything at or after this index is removed """
     while count > 0:
-        if len(ap.bars) == 0:
+        while remaining > 0 and removed[remaining - 1]:
+            remaining -= 1
+        if remaining == 0:
             # print("warning: not enough places to put alarms")
             if len(tr) < 1:
                 raise MakeFailure("zero places to put alarms in alarm room")
             break
-        this_one = ap.bars.pop()
+        remaining -= 1
+        removed[remaining] = True
+        this_one = bars[remaining]
         count -= 1
 
         # remove everything that collides with this one
-        ap.bars = [bar for bar in ap.bars if not collides(this_one, bar)]
+        if this_one.horizontal:
+            y = this_one.c[0] + 1
+            for x in range(this_one.c[1], this_one.c[1] + this_one.length):
+                for i in verticals_in_col[x]:
+                    vertical = bars[i]
+                    if vertical.c[0] <= y < vertical.c[0] + vertical.length:
+                        removed[i] = True
+        else:  # vertical
+            x = this_one.c[1]
+            for y in range(this_one.c[0], this_one.c[0] + this_one.length):
+                for i in horizontals_in_row[y]:
+                    horizontal = bars[i]
+                    if horizontal.c[1] <= x < horizontal.c[1] + horizontal.length:
+                        removed[i] = True
 
         # add modifications
         if this_one.horizontal:
@@ -271,4 +341,5 @@ def choose_alarms(ap: BarPlaces, count: int) -> dict[int, Literal["v", "h", "n"]
                 index = y * 16 + x
                 tr[index] = 'v'
 
+    ap.bars = [bar for i, bar in enumerate(bars) if not removed[i]]
     return tr
@@ -0,0 +1,161 @@
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+import zlib
+
+from zilliandomizer.logger import Logger
+from zilliandomizer.room_gen.common import Coord, EdgeDoors
+from zilliandomizer.room_gen.maze import JUMP_LEVELS, Cell, CellType, Grid
+
+_MAGIC = b"ZRT1"
+
+_CELL_CODES: dict[CellType, int] = {Cell.space: 0, Cell.floor: 1, Cell.wall: 2}
+_CODE_CELLS: tuple[CellType, ...] = (Cell.space, Cell.floor, Cell.wall)
+
+TemplateKey = tuple[int, float, int]
+""" (map_index, jump blocks, skill) """
+
+
+@dataclass(frozen=True)
+class RoomTemplate:
+    """ terrain of a finished room (made, post-processed, and checked for softlocks) """
+
+    ends: tuple[Coord, ...]
+    data: tuple[tuple[CellType, ...], ...]
+    """ 6 rows of 14 `Cell` """
+    is_walkway: tuple[tuple[int, ...], ...]
+    """ `Grid.is_walkway` """
+    size: int
+    """ length of the compressed terrain without alarms """
+
+    @staticmethod
+    def from_grid(grid: Grid) -> "RoomTemplate":
+        return RoomTemplate(
+            tuple(grid.ends),
+            tuple(tuple(row) for row in grid.data),
+            tuple(tuple(row) for row in grid.is_walkway),
+            len(grid.to_room_data({}))
+        )
+
+    def to_grid(self,
+                exits: list[Coord],
+                map_index: int,
+                logger: Logger,
+                skill: int,
+                no_space: Iterable[Coord],
+                edge_doors: EdgeDoors = None) -> Grid:
+        grid = Grid(exits, list(self.ends), map_index, logger, skill, no_space, (), edge_doors)
+        grid.data = [list(row) for row in self.data]
+        grid.is_walkway = [list(row) for row in self.is_walkway]
+        return grid
+
+    def to_bytes(self) -> bytes:
+        """ size, end count, ends (row in high nibble), then 4 bits for each cell (cell code, walkway) """
+        assert self.size < 0x100, f"{self.size=}"
+        tr = bytearray((self.size, len(self.ends)))
+        tr.extend((row << 4) | col for row, col in self.ends)
+        nibbles = [
+            _CELL_CODES[cell] | (walkway << 2)
+            for data_row, walkway_row in zip(self.data, self.is_walkway, strict=True)
+            for cell, walkway in zip(data_row, walkway_row, strict=True)
+        ]
+        tr.extend((nibbles[i] << 4) | nibbles[i + 1] for i in range(0, len(nibbles), 2))
+        return bytes(tr)
+
+    @staticmethod
+    def from_bytes(data: bytes, offset: int) -> tuple["RoomTemplate", int]:
+        """ returns (template, offset after this template) """
+        size = data[offset]
+        end_count = data[offset + 1]
+        offset += 2
+        ends = tuple((b >> 4, b & 0xf) for b in data[offset:offset + end_count])
+        offset += end_count
+        nibbles: list[int] = []
+        for b in data[offset:offset + 42]:
+            nibbles.append(b >> 4)
+            nibbles.append(b & 0xf)
+        offset += 42
+        rows: tuple[tuple[CellType, ...], ...] = tuple(
+            tuple(_CODE_CELLS[n & 3] for n in nibbles[row * 14:row * 14 + 14])
+            for row in range(6)
+        )
+        is_walkway = tuple(
+            tuple(n >> 2 for n in nibbles[row * 14:row * 14 + 14])
+            for row in range(6)
+        )
+        return RoomTemplate(ends, rows, is_walkway, size), offset
+
+
+class TemplateLibrary:
+    """
+    room terrain made ahead of time
+
+    For "rooms" map_gen, everything that the terrain is made from (`GEN_ROOMS`) is the same for every seed,
+    so the slow part of room gen can be done once and saved.
+    (sprites and alarms are still placed for each seed)
+
+    made by `room_gen.build_library`
+    """
+
+    templates: dict[TemplateKey, list[RoomTemplate]]
+    """ sorted by size """
+    _sizes: dict[TemplateKey, list[int]]
+
+    def __init__(self) -> None:
+        self.templates = {}
+        self._sizes = {}
+
+    def add(self, key: TemplateKey, template: RoomTemplate) -> None:
+        templates = self.templates.setdefault(key, [])
+        sizes = self._sizes.setdefault(key, [])
+        i = bisect_right(sizes, template.size)
+        templates.insert(i, template)
+        sizes.insert(i, template.size)
+
+    def fitting(self, key: TemplateKey, size_limit: float) -> Sequence[RoomTemplate]:
+        """ the templates for `key` that are not over `size_limit` (before alarms) """
+        sizes = self._sizes.get(key)
+        if not sizes:
+            return ()
+        return self.templates[key][:bisect_right(sizes, size_limit)]
+
+    def __len__(self) -> int:
+        return sum(len(templates) for templates in self.templates.values())
+
+    def to_bytes(self) -> bytes:
+        """ compressed binary """
+        tr = bytearray()
+        for (map_index, jump_blocks, skill), templates in self.templates.items():
+            tr.extend((map_index, JUMP_LEVELS.index(jump_blocks), skill))
+            tr.extend(len(templates).to_bytes(2, "little"))
+            for template in templates:
+                tr.extend(template.to_bytes())
+        return _MAGIC + zlib.compress(bytes(tr), 9)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "TemplateLibrary":
+        if data[:len(_MAGIC)] != _MAGIC:
+            raise ValueError("invalid room template library data")
+        try:
+            raw = zlib.decompress(data[len(_MAGIC):])
+        except zlib.error as e:
+            raise ValueError("invalid room template library data") from e
+        tr = TemplateLibrary()
+        offset = 0
+        while offset < len(raw):
+            map_index, jump_i, skill = raw[offset:offset + 3]
+            count = int.from_bytes(raw[offset + 3:offset + 5], "little")
+            offset += 5
+            key = (map_index, JUMP_LEVELS[jump_i], skill)
+            for _ in range(count):
+                template, offset = RoomTemplate.from_bytes(raw, offset)
+                tr.add(key, template)
+        return tr
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_bytes(self.to_bytes())
+
+    @staticmethod
+    def load(path: str | Path) -> "TemplateLibrary":
+        return TemplateLibrary.from_bytes(Path(path).read_bytes())
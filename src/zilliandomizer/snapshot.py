@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+import io
+import pickle  # noqa: S403
+import zlib
+
+from .logger import Logger, SphereSpoiler
+from .map_gen.base import Base
+from .options import Options
+from .randomizer import Randomizer
+from .resource_managers import ResourceManagers
+from .room_gen.room_gen import RoomGen
+from .ver import version_hash
+
+_LOGGER_ID = "logger"
+
+
+@dataclass
+class Snapshot:
+    """ the state of a `System` (without the patcher) - made after any step of generation """
+
+    version: str
+    """ snapshots can only be used with the version that made them """
+    options: Options | None
+    seed: int | str | None
+    random_state: tuple[object, ...]
+    """ `System`'s random generator """
+    global_random_state: tuple[object, ...]
+    """ the `random` module (used by room gen and fill) """
+    base: Base | None
+    room_gen: RoomGen | None
+    modified_rooms: frozenset[int]
+    resource_managers: ResourceManagers
+    randomizer: Randomizer | None
+    spoiler: list[str | SphereSpoiler]
+
+
+class _Pickler(pickle.Pickler):
+    """ the logger isn't saved - it's replaced with the logger of the `System` that loads the snapshot """
+
+    def persistent_id(self, obj: object) -> str | None:  # noqa: PLR6301
+        if isinstance(obj, Logger):
+            return _LOGGER_ID
+        return None
+
+
+class _Unpickler(pickle.Unpickler):  # noqa: S301
+    _logger: Logger
+
+    def __init__(self, file: io.BytesIO, logger: Logger) -> None:
+        super().__init__(file)
+        self._logger = logger
+
+    def persistent_load(self, pid: object) -> Logger:
+        if pid != _LOGGER_ID:
+            raise pickle.UnpicklingError(f"unknown persistent id {pid}")
+        return self._logger
+
+
+def dump_snapshot(snapshot: Snapshot) -> bytes:
+    """ compressed binary """
+    file = io.BytesIO()
+    _Pickler(file, pickle.HIGHEST_PROTOCOL).dump(snapshot)
+    return zlib.compress(file.getvalue(), 6)
+
+
+def load_snapshot(data: bytes, logger: Logger) -> Snapshot:
+    """
+    `logger` - for the loaded objects to log to
+
+    Only load snapshots from a trusted source (this is pickle).
+
+    raises `ValueError` for data that isn't a snapshot from this version
+    """
+    try:
+        snapshot = _Unpickler(io.BytesIO(zlib.decompress(data)), logger).load()
+    except (zlib.error, pickle.UnpicklingError, EOFError) as e:
+        raise ValueError("invalid snapshot data") from e
+    if not isinstance(snapshot, Snapshot):
+        raise ValueError(f"invalid snapshot data: {type(snapshot)}")  # noqa: TRY004
+    if snapshot.version != version_hash:
+        raise ValueError(f"snapshot from different version {snapshot.version} - this version {version_hash}")
+    return snapshot
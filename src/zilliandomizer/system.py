@@ -1,25 +1,37 @@
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import itertools
 from random import Random
+import random
 
 from .alarms import Alarms
 from .game import Game
 from .logger import Logger
 from .map_gen.base import Base
-from .map_gen.base_maker import Node, get_paperclip_base, get_red_base
-from .map_gen.door_manager import DoorManager
+from .map_gen.base_maker import Node
 from .map_gen.jump import room_jump_requirements
-from .map_gen.map_data import pc_no_doors
-from .map_gen.room_data_maker import make_room_gen_data
-from .map_gen.split_maker import choose_splits, split_edges
+from .map_gen.layout import MapLayout, make_layout_with
+from .map_gen.split_maker import split_edges
 from .options import Chars, Options, chars
 from .patch import Patcher
 from .randomizer import Randomizer
 from .resource_managers import ResourceManagers
-from .room_gen.common import RoomData
 from .room_gen.data import GEN_ROOMS
 from .room_gen.room_gen import RoomGen
+from .room_gen.templates import TemplateLibrary
+from .snapshot import Snapshot, dump_snapshot, load_snapshot
+from .ver import version_hash
 
 
-_MapData = tuple[Base, dict[int, RoomData]]
+@dataclass
+class FillVariant:
+    """ one of the fills from `System.fill_variants` """
+
+    sub_seed: int | str
+    game: Game
+    logger: Logger
+    """ spoiler for this fill (including the map) """
 
 
 class System:
@@ -60,7 +72,6 @@ class System:
         self._random.seed(seed)
 
         # TODO: remove this when determinism is well tested without it
-        import random
         random.seed(seed)
 
     def make_patcher(self, path_to_rom: str = "") -> Patcher:
@@ -72,30 +83,33 @@ class System:
         self.randomizer = Randomizer(self._options, self._room_gen, self._base, self._logger)
         return self.randomizer
 
-    def make_map(self) -> None:
-        assert self._options, "must `set_options` first"
-        if self._options.map_gen == "full":
-
-            def try_base_and_room_gen_data() -> _MapData | None:
-                dm = DoorManager()
-                red_base = get_red_base(dm, self._random.randrange(1999999999))
-                pc_base = get_paperclip_base(dm, self._random.randrange(1999999999))
-                pc_splits = choose_splits(pc_base, pc_no_doors, Node(0, 0))
-                base = Base(red_base, pc_base, dm, pc_splits)
-                room_gen_data = make_room_gen_data(base)
-
-                try:
-                    dm.get_writes()
-                except OverflowError:
-                    self._logger.debug("door data overflow")
-                    return None
+    def make_map(self,
+                 layout: MapLayout | None = None,
+                 library: TemplateLibrary | None = None,
+                 mutations: int = 0) -> None:
+        """
+        `layout` - from `make_layout` (or `make_layouts`) with the seed given to `seed`,
+        for "full" map_gen, instead of making it here (the result is the same)
 
-                return base, room_gen_data
+        `library` - for "rooms" map_gen, take the room terrain from this
+        (made with `room_gen.build_library` from `GEN_ROOMS`), instead of making new terrain
 
-            result: _MapData | None = None
-            while result is None:
-                result = try_base_and_room_gen_data()
-            base, room_gen_data = result
+        `mutations` - how many random changes to make to each room from `library`
+        """
+        assert self._options, "must `set_options` first"
+        if self._options.map_gen == "full":
+            if layout is None:
+                layout = make_layout_with(self._random)
+            else:
+                assert layout.seed == self._seed and layout.random_state, f"layout for different seed {layout.seed}"
+                assert self._random.getstate() == Random(self._seed).getstate(), \
+                    "layout must be used right after `seed`"
+                self._random.setstate(layout.random_state)
+            base = layout.base
+            room_gen_data = layout.room_gen_data
+            self._logger.debug(f"red base: {layout.red_stats}")
+            self._logger.debug(f"paperclip base: {layout.pc_stats}")
+            self._logger.debug(f"door data: {layout.overflow_stats}")
 
             self._base = base
             self._logger.spoil(base.red.map_str())
@@ -116,19 +130,29 @@ class System:
             rm = self.resource_managers
             jump_req_rooms = room_jump_requirements()
             rm.aem.room_gen_mods()
-            self._room_gen = RoomGen(rm.tm, rm.sm, rm.aem, self._logger, self._options.skill, room_gen_data)
+            self._room_gen = RoomGen(
+                rm.tm, rm.sm, rm.aem, self._logger, self._options.skill, room_gen_data,
+                library if self._options.map_gen == "rooms" else None, mutations
+            )
             self._room_gen.generate_all(jump_req_rooms)
             self._modified_rooms = self._room_gen.get_modified_rooms()
             if self._base:
                 self._base.pudding_cans = self._room_gen.pudding_cans
             print("Zillion room gen complete")
 
-    def post_fill(self) -> None:
+    def post_fill(self, global_alarms: bool = False) -> None:
+        """
+        `global_alarms` - choose alarms with `Alarms.choose_all_global` instead of `Alarms.choose_all`
+        (raises `OverflowError` if the alarm rooms don't fit even without alarms)
+        """
         assert self.randomizer, "initialization step was skipped"
         options = self.randomizer.options
         if options.randomize_alarms:
             a = Alarms(self.resource_managers.tm, self.randomizer.logger)
-            a.choose_all(self._modified_rooms)
+            if global_alarms:
+                a.choose_all_global(self._modified_rooms)
+            else:
+                a.choose_all(self._modified_rooms)
 
         def choose_escape_time(skill: int, path_through_red: float, path_through_paperclip: float) -> int:
             """
@@ -170,6 +194,62 @@ class System:
 
         self.resource_managers.char_order = choose_capture_order(options.start_char)
 
+    def snapshot(self) -> bytes:
+        """
+        everything needed to continue generating from here (except the patcher)
+
+        can be made after any step - expected use is after `make_map`
+        """
+        return dump_snapshot(Snapshot(
+            version_hash,
+            self._options,
+            self._seed,
+            self._random.getstate(),
+            random.getstate(),
+            self._base,
+            self._room_gen,
+            self._modified_rooms,
+            self.resource_managers,
+            self.randomizer,
+            self._logger.save_spoiler()
+        ))
+
+    def resume(self, snapshot: bytes) -> None:
+        """
+        continue from the step where `snapshot` was made (instead of doing the steps before it)
+
+        This replaces the spoiler in the logger with the spoiler from the snapshot.
+        """
+        loaded = load_snapshot(snapshot, self._logger)
+        self._options = loaded.options
+        self._seed = loaded.seed
+        self._random.setstate(loaded.random_state)
+        random.setstate(loaded.global_random_state)
+        self._base = loaded.base
+        self._room_gen = loaded.room_gen
+        self._modified_rooms = loaded.modified_rooms
+        self.resource_managers = loaded.resource_managers
+        self.randomizer = loaded.randomizer
+        self._logger.load_spoiler(loaded.spoiler)
+
+    def fill_variants(self,
+                      sub_seeds: Iterable[int | str],
+                      max_workers: int | None = None) -> list[FillVariant]:
+        """
+        after `make_map` - a different fill of this same map for each sub-seed
+        (`make_randomizer`, `roll`, `post_fill`, `get_game`), in a process pool
+
+        This `System` isn't changed.
+        Results are in the same order as `sub_seeds`.
+
+        `max_workers` `1` fills in this process, without a pool
+        """
+        snapshot = self.snapshot()
+        if max_workers == 1:
+            return [_fill_variant(snapshot, sub_seed) for sub_seed in sub_seeds]
+        with ProcessPoolExecutor(max_workers) as executor:
+            return list(executor.map(_fill_variant, itertools.repeat(snapshot), sub_seeds))
+
     def get_game(self) -> Game:
         assert self.randomizer, "initialization step was skipped"
         rm = self.resource_managers
@@ -193,16 +273,27 @@ class System:
     def _get_path_through_red(self) -> int:
         """ fastest possible is 5, vanilla is 7 """
         if self._base:
-            top = self._base.red.path(Node(0, 3), Node(1, 0))
-            mid = self._base.red.path(Node(0, 3), Node(3, 0))
-            bot = self._base.red.path(Node(0, 3), Node(4, 0))
-            return min(len(top), len(mid) + 1, len(bot) + 1)
+            top = self._base.red.path_length(Node(0, 3), Node(1, 0))
+            mid = self._base.red.path_length(Node(0, 3), Node(3, 0))
+            bot = self._base.red.path_length(Node(0, 3), Node(4, 0))
+            return min(top, mid + 1, bot + 1)
         return 7  # vanilla
 
     def _get_path_through_paperclip(self) -> int:
         """ fastest possible is 10, vanilla is 12 """
         if self._base:
-            with_one_way = len(self._base.paperclip.path(Node(3, 7), Node(4, 1))) + 4
-            without_one_way = len(self._base.paperclip.path(Node(3, 7), Node(1, 0)))
+            with_one_way = self._base.paperclip.path_length(Node(3, 7), Node(4, 1)) + 4
+            without_one_way = self._base.paperclip.path_length(Node(3, 7), Node(1, 0))
             return min(with_one_way, without_one_way)
         return 12  # vanilla
+
+
+def _fill_variant(snapshot: bytes, sub_seed: int | str) -> FillVariant:
+    logger = Logger()
+    system = System(logger)
+    system.resume(snapshot)
+    system.seed(sub_seed)
+    logger.spoil(f"fill variant {sub_seed}")
+    system.make_randomizer().roll()
+    system.post_fill()
+    return FillVariant(sub_seed, system.get_game(), logger)
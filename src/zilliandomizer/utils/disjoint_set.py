@@ -25,3 +25,39 @@ class DisjointSet(Generic[_T]):
         parent_b = self.find(b)
         if parent_a != parent_b:
             self._parents[parent_a] = parent_b
+
+
+class ArrayDisjointSet:
+    """ `DisjointSet` of the ints `0` to `size - 1`, with union by rank """
+
+    _parents: list[int]
+    _ranks: list[int]
+
+    def __init__(self, size: int) -> None:
+        self._parents = list(range(size))
+        self._ranks = [0] * size
+
+    def find(self, item: int) -> int:
+        """ returns the root item associated with `item` """
+        parents = self._parents
+        while item != parents[item]:
+            parents[item] = parents[parents[item]]
+            item = parents[item]
+        return item
+
+    def union(self, a: int, b: int) -> bool:
+        """ merge `a` and `b` into 1 set - returns `False` if they were already in the same set """
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return False
+        rank_a = self._ranks[root_a]
+        rank_b = self._ranks[root_b]
+        if rank_a < rank_b:
+            self._parents[root_a] = root_b
+        elif rank_a > rank_b:
+            self._parents[root_b] = root_a
+        else:
+            self._parents[root_b] = root_a
+            self._ranks[root_a] = rank_a + 1
+        return True
@@ -1,8 +1,10 @@
-from collections.abc import Collection, Iterable
+from collections import defaultdict
+from collections.abc import Collection, Iterable, Sequence
 from dataclasses import dataclass
+from functools import lru_cache
 import time
 
-from zilliandomizer.utils import parse_loc_name
+from zilliandomizer.utils import make_room_name, parse_loc_name
 
 
 @dataclass(frozen=True)
@@ -10,6 +12,7 @@ class LocCoords:
     name: str
     y: int
     x: int
+    map_index: int
 
 
 _x_names = {
@@ -31,11 +34,106 @@ def all_locations_in_room() -> Iterable[str]:
             yield v + h
 
 
+_loc_coords: dict[str, LocCoords] = {}
+""" parsed location names - filled when they're first needed """
+
+
+def loc_coords(loc_name: str) -> LocCoords:
+    tr = _loc_coords.get(loc_name)
+    if tr is None:
+        row, col, y, x = parse_loc_name(loc_name)
+        tr = LocCoords(loc_name, y, x, row * 8 + col)
+        _loc_coords[loc_name] = tr
+    return tr
+
+
+def pretty_names(loc_names: Iterable[str]) -> dict[str, str]:
+    """
+    map of canister location names (not "main") to pretty names like "B-7 top left"
+
+    Each room is matched the first time its set of locations is seen,
+    and looked up in a table after that.
+    """
+    room_2_locs: dict[int, list[str]] = defaultdict(list)
+    for loc_name in loc_names:
+        room_2_locs[loc_coords(loc_name).map_index].append(loc_name)
+
+    tr: dict[str, str] = {}
+    for map_index, room_locs in room_2_locs.items():
+        tr.update(_room_pretty_names(map_index, frozenset(room_locs)))
+    return tr
+
+
+@lru_cache(maxsize=4096)  # room gen can make new sets of locations indefinitely
+def _room_pretty_names(map_index: int, locs: frozenset[str]) -> dict[str, str]:
+    """ don't modify the returned dict - it's in the table """
+    from zilliandomizer.utils.loc_name_maps import loc_to_id
+
+    room_name = make_room_name(map_index // 8, map_index & 7)
+    tr: dict[str, str] = {}
+    for loc_name, pretty_in_room in _loc_name_maker(locs).items():
+        pretty_name = f"{room_name} {pretty_in_room}"
+        assert pretty_name in loc_to_id, f"{pretty_name} not in pre-made pretty names"
+        tr[loc_name] = pretty_name
+    return tr
+
+
+_x_penalties = [0x0b if i in {2, 4} else 0 for i in range(len(_x_list))]  # tunable magic number
+""" a penalty for using the names that aren't as pretty """
+
+
+def _distances(lc: LocCoords) -> list[int]:
+    """ effective distance from `x` component of `lc` to each of `_x_list` """
+    return [abs(lc.x - x) + penalty for x, penalty in zip(_x_list, _x_penalties, strict=True)]
+
+
+def shortest_pairs(lcs: Sequence[LocCoords]) -> list[int]:
+    """
+    indexes to `_x_list` for `lcs` (sorted by x) - increasing, with the lowest total distance
+
+    If there's a tie, the first in lexicographic order.
+    If there are more `lcs` than `_x_list`, returns empty.
+    """
+    lc_count = len(lcs)
+    x_count = len(_x_list)
+    if lc_count > x_count:
+        return []
+    if lc_count == x_count:
+        return list(range(x_count))
+    impossible = 0x10000
+    distances = [_distances(lc) for lc in lcs]
+    # lowest[k][i] - lowest total distance for `lcs[k:]` using only `_x_list[i:]`
+    lowest = [[impossible] * (x_count + 1) for _ in range(lc_count)]
+    lowest.append([0] * (x_count + 1))
+    for k in range(lc_count - 1, -1, -1):
+        here_row = lowest[k]
+        after_row = lowest[k + 1]
+        here_distances = distances[k]
+        # only the indexes that leave enough room for the others
+        for i in range(x_count - lc_count + k, k - 1, -1):
+            here_row[i] = min(here_distances[i] + after_row[i + 1], here_row[i + 1])
+
+    tr: list[int] = []
+    i = 0
+    for k in range(lc_count):
+        while distances[k][i] + lowest[k + 1][i + 1] != lowest[k][i]:
+            i += 1
+        tr.append(i)
+        i += 1
+    return tr
+
+
 def loc_name_maker(locs: Collection[str]) -> dict[str, str]:
     """
     takes a collection of the location names of canisters in 1 room
     and returns a map of those names to descriptions of where in the room they are
     """
+    return dict(_loc_name_maker(frozenset(locs)))
+
+
+@lru_cache(maxsize=4096)
+def _loc_name_maker(locs: frozenset[str]) -> dict[str, str]:
+    """ don't modify the returned dict - it's in the cache """
     top: list[LocCoords] = []
     tmd: list[LocCoords] = []
     mid: list[LocCoords] = []
@@ -43,8 +141,7 @@ def loc_name_maker(locs: Collection[str]) -> dict[str, str]:
     bot: list[LocCoords] = []
 
     for loc in locs:
-        _, _, y, x = parse_loc_name(loc)
-        this = LocCoords(loc, y, x)
+        this = loc_coords(loc)
         if this.y <= 0x18:
             top.append(this)
         elif this.y >= 0x98:
@@ -68,47 +165,14 @@ def loc_name_maker(locs: Collection[str]) -> dict[str, str]:
 
     # now all of the locations are in top, mid, or bot
 
-    top.sort(key=lambda lc: lc.x)
-    mid.sort(key=lambda lc: lc.x)
-    bot.sort(key=lambda lc: lc.x)
-
-    def distance(lc: LocCoords, i: int) -> int:
-        """ effective distance from `x` component of `lc` to `_x_list[i]` """
-        d = abs(lc.x - _x_list[i])
-        # a penalty for using the names that aren't as pretty
-        if i in {2, 4}:
-            d += 0x0b  # tunable magic number
-        return d
-
-    def shortest_pairs(lcs: list[LocCoords], from_index: int = 0) -> tuple[list[int], int]:
-        """ returns indexes to _x_list, and the total distance """
-        if len(lcs) == 0:
-            return [], 2000
-        if len(lcs) == 1:
-            lowest_d = distance(lcs[0], from_index)
-            lowest_i = from_index
-            for i in range(from_index + 1, len(_x_list)):
-                here = distance(lcs[0], i)
-                if here < lowest_d:
-                    lowest_d = here
-                    lowest_i = i
-            return [lowest_i], lowest_d
-        else:  # len > 1
-            after = lcs[1:]
-            lowest_l = []
-            lowest_d = 2000
-            for i in range(from_index, len(_x_list) - len(after)):
-                after_l, after_d = shortest_pairs(after, i + 1)
-                here_d = distance(lcs[0], i)
-                total_d = here_d + after_d
-                if total_d < lowest_d:
-                    lowest_l = [i, *after_l]
-                    lowest_d = total_d
-            return lowest_l, lowest_d
-
-    top_i, _ = shortest_pairs(top)
-    mid_i, _ = shortest_pairs(mid)
-    bot_i, _ = shortest_pairs(bot)
+    # y to make the order not depend on the order of `locs`
+    top.sort(key=lambda lc: (lc.x, lc.y))
+    mid.sort(key=lambda lc: (lc.x, lc.y))
+    bot.sort(key=lambda lc: (lc.x, lc.y))
+
+    top_i = shortest_pairs(top)
+    mid_i = shortest_pairs(mid)
+    bot_i = shortest_pairs(bot)
 
     tr: dict[str, str] = {}
 
@@ -162,6 +226,31 @@ def test() -> None:
     ]))
 
 
+def benchmark() -> None:
+    """ the worst case for matching is 3 to 5 canisters on each level """
+    xs = range(0x10, 0xe1, 0x10)
+    for per_level in (3, 4, 5):
+        rooms: list[frozenset[str]] = []
+        for row in range(1, 17):
+            for col in range(8):
+                room_name = f"r{row:02}c{col}"
+                # different x positions for each room
+                chosen = [x for i, x in enumerate(xs) if (i * 5 + row + col) % 14 < per_level]
+                rooms.append(frozenset(f"{room_name}y{y:02x}x{x:02x}" for y in (0x18, 0x58, 0x98) for x in chosen))
+        start = time.time()
+        for _ in range(20):
+            for room in rooms:
+                _loc_name_maker.__wrapped__(room)
+        stop = time.time()
+        print(f"{per_level} per level, {len(rooms)} rooms x 20, not cached: {stop - start:.4f} s")
+        start = time.time()
+        for _ in range(20):
+            for room in rooms:
+                loc_name_maker(room)
+        stop = time.time()
+        print(f"{per_level} per level, {len(rooms)} rooms x 20, cached: {stop - start:.4f} s")
+
+
 if __name__ == "__main__":
     print_saved = print
     # print = lambda x: None
@@ -170,3 +259,4 @@ if __name__ == "__main__":
         test()
     stop = time.time()
     print_saved(stop - start)
+    benchmark()
@@ -0,0 +1,131 @@
+import random
+
+import pytest
+
+from zilliandomizer.alarm_data import ALARM_ROOMS, alarm_data, alarm_tables
+from zilliandomizer.alarms import Alarms
+from zilliandomizer.logger import Logger
+from zilliandomizer.low_resources.terrain_compressor import TerrainCompressor
+from zilliandomizer.low_resources.terrain_mods import terrain_mods
+from zilliandomizer.terrain_modifier import TerrainModifier
+
+
+def test_compressed_size() -> None:
+    for compressed in terrain_mods.values():
+        bytes_ = TerrainCompressor.decompress(compressed)
+        assert TerrainCompressor.compressed_size(bytes_) == len(TerrainCompressor.compress(bytes_))
+    r = random.Random(3)
+    for _ in range(500):
+        bytes_ = [r.choice((0x10, 0x11, 0x12)) for _ in range(96)]
+        assert TerrainCompressor.compressed_size(bytes_) == len(TerrainCompressor.compress(bytes_))
+
+
+def test_room_size() -> None:
+    tc = TerrainModifier()
+    alarms = Alarms(tc, Logger())
+    random.seed(9)
+    for map_index, table in alarm_tables.items():
+        bytes_ = TerrainCompressor.decompress(tc.get_room(map_index))
+        for _ in range(10):
+            alarm_blocks = Alarms._gather_blocks(map_index, bytes_)  # pyright: ignore[reportPrivateUsage]
+            chosen = random.randrange(table.all_mask + 1)
+            with_alarms = bytes_.copy()
+            blocks = Alarms._blocks_for(table, alarm_blocks, chosen)  # pyright: ignore[reportPrivateUsage]
+            Alarms.add_alarms_to_room_terrain_bytes(with_alarms, blocks)
+            compressed = TerrainCompressor.compress(with_alarms)
+            assert Alarms.room_size(bytes_, table, alarm_blocks, chosen) == len(compressed)
+            assert Alarms.room_size(bytes_, table, alarm_blocks, 0) == alarms.empty_size(map_index)
+
+
+def test_table_blocks() -> None:
+    """ the same blocks as `block_iter` from the same random state """
+    tc = TerrainModifier()
+    for map_index, room in alarm_data.items():
+        table = alarm_tables[map_index]
+        bytes_ = TerrainCompressor.decompress(tc.get_room(map_index))
+        for seed in range(10):
+            chosen_ids = {a.id for i, a in enumerate(room) if (seed >> (i % 4)) & 1}
+            random.seed(seed)
+            blocks: dict[int, str] = {}
+            for a in room:
+                for block_index, erase in a.block_iter():
+                    if a.id in chosen_ids and not erase:
+                        blocks[block_index] = "v" if a.vertical else "h"
+                    elif block_index not in blocks:
+                        blocks[block_index] = "n"
+            random.seed(seed)
+            alarm_blocks = Alarms._gather_blocks(map_index, bytes_)  # pyright: ignore[reportPrivateUsage]
+            chosen = sum(1 << i for i, a_id in enumerate(table.ids) if a_id in chosen_ids)
+            assert Alarms._blocks_for(table, alarm_blocks, chosen) == blocks  # pyright: ignore[reportPrivateUsage]
+            assert table.ids_of(chosen) == chosen_ids
+
+
+def test_weighted_choice() -> None:
+    """ the same choice as `random.choice` from a list with the extra chances """
+    r = random.Random(4)
+    for table in alarm_tables.values():
+        for _ in range(20):
+            eliminated = r.randrange(table.all_mask)  # not all eliminated
+            lessened = r.randrange(table.all_mask + 1)
+            extra_vertical = r.random() < 0.5
+            choices = [i for i in range(len(table.alarms)) if not (eliminated >> i) & 1]
+            for i in choices.copy():
+                if not (lessened >> i) & 1:
+                    choices.append(i)
+                    if extra_vertical or not table.alarms[i].vertical:
+                        choices.append(i)
+            random.seed(r.random())
+            state = random.getstate()
+            expected = random.choice(choices)
+            random.setstate(state)
+            assert table.weighted_choice(eliminated, lessened, extra_vertical) == expected
+
+
+def test_low_space() -> None:
+    """ stays in the byte limit without retrying, even if there's not enough space for the vanilla alarms """
+    for space in (-50, 0, 30):
+        for seed in range(5):
+            tc = TerrainModifier()
+            tc._size += tc.get_space() - space  # pyright: ignore[reportPrivateUsage]
+            random.seed(seed)
+            logger = Logger()
+            logger.spoil_stdout = False
+            Alarms(tc, logger).choose_all(frozenset())
+            assert logger.spoiler_lines.count("choosing alarm lines...") == 1
+            assert tc.get_space() >= 0
+            assert sum(line.startswith("room: ") for line in logger.spoiler_lines) == len([
+                map_index for map_index in ALARM_ROOMS if map_index in alarm_data
+            ])
+
+
+def test_global() -> None:
+    def alarm_count(logger: Logger) -> int:
+        return sum(line.count("'") // 2 for line in logger.spoiler_lines if line.startswith("room: "))
+
+    for space in (0, 77):
+        counts: dict[str, int] = {"paced": 0, "global": 0}
+        for seed in range(30):
+            for mode in counts:
+                tc = TerrainModifier()
+                tc._size += tc.get_space() - space  # pyright: ignore[reportPrivateUsage]
+                random.seed(seed)
+                logger = Logger()
+                logger.spoil_stdout = False
+                alarms = Alarms(tc, logger)
+                if mode == "global":
+                    alarms.choose_all_global(frozenset())
+                else:
+                    alarms.choose_all(frozenset())
+                assert tc.get_space() >= 0
+                counts[mode] += alarm_count(logger)
+        assert abs(counts["paced"] - counts["global"]) < 0.05 * counts["paced"], f"{space=} {counts=}"
+
+    tc = TerrainModifier()
+    tc._size += tc.get_space() + 200  # pyright: ignore[reportPrivateUsage]
+    rooms_before = [tc.get_room(map_index) for map_index in ALARM_ROOMS]
+    space_before = tc.get_space()
+    with pytest.raises(OverflowError):
+        Alarms(tc, Logger()).choose_all_global(frozenset())
+    # terrain not changed
+    assert [tc.get_room(map_index) for map_index in ALARM_ROOMS] == rooms_before
+    assert tc.get_space() == space_before
@@ -1,3 +1,4 @@
+from collections import deque
 from pathlib import Path
 import random
 import sys
@@ -78,6 +79,127 @@ def test_choose_splits() -> None:
     print(bm.map_str(1, splits, split_edges))
 
 
+def test_tree_index() -> None:
+    """ compare with searching """
+    from zilliandomizer.map_gen.base_maker import BaseMaker, Node, get_paperclip_base, get_red_base, red_inputs
+    from zilliandomizer.map_gen.door_manager import DoorManager
+
+    def search_paths(bm: BaseMaker, fro: Node) -> dict[Node, list[Node]]:
+        """ breadth first search for paths to everything from `fro` """
+        paths = {fro: [fro]}
+        queue = deque((fro,))
+        while queue:
+            here = queue.popleft()
+            for adj in bm.adjs(here):
+                if adj not in paths:
+                    paths[adj] = [*paths[here], adj]
+                    queue.append(adj)
+        return paths
+
+    for seed in range(3):
+        for bm in (get_red_base(DoorManager(), seed), get_paperclip_base(DoorManager(), seed)):
+            tree = bm.tree()
+            nodes = [Node(y, x) for y in range(bm.height) for x in range(bm.width)]
+            for fro in nodes[::2]:
+                paths = search_paths(bm, fro)
+                for to in nodes:
+                    path = paths[to]
+                    assert list(bm.path(fro, to)) == path
+                    assert bm.path_length(fro, to) == len(path)
+                    assert tree.next_on_path(fro, to) == (path[1] if len(path) > 1 else None)
+                    for node in nodes[::5]:
+                        assert tree.on_path(node, fro, to) == (node in path)
+                        meeting = tree.meeting(fro, to, node)
+                        assert meeting in path and meeting in paths[node]
+
+    # forest before `make`
+    possible, existing = red_inputs()
+    bm = BaseMaker(5, 3, 5, 5, 0, possible, existing, DoorManager(), None)
+    assert bm.path(Node(0, 0), Node(4, 4)) == [Node(0, 0)]
+    assert bm.path_length(Node(0, 2), Node(0, 4)) == 3
+    bm.make()
+    assert bm.path_length(Node(0, 0), Node(4, 4)) > 1
+
+
+def test_edge_facade() -> None:
+    from zilliandomizer.map_gen.base_maker import BaseMaker, Node, paperclip_inputs
+    from zilliandomizer.map_gen.door_manager import DoorManager
+
+    possible, existing = paperclip_inputs()
+    bm = BaseMaker(10, 0, 7, 8, 0x39, possible, existing, DoorManager(), 3)
+    assert set(bm.existing_edges) == set(existing)
+    assert set(bm.original_possible_edges) == set(possible)
+    edges = bm.make()
+    assert len(bm.possible_edges) == 0
+    assert set(existing) <= set(edges)
+    assert set(edges) - set(existing) <= set(possible)
+    # spanning tree of the nodes that can have connections
+    nodes = {node for edge in edges for node in edge}
+    assert len(edges) == len(nodes) - 1
+    for node in nodes:
+        for adj in bm.adjs(node):
+            assert frozenset((node, adj)) in edges
+    assert sum(len(list(bm.adjs(node))) for node in nodes) == 2 * len(edges)
+    assert Node(0, 0) in nodes
+
+
+def test_rejection_stats() -> None:
+    from zilliandomizer.map_gen.base_maker import (
+        BaseMaker, Node, RejectionStats, get_paperclip_base, get_red_base, red_inputs
+    )
+    from zilliandomizer.map_gen.door_manager import DoorManager
+
+    red_stats = RejectionStats()
+    pc_stats = RejectionStats()
+    for seed in range(200):
+        bm = get_red_base(DoorManager(), seed, red_stats)
+        assert bm.fork_altitude(Node(0, 3), (Node(1, 0), Node(3, 0), Node(4, 0))) > 0
+        assert len(list(bm.adjs(Node(2, 4)))) >= 2
+        get_paperclip_base(DoorManager(), seed, pc_stats)
+    print(f"red: {red_stats}")
+    print(f"paperclip: {pc_stats}")
+    assert red_stats.accepted == 200
+    assert red_stats.early > red_stats.late
+    assert pc_stats.accepted == 200
+    assert pc_stats.attempts <= 600
+
+    # make stops when the check fails
+    possible, existing = red_inputs()
+    bm = BaseMaker(5, 3, 5, 5, 0, possible, existing, DoorManager(), 1)
+    try:
+        bm.make(lambda: True)
+    except BaseMaker.Rejected:
+        pass
+    else:
+        raise AssertionError("not rejected")
+    assert len(bm.existing_edges) == len(existing) + 1
+
+
+def test_walk() -> None:
+    from zilliandomizer.map_gen.base_maker import Node, get_paperclip_base, get_red_base
+    from zilliandomizer.map_gen.door_manager import DoorManager
+
+    for seed in range(20):
+        for bm, start in ((get_red_base(DoorManager(), seed), Node(0, 3)),
+                          (get_paperclip_base(DoorManager(), seed), Node(0, 0))):
+            expected: list[tuple[Node, Node | None]] = []
+            parents: dict[Node, Node | None] = {start: None}
+            q = deque([start])
+            while len(q):
+                here = q.popleft()
+                expected.append((here, parents[here]))
+                for adj in bm.adjs(here):
+                    if adj not in parents:
+                        parents[adj] = here
+                        q.append(adj)
+            walk = bm.walk(start)
+            assert list(walk) == expected
+            assert bm.walk(start) is walk
+            tree = bm.tree()
+            for node, parent in walk[1:]:
+                assert tree.next_on_path(node, start) == parent
+
+
 if __name__ == "__main__":
     sys.path.append(str((Path(__file__) / ".." / ".." / "src").resolve()))
     test_no_changes()
@@ -85,3 +207,7 @@ if __name__ == "__main__":
     test_make_paperclip()
     test_choose_splits()
     test_vanilla_path_rate()
+    test_tree_index()
+    test_edge_facade()
+    test_rejection_stats()
+    test_walk()
@@ -0,0 +1,46 @@
+import json
+
+from zilliandomizer.checker import check_game, check_games
+from zilliandomizer.game import Game
+from zilliandomizer.logic_components.items import MAIN
+from zilliandomizer.logic_components.locations import Req
+from zilliandomizer.options import Options
+from zilliandomizer.randomizer import Randomizer
+from zilliandomizer.resource_managers import ResourceManagers
+
+
+def test_req_json() -> None:
+    r = Req(gun=2, jump=1, char=("Apple", "Champ"), union=(Req(red=1), Req(hp=100, door=3)))
+    r_after = Req.from_jsonable(json.loads(json.dumps(r.to_jsonable())))
+    assert r_after.gun == 2
+    assert r_after.char == ("Apple", "Champ")
+    assert r_after.union is not None
+    assert len(r_after.union) == 2
+    assert r_after.union[1].door == 3
+    assert r_after.to_jsonable() == r.to_jsonable()
+    assert Req().to_jsonable() == {}
+
+
+def test_check_game() -> None:
+    o = Options()
+    rm = ResourceManagers()
+    r = Randomizer(o, None, None)
+    r.roll()
+    game = Game(o, rm.escape_time, rm.char_order, r.loc_name_2_pretty, r.get_region_data(), rm.get_writes())
+
+    jsonable = json.loads(json.dumps(game.to_jsonable()))
+    result = check_game(jsonable)
+    assert result.beatable
+    assert result.location_count == sum(len(rd.locations) for rd in game.regions)
+    assert len(result.spheres) > 1
+
+    # remove the main computer from the logic
+    for rd in game.regions:
+        rd.locations = [ld for ld in rd.locations if ld.item.code != MAIN]
+    results = check_games([game, jsonable], max_workers=1)
+    assert [res.beatable for res in results] == [False, True]
+
+
+if __name__ == "__main__":
+    test_req_json()
+    test_check_game()
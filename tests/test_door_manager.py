@@ -20,3 +20,36 @@ def test_no_changes() -> None:
             for line_no in range(line_before, line_before + 3 * 16, 16):
                 print(list(new_rom[line_no:line_no + 16]))
             assert equal, f"a {hex(a)}  r {hex(p.rom[a])}  v {hex(v)}"
+
+
+def test_byte_count() -> None:
+    from zilliandomizer.map_gen.door_manager import ROOM_COUNT
+
+    dm = DoorManager()
+    assert not dm.overflowed
+    # 2 bytes of pointer for each room
+    assert dm.byte_count == len(DoorManager().get_writes()) - 2 * ROOM_COUNT
+
+    dm.del_room(0x39)
+    dm.del_room(0x44)
+    dm.add_door(0x44, 4, 0x10, 0x44)
+    dm.add_elevator(0x52, 5, 0x40, 0x44)
+    dm.add_door(0x60, 0, 0x20, 0x60)
+    assert not dm.overflowed
+    assert dm.byte_count == len(dm.get_writes()) - 2 * ROOM_COUNT
+
+    dm = DoorManager()
+    added = 0
+    while not dm.overflowed:
+        dm.add_door(0x60 + (added % 8), 0, 0x20, 0x60 + (added % 8))
+        added += 1
+    with pytest.raises(OverflowError):
+        dm.get_writes()
+
+    dm = DoorManager()
+    dm.stop_at_overflow()
+    for i in range(added - 1):
+        dm.add_door(0x60 + (i % 8), 0, 0x20, 0x60 + (i % 8))
+    last = added - 1
+    with pytest.raises(OverflowError):
+        dm.add_door(0x60 + (last % 8), 0, 0x20, 0x60 + (last % 8))
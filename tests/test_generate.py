@@ -54,8 +54,7 @@ def test_with_room_gen() -> None:
     p.write(os.devnull)
 
 
-@pytest.mark.usefixtures("fake_rom")
-def test_with_map_gen() -> None:
+def _map_gen(global_alarms: bool) -> None:
     system = System()
     options: Options = some_options
     options.map_gen = "full"
@@ -67,7 +66,7 @@ def test_with_map_gen() -> None:
 
     r.roll()
 
-    system.post_fill()
+    system.post_fill(global_alarms=global_alarms)
 
     game = system.get_game()
 
@@ -78,6 +77,16 @@ def test_with_map_gen() -> None:
     p.write(os.devnull)
 
 
+@pytest.mark.usefixtures("fake_rom")
+def test_with_map_gen() -> None:
+    _map_gen(global_alarms=False)
+
+
+@pytest.mark.usefixtures("fake_rom")
+def test_with_map_gen_global_alarms() -> None:
+    _map_gen(global_alarms=True)
+
+
 @pytest.mark.usefixtures("fake_rom", "no_options_file")
 def test_default_options() -> None:
     generate(0x42069428)
@@ -0,0 +1,60 @@
+from importlib.metadata import PackageNotFoundError, version
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+import zilliandomizer
+
+LIGHT_MODULES = ("zilliandomizer.zri.memory", "zilliandomizer.options", "zilliandomizer.utils.loc_name_matcher")
+""" things that a client might import without generating anything """
+
+BIG_DATA = (
+    "zilliandomizer.utils.verified",
+    "zilliandomizer.utils.loc_name_maps",
+    "zilliandomizer.low_resources.terrain_mods",
+    "zilliandomizer.low_resources.sprite_data",
+    "zilliandomizer.alarm_data",
+    "importlib.metadata",
+)
+
+
+def _run(args: list[str]) -> str:
+    src = str(Path(zilliandomizer.__file__).parent.parent)
+    env = dict(os.environ, PYTHONPATH=src)
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True).stderr
+
+
+def import_time(module: str) -> int:
+    """ microseconds - cumulative from `-X importtime` """
+    out = _run(["-X", "importtime", "-c", f"import {module}"])
+    for line in out.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise AssertionError(f"{module} not in import times")
+
+
+def test_light_imports() -> None:
+    for module in LIGHT_MODULES:
+        out = _run(["-c", f"import sys, {module}; print(sorted(sys.modules), file=sys.stderr)"])
+        for big in BIG_DATA:
+            assert f"'{big}'" not in out, f"{module} imports {big}"
+
+
+def test_version() -> None:
+    try:
+        installed = version("zilliandomizer")
+    except PackageNotFoundError:
+        pytest.skip("zilliandomizer is not installed")
+    assert zilliandomizer.__version__ == installed
+    # looked up only once
+    assert vars(zilliandomizer)["__version__"] == installed
+
+
+if __name__ == "__main__":
+    for module in (*LIGHT_MODULES, "zilliandomizer.system"):
+        times = sorted(import_time(module) for _ in range(5))
+        print(f"{module}: {times[2] / 1000:.1f} ms")
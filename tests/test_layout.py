@@ -0,0 +1,39 @@
+from random import Random
+
+from zilliandomizer.map_gen.layout import MapLayout, make_layout, make_layout_with, make_layouts
+
+
+def _same(a: MapLayout, b: MapLayout) -> None:
+    assert a.base.red.map_str() == b.base.red.map_str()
+    assert a.base.paperclip.map_str(1, a.base.pc_splits) == b.base.paperclip.map_str(1, b.base.pc_splits)
+    assert dict(a.base.pc_splits) == dict(b.base.pc_splits)
+    assert dict(a.base.dm.doors) == dict(b.base.dm.doors)
+    assert a.room_gen_data == b.room_gen_data
+
+
+def test_make_layout() -> None:
+    random = Random(5)
+    layout = make_layout_with(random)
+    seeded = make_layout(5)
+    _same(layout, seeded)
+    assert seeded.seed == 5
+    assert seeded.random_state == random.getstate()
+    assert not seeded.base.dm.overflowed
+    assert seeded.overflow_stats.accepted == 1
+    assert seeded.red_stats.accepted == seeded.overflow_stats.attempts
+
+
+def test_make_layouts() -> None:
+    seeds = [3, 4, 5, 6]
+    pooled = list(make_layouts(seeds, ahead=2, max_workers=2))
+    assert [layout.seed for layout in pooled] == seeds
+    for seed, layout in zip(seeds, pooled, strict=True):
+        _same(layout, make_layout(seed))
+        assert layout.random_state == make_layout(seed).random_state
+    inline = make_layouts(seeds, max_workers=1)
+    _same(next(inline), pooled[0])
+
+
+if __name__ == "__main__":
+    test_make_layout()
+    test_make_layouts()
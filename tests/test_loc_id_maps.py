@@ -1,4 +1,5 @@
 from zilliandomizer.utils.loc_name_maps import loc_to_id, id_to_loc
+from zilliandomizer.utils.loc_name_matcher import loc_name_maker
 from zilliandomizer.randomizer import Randomizer
 from zilliandomizer.generator import some_options
 
@@ -19,3 +20,17 @@ def test_with_data() -> None:
     for loc in r.loc_name_2_pretty.values():
         if loc != 'main':
             assert loc in loc_to_id
+
+
+def test_pretty_names_table() -> None:
+    r = Randomizer(some_options, None, None)
+    room_locs = [loc for loc in r.locations if loc.startswith("r07c1")]
+    in_room = loc_name_maker(room_locs)
+    for loc in room_locs:
+        assert r.loc_name_2_pretty[loc] == "G-2 " + in_room[loc]
+
+    # second reset uses the table, same result
+    before = r.loc_name_2_pretty
+    r._reset()  # pyright: ignore[reportPrivateUsage]
+    assert r.loc_name_2_pretty == before
+    assert list(r.loc_name_2_pretty) == list(before)
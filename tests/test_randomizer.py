@@ -1,5 +1,6 @@
 from collections import Counter
 from copy import deepcopy
+from io import StringIO
 from random import seed
 
 import pytest
@@ -8,9 +9,11 @@ from zilliandomizer.game import Game
 from zilliandomizer.generator import some_options
 from zilliandomizer.logger import Logger
 from zilliandomizer.logic_components.location_data import make_locations
+from zilliandomizer.logic_components.items import items
 from zilliandomizer.logic_components.locations import Req
+from zilliandomizer.logic_components.reachability import AbilityTable, Inventory
 from zilliandomizer.logic_components.region_data import make_regions
-from zilliandomizer.options import ID, Options, char_to_gun, char_to_jump
+from zilliandomizer.options import ID, VBLR_CHOICES, Chars, Options, char_to_gun, char_to_hp, char_to_jump, chars
 from zilliandomizer.options.parsing import parse_options
 from zilliandomizer.patch import Patcher
 from zilliandomizer.randomizer import Randomizer
@@ -83,6 +86,43 @@ def test_placement() -> None:
     print(f"average Apple row: {total_item_row / total_completable}")
 
 
+def test_spoiler_spheres() -> None:
+    logger = Logger()
+    r = Randomizer(some_options, None, None, logger)
+    seed(3)
+    r.roll()
+    lines = logger.spoiler_lines
+    sphere_ends = [line for line in lines if line.startswith("end of sphere: ")]
+    assert len(sphere_ends) > 1
+    assert any(line.startswith("get Main Computer from ") for line in lines)
+    file = StringIO()
+    logger.write_spoiler(file)
+    assert file.getvalue() == "".join(line + "\n" for line in lines)
+
+    # spoiler_lines is still a list that can be changed and replaced
+    lines.append("extra")
+    assert logger.spoiler_lines[-1] == "extra"
+    logger.spoiler_lines = ["replaced"]
+    assert list(logger.iter_spoiler_lines()) == ["replaced"]
+
+
+def test_spoiler_spheres_overridden_spoil() -> None:
+    class ListLogger(Logger):
+        def __init__(self) -> None:
+            super().__init__()
+            self.spoiled: list[str] = []
+
+        def spoil(self, line: str) -> None:
+            self.spoiled.append(line)
+
+    logger = ListLogger()
+    r = Randomizer(some_options, None, None, logger)
+    seed(3)
+    r.roll()
+    assert any(line.startswith("end of sphere: ") for line in logger.spoiled)
+    assert any(line.startswith("get Main Computer from ") for line in logger.spoiled)
+
+
 def test_room_door_gun_requirements() -> None:
     rn = Randomizer(some_options, None, None)
     gun_reqs = rn.room_door_gun_requirements()
@@ -187,3 +227,47 @@ def test_early_scope() -> None:
     assert success_count > 17
 
     # TODO: do statistics to find out what success count is safe for testing no early scope
+
+
+def test_ability_table() -> None:
+    """ compare with computing from the character tables directly """
+    for start_char in chars:
+        for vblr in VBLR_CHOICES:
+            for opas_per_level, max_level in ((1, 8), (3, 5), (2, 1)):
+                o = Options(jump_levels=vblr, gun_levels=vblr, start_char=start_char,
+                            opas_per_level=opas_per_level, max_level=max_level)
+                table = AbilityTable(o)
+                rescued: list[Chars] = [
+                    "JJ" if start_char == "Apple" else "Apple",
+                    "JJ" if start_char == "Champ" else "Champ"
+                ]
+                for rescue_0 in (False, True):
+                    for rescue_1 in (False, True):
+                        for gun_count in range(9):
+                            inventory = Inventory([items[ID.gun]] * gun_count + [items[ID.red]])
+                            if rescue_0:
+                                inventory.add(items[-2])
+                            if rescue_1:
+                                inventory.add(items[-1])
+                            have_chars: list[Chars] = [
+                                start_char,
+                                *(c for c, r in zip(rescued, (rescue_0, rescue_1), strict=True) if r)
+                            ]
+                            for opa_count in range(20):
+                                levels = min(max_level - 1, opa_count // opas_per_level)
+                                req = table.make_ability(inventory)
+                                assert set(req.char) == set(have_chars)
+                                assert req.hp == max(char_to_hp[c] for c in have_chars) + 20 * levels
+                                assert req.gun == max(
+                                    char_to_gun[c][vblr][min(gun_count, len(char_to_gun[c][vblr]) - 1)]
+                                    for c in have_chars
+                                )
+                                assert req.jump == max(
+                                    char_to_jump[c][vblr][min(levels, len(char_to_jump[c][vblr]) - 1)]
+                                    for c in have_chars
+                                )
+                                assert req.red == 1
+                                inventory.add(items[ID.opa])
+                            for _ in range(20):
+                                inventory.remove(items[ID.opa])
+                            assert table.make_ability(inventory).hp == max(char_to_hp[c] for c in have_chars)
@@ -3,8 +3,8 @@ from zilliandomizer.logger import Logger
 from zilliandomizer.np_sprite_manager import NPSpriteManager
 from zilliandomizer.room_gen.aem import AlarmEntranceManager
 from zilliandomizer.room_gen.common import BOT_LEFT, BOT_RIGHT, TOP_LEFT, TOP_RIGHT, Coord, RoomData
-from zilliandomizer.room_gen.maze import Cell, Grid, g_row
-from zilliandomizer.room_gen.room_gen import RoomGen
+from zilliandomizer.room_gen.maze import JUMP_LEVELS, Cell, Grid, MakeFailure, Reachability, g_row
+from zilliandomizer.room_gen.room_gen import GEN_STAGES, RoomGen
 from zilliandomizer.terrain_modifier import TerrainModifier
 
 
@@ -550,6 +550,93 @@ def test_dead_end_can_logic() -> None:
         break
 
 
+def test_reachability() -> None:
+    """ the same results as searching the `Grid` """
+    import random
+    log = Logger()
+    random.seed(45)
+    checked = 0
+    all_ends: tuple[list[Coord], ...] = ([BOT_LEFT, BOT_RIGHT], [TOP_LEFT, BOT_RIGHT, (3, 6)])
+    for map_index in (0x21, 0x31, 0x5a, 0x69):
+        for ends in all_ends:
+            g = Grid(ends, ends, map_index, log, 3, [], [])
+            try:
+                g.make(2.5, 1000)
+            except MakeFailure:
+                continue
+            reach = Reachability(g)
+            for jump_blocks in (2, 2.5, 3):
+                assert reach.solve(jump_blocks) == g.solve(jump_blocks)
+                # same order for things that sample from it
+                assert list(reach.goables(jump_blocks)) == list(g.get_goables(jump_blocks))
+                assert list(reach.goables(jump_blocks, ends[-1])) == list(g.get_goables(jump_blocks, ends[-1]))
+            checked += 1
+    assert checked > 4
+
+
+def test_min_jumps() -> None:
+    """ the same results as searching the `Grid` with each jump """
+    import random
+    log = Logger()
+    random.seed(46)
+    checked = 0
+    all_ends: tuple[list[Coord], ...] = ([BOT_LEFT, BOT_RIGHT], [TOP_LEFT, BOT_RIGHT, (3, 6)])
+    for map_index in (0x21, 0x31, 0x5a, 0x69):
+        for ends in all_ends:
+            for skill in (1, 5):
+                g = Grid(ends, ends, map_index, log, skill, [], [])
+                try:
+                    g.make(2.5, 1000)
+                except MakeFailure:
+                    continue
+                start = ends[0]
+                start_state = (start[0], start[1], True)
+                to, back = g.min_jumps(start)
+                reach = Reachability(g)
+                for jump_blocks in (2, 2.5, 3):
+                    goables = g.get_goables(jump_blocks)
+                    assert goables == {state for state, jump in to.items() if jump <= jump_blocks}
+                    for state in goables:
+                        comes_back = start_state in g.search(state[:2], jump_blocks, state[2], start_state)
+                        assert comes_back == (back[state] <= jump_blocks if state in back else False)
+                        if state[2]:
+                            assert (reach.jump_to(state[:2]) <= jump_blocks) == (state in goables)
+                    assert reach.solve(jump_blocks) == g.solve(jump_blocks)
+                # the jump given with each move is the lowest level that has that move
+                for state in to:
+                    labelled = g._adj_moves(state, JUMP_LEVELS[-1])  # pyright: ignore[reportPrivateUsage]
+                    for jump_blocks in JUMP_LEVELS:
+                        moves = g._adj_moves(state, jump_blocks)  # pyright: ignore[reportPrivateUsage]
+                        assert {move for move, _ in moves} == {move for move, jump in labelled if jump <= jump_blocks}
+                checked += 1
+    assert checked > 8
+
+
+def test_stage_stats() -> None:
+    tc = TerrainModifier()
+    sm = NPSpriteManager()
+    aem = AlarmEntranceManager()
+    gen_data = {
+        0x10: RoomData([BOT_LEFT, BOT_RIGHT], False, [], None, None, None),
+        28: RoomData([BOT_LEFT, TOP_RIGHT], True, [], None, TOP_RIGHT, None),
+    }
+    room_gen = RoomGen(tc, sm, aem, Logger(), 5, gen_data)
+    room_gen.generate_all({0x10: 1, 28: 3})
+
+    assert list(room_gen.stage_stats) == list(GEN_STAGES)
+    stats = room_gen.stage_stats
+    assert stats["make"].attempts >= 2
+    assert stats["r02c0"].attempts >= 1
+    # each stage only gets the candidates that weren't rejected before it
+    for stage, next_stage in (
+        ("make", "post-process"), ("post-process", "softlock"), ("softlock", "placeables"), ("place", "size")
+    ):
+        assert stats[stage].attempts - stats[stage].rejected >= stats[next_stage].attempts
+    # 1 accepted candidate for each room in each pass
+    assert (stats["size"].attempts - stats["size"].rejected) % len(gen_data) == 0
+    assert all(s.seconds >= 0 and s.rejected <= s.attempts for s in stats.values())
+
+
 if __name__ == "__main__":
     test_navigation()
     test_jump_requirements()
@@ -562,3 +649,6 @@ if __name__ == "__main__":
     test_low_skill_jump_1_distance_5()
     test_low_skill_jump_1_distance_4()
     test_skill_horizontal_jump_from_walkway()
+    test_reachability()
+    test_min_jumps()
+    test_stage_stats()
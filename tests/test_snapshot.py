@@ -0,0 +1,92 @@
+import pickle  # noqa: S403
+import random
+import zlib
+
+import pytest
+
+from zilliandomizer.game import Game
+from zilliandomizer.logger import Logger
+from zilliandomizer.options import Options
+from zilliandomizer.system import System
+
+
+def _finish(system: System, logger: Logger) -> tuple[Game, list[str]]:
+    r = system.make_randomizer()
+    r.roll()
+    system.post_fill()
+    return system.get_game(), logger.spoiler_lines
+
+
+def _resume_same(options: Options, seed: int) -> None:
+    logger = Logger()
+    system = System(logger)
+    system.set_options(options)
+    system.seed(seed)
+    system.make_map()
+    snapshot = system.snapshot()
+    game, spoiler = _finish(system, logger)
+
+    random.random()  # resume should restore this
+    resumed_logger = Logger()
+    resumed = System(resumed_logger)
+    resumed.resume(snapshot)
+    resumed_game, resumed_spoiler = _finish(resumed, resumed_logger)
+    assert resumed_game.to_jsonable() == game.to_jsonable()
+    assert resumed_spoiler == spoiler
+
+
+def test_resume() -> None:
+    _resume_same(Options(start_char="Apple", randomize_alarms=True), 5)
+
+
+def test_resume_map_gen() -> None:
+    _resume_same(Options(start_char="Champ", map_gen="full", randomize_alarms=True), 7)
+
+
+def test_resume_after_fill() -> None:
+    system = System(Logger())
+    system.set_options(Options(start_char="JJ"))
+    system.seed(11)
+    system.make_map()
+    system.make_randomizer().roll()
+    snapshot = system.snapshot()
+    system.post_fill()
+    game = system.get_game()
+
+    resumed = System(Logger())
+    resumed.resume(snapshot)
+    resumed.post_fill()
+    assert resumed.get_game().to_jsonable() == game.to_jsonable()
+
+
+def test_bad_snapshot() -> None:
+    system = System()
+    snapshot = system.snapshot()
+    with pytest.raises(ValueError):
+        system.resume(snapshot[:-10])
+    with pytest.raises(ValueError):
+        system.resume(b"not a snapshot")
+    with pytest.raises(ValueError):
+        system.resume(zlib.compress(pickle.dumps("not a snapshot")))
+
+
+def test_fill_variants() -> None:
+    system = System(Logger())
+    system.set_options(Options(start_char="Apple"))
+    system.seed(3)
+    system.make_map()
+    variants = system.fill_variants([21, 22, 21], max_workers=2)
+    assert [v.sub_seed for v in variants] == [21, 22, 21]
+    games = [v.game.to_jsonable() for v in variants]
+    assert games[0] == games[2]
+    assert games[0]["regions"] != games[1]["regions"]
+    assert variants[0].logger.spoiler_lines == variants[2].logger.spoiler_lines
+
+    inline = system.fill_variants([22], max_workers=1)
+    assert inline[0].game.to_jsonable() == games[1]
+
+    # the same as filling this map after seeding with the sub-seed
+    system.seed(22)
+    system.make_randomizer().roll()
+    system.post_fill()
+    assert system.get_game().to_jsonable() == games[1]
@@ -1,7 +1,7 @@
 from collections import defaultdict
 
 from zilliandomizer.map_gen.base_maker import Node
-from zilliandomizer.map_gen.split_maker import find_cycles
+from zilliandomizer.map_gen.split_maker import DependencyCycles, find_cycles
 
 
 def test_find_cycles() -> None:
@@ -43,3 +43,27 @@ def test_find_cycles() -> None:
     })
     cycles = find_cycles(possible_splits, dependencies)
     assert cycles == {Node(y=4, x=3), Node(y=5, x=4), Node(y=5, x=2)}
+
+
+def test_dependency_cycles() -> None:
+    nodes = [Node(0, i) for i in range(6)]
+    a, b, c, d, e, f = nodes
+    # cycles b c d and c d e, self-dependent f
+    dependencies = {
+        a: [b],
+        b: [c],
+        c: [d],
+        d: [b, e],
+        e: [c],
+        f: [f],
+    }
+    cycles = DependencyCycles(nodes, dependencies)
+    assert cycles.cycle_nodes() == [b, c, d, e, f]
+    cycles.remove(f)
+    assert cycles.cycle_nodes() == [b, c, d, e]
+    cycles.remove(b)
+    assert cycles.cycle_nodes() == [c, d, e]
+    cycles.remove(a)
+    assert cycles.cycle_nodes() == [c, d, e]
+    cycles.remove(e)
+    assert cycles.cycle_nodes() == []
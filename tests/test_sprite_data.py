@@ -0,0 +1,37 @@
+from zilliandomizer.low_resources.sprite_data import room_offsets, room_sprites, room_view, sprite_rooms, sprite_table
+from zilliandomizer.np_sprite_manager import NPSpriteManager
+
+
+def test_table() -> None:
+    assert len(room_offsets) == len(sprite_rooms) + 1
+    assert room_offsets[-1] == len(sprite_table)
+    for map_index, room_address in enumerate(sprite_rooms):
+        view = room_view(map_index)
+        assert view.obj is sprite_table
+        assert len(view) % 6 == 0
+        assert b"".join(sprite.to_bytes() for sprite in room_sprites(map_index)) == view
+        # room data in rom is count byte followed by the sprites (0x17 has some unused space after)
+        next_addresses = [address for address in sprite_rooms if address > room_address]
+        if next_addresses:
+            assert min(next_addresses) - room_address >= 1 + len(view)
+
+
+def test_manager() -> None:
+    sm = NPSpriteManager()
+    vanilla = sm.get_writes()
+    map_index = 0x3c
+    room = sm.get_room(map_index)
+    room[0].x += 8
+    assert sm.get_room(map_index)[0].x == room[0].x - 8
+    sm.set_room(map_index, room)
+    sm.save_state()
+    room = sm.get_room(map_index)
+    room[1].y += 8
+    sm.set_room(map_index, room)
+    address = sprite_rooms[map_index] + 1 + 6 + 3
+    assert sm.get_writes()[address] == vanilla[address] + 8
+    sm.load_state()
+    writes = sm.get_writes()
+    assert writes[address] == vanilla[address]
+    assert writes[address - 6 - 1] == vanilla[address - 6 - 1] + 8
+    assert {a: b for a, b in writes.items() if b != vanilla[a]}.keys() == {address - 6 - 1}
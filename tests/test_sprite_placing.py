@@ -1,8 +1,10 @@
 
+import random
+
 from zilliandomizer.logger import Logger
-from zilliandomizer.room_gen.common import BOT_LEFT, BOT_RIGHT, Coord
+from zilliandomizer.room_gen.common import BOT_LEFT, BOT_RIGHT, TOP_LEFT, TOP_RIGHT, Coord
 from zilliandomizer.room_gen.maze import Grid, g_row
-from zilliandomizer.room_gen.sprite_placing import alarm_places
+from zilliandomizer.room_gen.sprite_placing import BarPlace, BarPlaces, alarm_places, choose_alarms, exit_masks
 
 
 def test_alarm_places() -> None:
@@ -55,5 +57,60 @@ def test_alarm_places() -> None:
     print(len(ap.bars))
 
 
+def test_exit_masks() -> None:
+    logger = Logger()
+    r = random.Random(5)
+    for _ in range(50):
+        exits = r.sample([TOP_LEFT, TOP_RIGHT, BOT_LEFT, BOT_RIGHT, (0, 4), (3, 6), (5, 9)], r.randint(1, 4))
+        g = Grid(exits, exits, 0x0a, logger, 5, [], [])
+        masks = exit_masks(exits)
+        for y in range(6):
+            for x in range(14):
+                assert bool((masks[y] >> x) & 1) == g.in_exit(y, x), f"{exits} {y} {x}"
+
+
+def test_choose_alarms() -> None:
+    """ the same choices as filtering the whole list after each choice """
+    def collides(a: BarPlace, b: BarPlace) -> bool:
+        if a.horizontal == b.horizontal:
+            return False
+        if a.horizontal:
+            a, b = b, a
+        # a vertical, b horizontal
+        return (b.c[0] + 1) in range(a.c[0], a.c[0] + a.length) and a.c[1] in range(b.c[1], b.c[1] + b.length)
+
+    r = random.Random(6)
+    for _ in range(200):
+        bars: list[BarPlace] = []
+        for _ in range(r.randrange(1, 40)):
+            horizontal = r.random() < 0.5
+            length = r.randint(1, 4)
+            if horizontal:
+                bars.append(BarPlace((r.randrange(5), r.randrange(14 - length + 1)), True, length))
+            else:
+                bars.append(BarPlace((r.randrange(6 - length + 1), r.randrange(1, 14)), False, length))
+        count = r.randint(1, 8)
+
+        expected_bars = bars.copy()
+        expected: list[BarPlace] = []
+        while len(expected) < count and len(expected_bars):
+            this_one = expected_bars.pop()
+            expected.append(this_one)
+            expected_bars = [bar for bar in expected_bars if not collides(this_one, bar)]
+
+        ap = BarPlaces(frozenset())
+        ap.bars = bars.copy()
+        blocks = choose_alarms(ap, count)
+        assert ap.bars == expected_bars
+        expected_blocks: set[int] = set()
+        for bar in expected:
+            for i in range(bar.length):
+                if bar.horizontal:
+                    expected_blocks.add((bar.c[0] + 1) * 16 + bar.c[1] + 1 + i)
+                else:
+                    expected_blocks.add((bar.c[0] + i) * 16 + bar.c[1] + 1)
+        assert set(blocks) == expected_blocks
+
+
 if __name__ == "__main__":
     test_alarm_places()
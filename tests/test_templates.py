@@ -0,0 +1,75 @@
+import pickle  # noqa: S403
+import random
+
+import pytest
+
+from zilliandomizer.logger import Logger
+from zilliandomizer.np_sprite_manager import NPSpriteManager
+from zilliandomizer.room_gen.aem import AlarmEntranceManager
+from zilliandomizer.room_gen.data import GEN_ROOMS
+from zilliandomizer.room_gen.maze import Cell, CellType, Reachability
+from zilliandomizer.room_gen.room_gen import TEMPLATE_FAILURES, RoomGen, build_library
+from zilliandomizer.room_gen.templates import RoomTemplate, TemplateLibrary
+from zilliandomizer.terrain_modifier import TerrainModifier
+
+_ROOMS = {map_index: GEN_ROOMS[map_index] for map_index in (0x10, 0x21, 0x31, 0x5a)}
+
+
+def test_bytes() -> None:
+    random.seed(48)
+    library = build_library(_ROOMS, [2], 3)
+    assert len(library) == len(_ROOMS) * 3 * 3
+    loaded = TemplateLibrary.from_bytes(library.to_bytes())
+    assert loaded.templates == library.templates
+    for key, templates in loaded.templates.items():
+        sizes = [template.size for template in templates]
+        assert sizes == sorted(sizes)
+        for template in templates:
+            grid = template.to_grid(_ROOMS[key[0]].exits, key[0], Logger(), key[2], _ROOMS[key[0]].no_space)
+            assert len(grid.to_room_data({})) == template.size
+            assert Reachability(grid).solve(key[1])
+            assert not grid.softlock_exists()
+        assert len(loaded.fitting(key, sizes[0] - 1)) == 0
+        assert len(loaded.fitting(key, sizes[-1])) == len(templates)
+
+    with pytest.raises(ValueError):
+        TemplateLibrary.from_bytes(b"not a library")
+
+
+def test_generate_from_library() -> None:
+    random.seed(48)
+    library = build_library(_ROOMS, [2], 2)
+    for mutations in (0, 3):
+        room_gen = RoomGen(
+            TerrainModifier(), NPSpriteManager(), AlarmEntranceManager(), Logger(), 2, _ROOMS, library, mutations
+        )
+        room_gen.generate_all({map_index: 3 for map_index in _ROOMS})
+        assert room_gen.stage_stats["template"].attempts >= len(_ROOMS)
+        assert room_gen.stage_stats["make"].attempts == 0
+        assert room_gen.get_modified_rooms() == frozenset(_ROOMS)
+        # not saved in snapshots
+        assert pickle.loads(pickle.dumps(room_gen)).library is None  # noqa: S301
+        assert room_gen.library is library
+
+    # not for rooms with different exits
+    different = {0x21: GEN_ROOMS[0x31]}
+    room_gen = RoomGen(TerrainModifier(), NPSpriteManager(), AlarmEntranceManager(), Logger(), 2, different, library)
+    room_gen.generate_all({0x21: 3})
+    assert room_gen.stage_stats["template"].attempts == 0
+    assert room_gen.stage_stats["make"].attempts > 0
+
+
+def test_all_templates_rejected() -> None:
+    random.seed(48)
+    # solid walls - no way through
+    wall: tuple[CellType, ...] = (Cell.wall,) * 14
+    library = TemplateLibrary()
+    for map_index, room in _ROOMS.items():
+        library.add((map_index, 3, 2), RoomTemplate(tuple(room.exits), (wall,) * 6, ((0,) * 14,) * 6, 1))
+    room_gen = RoomGen(TerrainModifier(), NPSpriteManager(), AlarmEntranceManager(), Logger(), 2, _ROOMS, library)
+    room_gen.generate_all({map_index: 3 for map_index in _ROOMS})
+    stats = room_gen.stage_stats["template"]
+    assert stats.rejected == stats.attempts
+    assert stats.attempts >= TEMPLATE_FAILURES * len(_ROOMS)
+    assert room_gen.stage_stats["make"].attempts > 0
+    assert room_gen.get_modified_rooms() == frozenset(_ROOMS)
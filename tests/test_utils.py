@@ -1,7 +1,11 @@
+from itertools import combinations, starmap
+from random import Random
+
 import pytest
 
 from zilliandomizer.utils.deterministic_set import DetSet
-from zilliandomizer.utils.disjoint_set import DisjointSet
+from zilliandomizer.utils.disjoint_set import ArrayDisjointSet, DisjointSet
+from zilliandomizer.utils.loc_name_matcher import LocCoords, loc_name_maker, shortest_pairs
 
 
 def test_deterministic_set() -> None:
@@ -71,6 +75,70 @@ def test_disjoint_set() -> None:
     assert a == c, f"{a=} {c=}"
 
 
+def test_array_disjoint_set() -> None:
+    uf = ArrayDisjointSet(10)
+    assert uf.find(3) == 3
+    assert uf.union(3, 4)
+    assert uf.find(3) == uf.find(4)
+    assert uf.find(2) != uf.find(3)
+    assert uf.union(2, 4)
+    assert not uf.union(2, 3)
+    assert uf.find(2) == uf.find(3)
+
+    r = Random(33)
+    uf = ArrayDisjointSet(200)
+    reference: DisjointSet[int] = DisjointSet()
+    for _ in range(150):
+        a = r.randrange(200)
+        b = r.randrange(200)
+        assert uf.union(a, b) == (reference.find(a) != reference.find(b))
+        reference.union(a, b)
+    for a in range(200):
+        for b in range(0, 200, 7):
+            assert (uf.find(a) == uf.find(b)) == (reference.find(a) == reference.find(b))
+
+
+def test_shortest_pairs() -> None:
+    """ compare with trying every combination """
+    x_list = [0x00, 0x30, 0x54, 0x78, 0x9c, 0xc0, 0xf0]
+
+    def distance(lc: LocCoords, i: int) -> int:
+        return abs(lc.x - x_list[i]) + (0x0b if i in {2, 4} else 0)
+
+    r = Random(29)
+    for _ in range(2000):
+        count = r.randrange(8)
+        lcs = sorted((LocCoords("", 0x18, r.randrange(0x10, 0xe1, 0x08), 0) for _ in range(count)),
+                     key=lambda lc: lc.x)
+        best: list[int] = []
+        best_d = 2000
+        for indexes in combinations(range(len(x_list)), count):
+            d = sum(starmap(distance, zip(lcs, indexes, strict=True)))
+            if d < best_d:
+                best = list(indexes)
+                best_d = d
+        assert shortest_pairs(lcs) == best, f"{lcs=}"
+
+    assert shortest_pairs([LocCoords("", 0x18, 0x10, 0)] * 8) == []
+
+
+def test_loc_name_maker_order() -> None:
+    locs = ["r07c1y18x10", "r07c1y58x30", "r07c1y58x40", "r07c1y18x50", "r07c1y18x90"]
+    names = loc_name_maker(locs)
+    assert names == {
+        "r07c1y18x10": "top far left",
+        "r07c1y18x50": "top left-center",
+        "r07c1y18x90": "top right-center",
+        "r07c1y58x30": "mid left",
+        "r07c1y58x40": "mid left-center",
+    }
+    names["r07c1y18x10"] = "modified"
+    assert loc_name_maker(locs[::-1]) == loc_name_maker(locs) != names
+
+
 if __name__ == "__main__":
     test_deterministic_set()
     test_disjoint_set()
+    test_array_disjoint_set()
+    test_shortest_pairs()
+    test_loc_name_maker_order()